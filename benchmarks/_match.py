@@ -0,0 +1,11 @@
+# Pattern matching needs Python 3.10+, so it lives in its own module that is
+# only imported on those versions.
+from result import Err, Ok
+
+
+def match_result(r):
+    match r:
+        case Ok(value):
+            return value
+        case Err(error):
+            return error
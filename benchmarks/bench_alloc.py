@@ -0,0 +1,136 @@
+"""
+Measure the memory allocated by the operations in ``bench_core.py``, and the
+memory retained by long-lived populations of results.
+
+For every operation this reports the memory blocks and bytes that are still
+allocated per call once it returns (i.e. the returned object and everything it
+keeps alive), and the peak memory used during a single call, which includes
+temporary objects such as a raised ``UnwrapError`` and its message.
+
+Run with ``python benchmarks/bench_alloc.py``, optionally with
+``--population N`` to change the size of the populations (default 10**6).
+Requires Python 3.9+ for ``tracemalloc.reset_peak()``.
+"""
+import argparse
+import tracemalloc
+
+from bench_core import METHODS, NAMESPACE, parse
+
+from result import Err, Ok, ResultArray
+
+CALLS = 1000
+
+# Ignore the memory used by the snapshots themselves.
+FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+def run(coroutine):
+    """
+    Run a coroutine that never suspends, without the allocations of an event
+    loop.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as exc:
+        return exc.value
+    raise RuntimeError("coroutine suspended")
+
+
+def compile_call(stmt, setup="pass"):
+    namespace = dict(NAMESPACE, run=run)
+    exec(setup, namespace)
+    exec("def call():\n    return {}".format(stmt), namespace)
+    return namespace["call"]
+
+
+def operations():
+    """
+    Yield ``(name, function)`` for every operation to measure.
+    """
+    for stmt in ["Ok(1)", "Err(1)", "Ok.of(1)", "Err.of(1)"]:
+        yield stmt, compile_call(stmt)
+    for path, value in [("ok", "Ok(1)"), ("err", "Err('nay')")]:
+        for name, stmt in METHODS:
+            yield "{}_{}".format(path, name), compile_call(stmt, "r = {}".format(value))
+    for path, args, arg in [("ok", "1, 2", "'1'"), ("err", "-1, 2", "'x'")]:
+        yield "{}_do".format(path), compile_call("with_do({})".format(args))
+        yield "{}_do_function".format(path), compile_call("with_do_function({})".format(args))
+        yield "{}_do_async".format(path), compile_call("run(with_do_async({}))".format(args))
+        yield "{}_as_result".format(path), compile_call("parse({})".format(arg))
+        yield "{}_as_async_result".format(path), compile_call("run(aparse({}))".format(arg))
+
+
+def measure(function):
+    """
+    Return the blocks and bytes retained per call of `function`, and the peak
+    number of bytes used by a single call.
+    """
+    function()  # Warm up caches, e.g. of Ok.of() or the compiled pipeline.
+    results = [None] * CALLS
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(FILTERS)
+        for i in range(CALLS):
+            results[i] = function()
+        after = tracemalloc.take_snapshot().filter_traces(FILTERS)
+        del results
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in diff) / CALLS
+    size = sum(stat.size_diff for stat in diff) / CALLS
+    return blocks, size, peak - current
+
+
+POPULATIONS = [
+    ("list of int (reference)", lambda n: list(range(n))),
+    ("Ok(int)", lambda n: [Ok(i) for i in range(n)]),
+    ("Ok.of(int)", lambda n: [Ok.of(i) for i in range(n)]),
+    ("Err(str)", lambda n: [Err("not found") for _ in range(n)]),
+    ("as_result() Err", lambda n: [parse("x") for _ in range(n)]),
+    ("ResultArray of Ok(int)", lambda n: ResultArray(Ok(i) for i in range(n))),
+]
+
+
+def retained(factory, n):
+    """
+    Return the number of bytes still allocated after creating a population of
+    `n` results.
+    """
+    tracemalloc.start()
+    try:
+        population = factory(n)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del population
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--population", type=int, default=10**6)
+    args = parser.parse_args()
+
+    print("{:<28} {:>14} {:>14} {:>12}".format("", "blocks/call", "bytes/call", "peak bytes"))
+    for name, function in operations():
+        blocks, size, peak = measure(function)
+        print("{:<28} {:>14.1f} {:>14.1f} {:>12}".format(name, blocks, size, peak))
+
+    print()
+    print("{:<28} {:>14} {:>14}".format(
+        "{:,} results".format(args.population), "retained", "bytes/result"
+    ))
+    for name, factory in POPULATIONS:
+        size = retained(factory, args.population)
+        print("{:<28} {:>11.1f} MB {:>14.1f}".format(
+            name, size / 1e6, size / args.population
+        ))
+
+
+if __name__ == "__main__":
+    main()
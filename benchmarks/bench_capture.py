@@ -0,0 +1,51 @@
+"""
+Compare the memory retained by 100,000 failures captured by ``as_result()``
+with each capture mode.
+
+The failing function has a large local variable, as e.g. a parser holding its
+input would, which stays alive through the traceback when the exception is
+stored as is.
+
+Run with ``python benchmarks/bench_capture.py``.
+"""
+import tracemalloc
+
+from result import as_result
+
+N = 100_000
+
+
+def parse(text):
+    buffer = text * 100
+    return int(buffer)
+
+
+MODES = [
+    ("exception", as_result(ValueError)(parse)),
+    ("strip", as_result(ValueError, capture="strip")(parse)),
+    ("record", as_result(ValueError, capture="record")(parse)),
+    ("record, frames=5", as_result(ValueError, capture="record", frames=5)(parse)),
+]
+
+
+def retained(function):
+    """
+    Return the number of bytes still allocated after capturing `N` failures.
+    """
+    tracemalloc.start()
+    results = [function("x{}".format(i)) for i in range(N)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return size
+
+
+def main():
+    print("{:<20} {:>14} {:>14}".format("capture", "retained", "bytes/failure"))
+    for label, function in MODES:
+        size = retained(function)
+        print("{:<20} {:>11.1f} MB {:>14.1f}".format(label, size / 1e6, size / N))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure recording results with ``result.checkpoint.CheckpointLog`` at
+several sync intervals, resuming a run from the log, and random-access reads.
+
+Run with ``python benchmarks/bench_checkpoint.py``.
+"""
+import os
+import random
+import tempfile
+import time
+
+from result import as_result
+from result.checkpoint import CheckpointLog
+
+COUNT = 200_000
+
+
+@as_result(ValueError)
+def parse(i):
+    if i % 100 == 0:
+        raise ValueError("invalid record {}".format(i))
+    return i * 0.5
+
+
+def main():
+    print("{} items, 1% errors".format(COUNT))
+    items = range(COUNT)
+    with tempfile.TemporaryDirectory() as directory:
+        for sync_every in (100, 1000, 10_000):
+            path = os.path.join(directory, "sync-{}.log".format(sync_every))
+            start = time.perf_counter()
+            with CheckpointLog(path, sync_every=sync_every) as log:
+                for _ in log.run(parse, items):
+                    pass
+            print("{:<40} {:>7.0f} ms".format(
+                "first run, sync every {}".format(sync_every),
+                (time.perf_counter() - start) * 1000,
+            ))
+
+        start = time.perf_counter()
+        for _ in map(parse, items):
+            pass
+        print("{:<40} {:>7.0f} ms".format("without a log", (time.perf_counter() - start) * 1000))
+
+        start = time.perf_counter()
+        log = CheckpointLog(path)
+        print("{:<40} {:>7.0f} ms".format("opening the log", (time.perf_counter() - start) * 1000))
+        start = time.perf_counter()
+        for _ in log.run(parse, items):
+            pass
+        print("{:<40} {:>7.0f} ms".format(
+            "resumed run, retrying the errors", (time.perf_counter() - start) * 1000
+        ))
+
+        keys = random.sample(items, COUNT)
+        start = time.perf_counter()
+        for key in keys:
+            log.get(key)
+        elapsed = time.perf_counter() - start
+        print("{:<40} {:>7.0f} ns per read".format("random get()", elapsed / COUNT * 1e9))
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the throughput of writing and reading a stream of results with
+``result.codec`` against plain pickle, and time ``copy.deepcopy()``.
+
+Run with ``python benchmarks/bench_codec.py``.
+"""
+import copy
+import io
+import marshal
+import pickle
+import time
+
+from result import Err, Ok
+from result.codec import dump_results, load_results
+
+COUNT = 200_000
+RESULTS = [
+    Ok({"id": i, "score": i / 7}) if i % 10 else Err("record {} is invalid".format(i))
+    for i in range(COUNT)
+]
+
+
+def best_of(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pickle_list():
+    data = pickle.dumps(RESULTS, pickle.HIGHEST_PROTOCOL)
+    return data, lambda: pickle.loads(data)
+
+
+def pickle_stream():
+    # One pickle per result, as when sending results over a pipe or queue.
+    file = io.BytesIO()
+    for result in RESULTS:
+        pickle.dump(result, file, pickle.HIGHEST_PROTOCOL)
+    data = file.getvalue()
+
+    def read():
+        file = io.BytesIO(data)
+        results = []
+        while file.tell() < len(data):
+            results.append(pickle.load(file))
+        return results
+
+    return data, read
+
+
+def codec(serializer):
+    def write():
+        file = io.BytesIO()
+        dump_results(RESULTS, file, serializer)
+        data = file.getvalue()
+        return data, lambda: list(load_results(io.BytesIO(data), serializer))
+
+    return write
+
+
+def main():
+    print("{} results".format(COUNT))
+    print("{:<28} {:>10} {:>12} {:>12}".format("", "size", "write", "read"))
+    formats = [
+        ("pickle, whole list", pickle_list),
+        ("pickle, one per result", pickle_stream),
+        ("codec, pickle payloads", codec(pickle)),
+        ("codec, marshal payloads", codec(marshal)),
+    ]
+    for name, write in formats:
+        data, read = write()
+        assert read() == RESULTS
+        print("{:<28} {:>7.1f} MB {:>9.0f} ms {:>9.0f} ms".format(
+            name, len(data) / 1e6, best_of(write) * 1000, best_of(read) * 1000
+        ))
+    print("{:<28} {:>10} {:>9.0f} ms".format(
+        "copy.deepcopy", "", best_of(lambda: copy.deepcopy(RESULTS), repeat=3) * 1000
+    ))
+
+
+if __name__ == "__main__":
+    main()
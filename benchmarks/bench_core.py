@@ -0,0 +1,164 @@
+"""
+Micro-benchmarks for the public API in ``result/__init__.py``, each on the
+``Ok`` and on the ``Err`` path.
+
+Run with ``make bench``, which writes ``benchmarks/results/bench_core.json``,
+and compare that with the committed baseline with ``make bench-compare``. See
+``benchmarks/compare.py`` for details.
+"""
+import asyncio
+import sys
+
+import pyperf
+
+from result import (
+    Err,
+    Ok,
+    Pipeline,
+    ResultArray,
+    UnwrapError,
+    as_async_result,
+    as_result,
+    do,
+    do_async,
+    do_function,
+)
+from result import OkErr, is_err, is_ok  # noqa: F401 (used by the timed statements)
+
+
+def inc(x):
+    return x + 1
+
+
+def check(x):
+    return Ok(x) if x >= 0 else Err("negative")
+
+
+def recover(e):
+    return Ok(len(e))
+
+
+def describe(e):
+    return "error: " + e
+
+
+def unwrap(r):
+    try:
+        return r.unwrap()
+    except UnwrapError:
+        return None
+
+
+def with_do(a, b):
+    return do(Ok(x + y) for x in check(a) for y in check(b))
+
+
+@do_function
+def with_do_function(a, b):
+    return do(Ok(x + y) for x in check(a) for y in check(b))
+
+
+@as_result(ValueError)
+def parse(s):
+    return int(s)
+
+
+@as_async_result(ValueError)
+async def aparse(s):
+    return int(s)
+
+
+async def acheck(x):
+    return check(x)
+
+
+async def with_do_async(a, b):
+    return await do_async(Ok(x + y) for x in await acheck(a) for y in await acheck(b))
+
+
+def time_async(loops, make_coroutine, *args):
+    """
+    Return the time it takes to await ``loops`` coroutines one after another.
+    """
+
+    async def main():
+        for _ in range(loops):
+            await make_coroutine(*args)
+
+    loop = asyncio.new_event_loop()
+    t0 = pyperf.perf_counter()
+    loop.run_until_complete(main())
+    elapsed = pyperf.perf_counter() - t0
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+    return elapsed
+
+
+pipeline = Pipeline().map(inc).and_then(check).map_err(describe).compile()
+array_ok = ResultArray([Ok(i) for i in range(100)])
+array_err = ResultArray([Err(str(i)) for i in range(100)])
+
+NAMESPACE = dict(globals())
+
+# (name, statement) of the benchmarks that run on both paths, with `r` being
+# an `Ok` and an `Err` respectively.
+METHODS = [
+    ("is_ok_method", "r.is_ok()"),
+    ("is_ok", "is_ok(r)"),
+    ("is_err", "is_err(r)"),
+    ("isinstance_okerr", "isinstance(r, OkErr)"),
+    ("ok", "r.ok()"),
+    ("err", "r.err()"),
+    ("map", "r.map(inc)"),
+    ("map_err", "r.map_err(describe)"),
+    ("map_or", "r.map_or(0, inc)"),
+    ("and_then", "r.and_then(check)"),
+    ("or_else", "r.or_else(recover)"),
+    ("inspect", "r.inspect(inc)"),
+    ("unwrap", "unwrap(r)"),
+    ("unwrap_or", "r.unwrap_or(0)"),
+    ("unwrap_or_else", "r.unwrap_or_else(len)"),
+    ("eq", "r == r"),
+    ("hash", "hash(r)"),
+    ("repr", "repr(r)"),
+    ("pipeline", "pipeline(r)"),
+]
+if sys.version_info >= (3, 10):
+    from _match import match_result
+
+    NAMESPACE["match_result"] = match_result
+    METHODS.append(("match", "match_result(r)"))
+
+
+def main():
+    runner = pyperf.Runner()
+    runner.timeit("ok_new", "Ok(1)", globals=NAMESPACE)
+    runner.timeit("err_new", "Err(1)", globals=NAMESPACE)
+    runner.timeit("ok_of", "Ok.of(1)", globals=NAMESPACE)
+    runner.timeit("err_of", "Err.of(1)", globals=NAMESPACE)
+    for path, value in [("ok", "Ok(1)"), ("err", "Err('nay')")]:
+        for name, stmt in METHODS:
+            runner.timeit(
+                "{}_{}".format(path, name), stmt, "r = {}".format(value), globals=NAMESPACE
+            )
+    for path, args in [("ok", "1, 2"), ("err", "-1, 2")]:
+        runner.timeit("{}_do".format(path), "with_do({})".format(args), globals=NAMESPACE)
+        runner.timeit(
+            "{}_do_function".format(path),
+            "with_do_function({})".format(args),
+            globals=NAMESPACE,
+        )
+    for path, arg in [("ok", "'1'"), ("err", "'x'")]:
+        runner.timeit("{}_as_result".format(path), "parse({})".format(arg), globals=NAMESPACE)
+    for path, array in [("ok", "array_ok"), ("err", "array_err")]:
+        runner.timeit(
+            "{}_result_array_map".format(path), "{}.map(inc)".format(array), globals=NAMESPACE
+        )
+    runner.bench_time_func("ok_do_async", time_async, with_do_async, 1, 2)
+    runner.bench_time_func("err_do_async", time_async, with_do_async, -1, 2)
+    runner.bench_time_func("ok_as_async_result", time_async, aparse, "1")
+    runner.bench_time_func("err_as_async_result", time_async, aparse, "x")
+
+
+if __name__ == "__main__":
+    main()
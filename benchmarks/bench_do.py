@@ -0,0 +1,73 @@
+"""
+Compare ``do()``, ``do_async()`` and ``@do_function`` with hand-written
+``and_then()`` calls, on inputs that are mostly ``Ok`` and on inputs that are
+mostly ``Err``.
+
+Run with ``python benchmarks/bench_do.py``; see the pyperf documentation for
+options such as ``--fast`` or ``-o results.json``.
+"""
+import asyncio
+
+import pyperf
+
+from result import Err, Ok, do, do_async, do_function
+
+
+def parse(x):
+    return Ok(x) if x >= 0 else Err("negative")
+
+
+def with_do(a, b):
+    return do(Ok(x + y) for x in parse(a) for y in parse(b))
+
+
+@do_function
+def with_do_function(a, b):
+    return do(Ok(x + y) for x in parse(a) for y in parse(b))
+
+
+def with_and_then(a, b):
+    return parse(a).and_then(lambda x: parse(b).map(lambda y: x + y))
+
+
+async def aparse(x):
+    return parse(x)
+
+
+async def with_do_async(a, b):
+    return await do_async(Ok(x + y) for x in await aparse(a) for y in await aparse(b))
+
+
+def run_async(n, a, b):
+    async def main():
+        for _ in range(n):
+            await with_do_async(a, b)
+
+    return main
+
+
+def bench_do_async(loops, a, b):
+    loop = asyncio.new_event_loop()
+    main = run_async(loops, a, b)
+    t0 = pyperf.perf_counter()
+    loop.run_until_complete(main())
+    elapsed = pyperf.perf_counter() - t0
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+    return elapsed
+
+
+runner = pyperf.Runner()
+namespace = {
+    "with_do": with_do,
+    "with_do_function": with_do_function,
+    "with_and_then": with_and_then,
+}
+for label, args in [("ok", "1, 2"), ("err", "-1, 2")]:
+    runner.timeit("do_" + label, "with_do({})".format(args), globals=namespace)
+    runner.timeit(
+        "do_function_" + label, "with_do_function({})".format(args), globals=namespace
+    )
+    runner.timeit("and_then_" + label, "with_and_then({})".format(args), globals=namespace)
+runner.bench_time_func("do_async_ok", bench_do_async, 1, 2)
+runner.bench_time_func("do_async_err", bench_do_async, -1, 2)
@@ -0,0 +1,79 @@
+"""
+Show how ``as_async_result(..., hedge=Hedge(...))`` cuts the tail latency of
+calls to a fake service whose latency is heavy-tailed (Pareto distributed),
+and how much extra load the hedged attempts add.
+
+Run with ``python benchmarks/bench_hedging.py``.
+"""
+import asyncio
+import random
+
+from result import as_async_result
+from result.hedging import Hedge
+
+CALLS = 3000
+CONCURRENCY = 50
+SCALE = 0.002  # The minimum latency in seconds
+ALPHA = 1.5  # The shape of the Pareto distribution, lower is heavier
+
+
+class Service:
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    async def get(self, key):
+        self.requests += 1
+        await asyncio.sleep(min(1.0, SCALE * self.random.paretovariate(ALPHA)))
+        return key
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run(hedge):
+    service = Service(seed=42)
+    if hedge is None:
+        fetch = as_async_result(ConnectionError)(service.get)
+    else:
+        fetch = as_async_result(ConnectionError, hedge=hedge)(service.get)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def call(i):
+        async with semaphore:
+            start = loop.time()
+            result = await fetch(i)
+            latencies.append(loop.time() - start)
+            assert result.is_ok()
+
+    await asyncio.gather(*[call(i) for i in range(CALLS)])
+    return latencies, service.requests
+
+
+def main():
+    print("{} calls, {} concurrent, Pareto latency (min {} ms, alpha {})".format(
+        CALLS, CONCURRENCY, SCALE * 1000, ALPHA
+    ))
+    print("{:<28} {:>8} {:>8} {:>8} {:>8}".format("", "p50", "p99", "p99.9", "load"))
+    policies = [
+        ("no hedging", None),
+        ("fixed 10 ms delay", Hedge(delay=0.01, budget=0.1)),
+        ("learned p90 delay", Hedge(percentile=90, budget=0.1)),
+    ]
+    for name, hedge in policies:
+        latencies, requests = asyncio.run(run(hedge))
+        print("{:<28} {:>5.1f} ms {:>5.1f} ms {:>5.1f} ms {:>7.0f}%".format(
+            name,
+            percentile(latencies, 50) * 1000,
+            percentile(latencies, 99) * 1000,
+            percentile(latencies, 99.9) * 1000,
+            requests / CALLS * 100,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Measure the overhead of instrumentation hooks on functions decorated with
+``as_result()``: without hooks, after a hook was registered and removed again,
+and with a ``ResultMetrics`` hook.
+
+Run with ``python benchmarks/bench_instrumentation.py``; see the pyperf
+documentation for options such as ``--fast`` or ``-o results.json``.
+"""
+import pyperf
+
+from result import as_result
+from result.instrumentation import ResultMetrics, add_hook, remove_hook
+
+
+@as_result(ValueError)
+def parse(s):
+    return int(s)
+
+
+def main():
+    runner = pyperf.Runner()
+    namespace = {"parse": parse}
+    runner.timeit("no_hooks_ok", "parse('1')", globals=namespace)
+    runner.timeit("no_hooks_err", "parse('x')", globals=namespace)
+
+    metrics = ResultMetrics()
+    add_hook(metrics)
+    remove_hook(metrics)
+    runner.timeit("removed_hook_ok", "parse('1')", globals=namespace)
+
+    add_hook(metrics)
+    runner.timeit("metrics_ok", "parse('1')", globals=namespace)
+    runner.timeit("metrics_err", "parse('x')", globals=namespace)
+
+
+if __name__ == "__main__":
+    main()
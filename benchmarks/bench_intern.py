@@ -0,0 +1,46 @@
+"""
+Compare the memory used by results created with ``Ok()``/``Err()`` and with
+``Ok.of()``/``Err.of()``.
+
+Run with ``python benchmarks/bench_intern.py``.
+"""
+import tracemalloc
+
+from result import Err, Ok
+
+N = 1_000_000
+
+CASES = [
+    ("Ok(None)", lambda: Ok(None), lambda: Ok.of(None)),
+    ("Ok(True)", lambda: Ok(True), lambda: Ok.of(True)),
+    ("Err(None)", lambda: Err(None), lambda: Err.of(None)),
+    ("Ok(<small int>)", lambda: Ok(7), lambda: Ok.of(7)),
+    ("Err(<str>)", lambda: Err("not found"), lambda: Err.of("not found")),
+]
+
+
+def retained(factory):
+    """
+    Return the number of bytes still allocated after creating `N` results.
+    """
+    tracemalloc.start()
+    results = [factory() for _ in range(N)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return size
+
+
+def main():
+    print("{:<16} {:>14} {:>14} {:>8}".format("", "new", "of()", "saved"))
+    for label, new, of in CASES:
+        before, after = retained(new), retained(of)
+        print(
+            "{:<16} {:>11.1f} MB {:>11.1f} MB {:>7.0%}".format(
+                label, before / 1e6, after / 1e6, 1 - after / before
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare ``parallel_map()`` on thread and process pools with different chunk
+sizes against a serial loop, for a CPU-bound function that fails for one in
+ten items.
+
+Run with ``python benchmarks/bench_parallel.py``.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from result import as_result, parallel_map
+
+ITEMS = 20_000
+WORK = 500  # The number of loop iterations per item
+
+
+def work(n):
+    if n % 10 == 0:
+        raise ValueError(n)
+    return sum(i * i for i in range(WORK))
+
+
+def serial():
+    checked = as_result(ValueError)(work)
+    return [checked(n) for n in range(ITEMS)]
+
+
+def run(pool, chunksize):
+    return list(parallel_map(work, range(ITEMS), ValueError, executor=pool, chunksize=chunksize))
+
+
+def main():
+    workers = os.cpu_count() or 1
+    print("{} items, {} workers".format(ITEMS, workers))
+    print("{:<32} {:>10} {:>14}".format("", "time", "items/s"))
+
+    def report(name, function, *args):
+        start = time.perf_counter()
+        results = function(*args)
+        elapsed = time.perf_counter() - start
+        assert len(results) == ITEMS
+        assert sum(result.is_err() for result in results) == ITEMS // 10
+        print("{:<32} {:>7.0f} ms {:>14,.0f}".format(name, elapsed * 1000, ITEMS / elapsed))
+
+    report("serial", serial)
+    with ThreadPoolExecutor(workers) as pool:
+        for chunksize in (1, 100):
+            report("threads, chunksize={}".format(chunksize), run, pool, chunksize)
+    with ProcessPoolExecutor(workers) as pool:
+        for chunksize in (1, 100, 1000):
+            report("processes, chunksize={}".format(chunksize), run, pool, chunksize)
+
+
+if __name__ == "__main__":
+    main()
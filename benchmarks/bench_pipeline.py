@@ -0,0 +1,35 @@
+"""
+Compare a compiled ``Pipeline`` with the equivalent chain of method calls.
+
+Run with ``python benchmarks/bench_pipeline.py``; see the pyperf documentation
+for options such as ``--fast`` or ``-o results.json``.
+"""
+import pyperf
+
+from result import Err, Ok, Pipeline
+
+
+def inc(x):
+    return x + 1
+
+
+def check(x):
+    return Ok(x) if x >= 0 else Err("negative")
+
+
+def describe(e):
+    return "error: " + e
+
+
+def chain(r):
+    return r.map(inc).and_then(check).map_err(describe).map(inc)
+
+
+pipeline = Pipeline().map(inc).and_then(check).map_err(describe).map(inc).compile()
+
+runner = pyperf.Runner()
+for label, value in [("ok", "Ok(1)"), ("err", "Err('nay')"), ("ok_to_err", "Ok(-5)")]:
+    setup = "r = {}".format(value)
+    namespace = {"Ok": Ok, "Err": Err, "chain": chain, "pipeline": pipeline}
+    runner.timeit("method_chain_" + label, "chain(r)", setup, globals=namespace)
+    runner.timeit("pipeline_" + label, "pipeline(r)", setup, globals=namespace)
@@ -0,0 +1,51 @@
+"""
+Measure ``repr()`` of results and failed ``unwrap()`` calls with large nested
+payloads, compared with the builtin ``repr()`` of the payload.
+
+Run with ``python benchmarks/bench_repr.py``; see the pyperf documentation for
+options such as ``--fast`` or ``-o results.json``.
+"""
+import pyperf
+
+from result import Err, UnwrapError
+
+# A decoded JSON response of about 2.5 MB.
+PAYLOAD = {
+    "items": [
+        {"id": i, "name": "item {}".format(i), "tags": ["a", "b", "c"], "score": i / 7}
+        for i in range(20_000)
+    ],
+    "next": None,
+}
+
+
+def unwrap_caught(result):
+    try:
+        result.unwrap()
+    except UnwrapError:
+        pass
+
+
+def unwrap_message(result):
+    try:
+        result.unwrap()
+    except UnwrapError as exc:
+        return str(exc)
+
+
+def main():
+    runner = pyperf.Runner()
+    namespace = {
+        "PAYLOAD": PAYLOAD,
+        "err": Err(PAYLOAD),
+        "unwrap_caught": unwrap_caught,
+        "unwrap_message": unwrap_message,
+    }
+    runner.timeit("builtin_repr_payload", "repr(PAYLOAD)", globals=namespace)
+    runner.timeit("repr_err", "repr(err)", globals=namespace)
+    runner.timeit("unwrap_caught", "unwrap_caught(err)", globals=namespace)
+    runner.timeit("unwrap_message", "unwrap_message(err)", globals=namespace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare handing a batch of numeric results to a worker process by pickling
+them against ``result.shared.SharedResultBatch``.
+
+Run with ``python benchmarks/bench_shared.py``.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from result import Err, Ok
+from result.shared import SharedResultBatch
+
+COUNT = 500_000
+RESULTS = [Ok(i * 0.5) if i % 100 else Err("invalid record {}".format(i)) for i in range(COUNT)]
+
+
+def sum_pickled(results):
+    return sum(result.unwrap_or(0.0) for result in results)
+
+
+def sum_shared(name):
+    with SharedResultBatch.attach(name) as batch:
+        values = batch.values
+        total = sum(values)  # Zeros at the positions of the errors.
+        values.release()
+        return total
+
+
+def sum_shared_results(name):
+    with SharedResultBatch.attach(name) as batch:
+        return sum(result.unwrap_or(0.0) for result in batch)
+
+
+def main():
+    expected = sum_pickled(RESULTS)
+    print("{} results, 1% errors".format(COUNT))
+    with ProcessPoolExecutor(1) as pool:
+        pool.submit(int).result()  # Start the worker.
+
+        start = time.perf_counter()
+        assert pool.submit(sum_pickled, RESULTS).result() == expected
+        print("{:<40} {:>7.0f} ms".format("pickled list", (time.perf_counter() - start) * 1000))
+
+        for name, consume in (
+            ("shared memory, summing the values", sum_shared),
+            ("shared memory, iterating the results", sum_shared_results),
+        ):
+            start = time.perf_counter()
+            with SharedResultBatch.create(RESULTS, "d") as batch:
+                created = time.perf_counter()
+                assert pool.submit(consume, batch.name).result() == expected
+            print("{:<40} {:>7.0f} ms (creating: {:.0f} ms)".format(
+                name, (time.perf_counter() - start) * 1000, (created - start) * 1000
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Show how ``as_async_result(..., single_flight=True)`` reduces the load on a
+backend when many coroutines request the same keys at the same moment, as
+happens when a cache entry expires.
+
+Run with ``python benchmarks/bench_single_flight.py``.
+"""
+import asyncio
+import time
+
+from result import as_async_result
+
+CALLERS = 10_000
+KEYS = 10
+LATENCY = 0.05
+
+
+class Backend:
+    def __init__(self):
+        self.requests = 0
+
+    async def get(self, key):
+        self.requests += 1
+        await asyncio.sleep(LATENCY)
+        return key * 2
+
+
+async def run(single_flight):
+    backend = Backend()
+    fetch = as_async_result(ConnectionError, single_flight=single_flight)(backend.get)
+    start = time.perf_counter()
+    results = await asyncio.gather(*[fetch(i % KEYS) for i in range(CALLERS)])
+    elapsed = time.perf_counter() - start
+    assert all(result.is_ok() for result in results)
+    return backend.requests, elapsed
+
+
+def main():
+    print("{} concurrent calls for {} keys, {} ms backend latency".format(
+        CALLERS, KEYS, int(LATENCY * 1000)
+    ))
+    print("{:<20} {:>18} {:>10}".format("", "backend requests", "time"))
+    for single_flight in (False, True):
+        requests, elapsed = asyncio.run(run(single_flight))
+        print("{:<20} {:>18} {:>7.0f} ms".format(
+            "single_flight={}".format(single_flight), requests, elapsed * 1000
+        ))
+
+
+if __name__ == "__main__":
+    main()
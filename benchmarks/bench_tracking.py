@@ -0,0 +1,25 @@
+"""
+Measure the overhead of ``ErrSiteSampler`` on creating ``Err`` values, for
+different sampling rates.
+
+Run with ``python benchmarks/bench_tracking.py``; see the pyperf documentation
+for options such as ``--fast`` or ``-o results.json``.
+"""
+import pyperf
+
+from result import Err
+from result.tracking import ErrSiteSampler
+
+
+def main():
+    runner = pyperf.Runner()
+    runner.timeit("err_new", "Err(1)", globals={"Err": Err})
+    for every in (1, 10, 100, 1000):
+        sampler = ErrSiteSampler(every=every)
+        sampler.start()
+        runner.timeit("err_new_every_{}".format(every), "Err(1)", globals={"Err": Err})
+        sampler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare a benchmark run with a baseline and fail on regressions.
+
+Usage::
+
+    python benchmarks/compare.py BASELINE.json RESULTS.json [--threshold PERCENT]
+
+Both files are pyperf JSON files, e.g. as written by ``make bench``. Each
+benchmark whose mean time grew by more than the threshold (10% by default)
+compared to the baseline is reported as a regression, and the script exits
+with status 1 if there are any. Benchmarks that only exist in one of the files
+are listed, but don't fail the comparison.
+
+Timings are only comparable when both files were recorded on the same machine
+with the same Python version, so regenerate the baseline with
+``make bench-baseline`` when either changes.
+"""
+import argparse
+import sys
+
+import pyperf
+
+
+def compare(baseline, results, threshold):
+    """
+    Print a table comparing the two suites, and return the names of the
+    benchmarks that regressed.
+    """
+    old = {bench.get_name(): bench for bench in baseline.get_benchmarks()}
+    new = {bench.get_name(): bench for bench in results.get_benchmarks()}
+    regressions = []
+    width = max(map(len, old.keys() | new.keys()), default=0)
+    for name in sorted(old.keys() & new.keys()):
+        before = old[name].mean()
+        after = new[name].mean()
+        change = (after / before - 1) * 100
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            "{:<{}}  {:>10}  {:>10}  {:>+7.1f}%{}".format(
+                name,
+                width,
+                old[name].format_value(before),
+                new[name].format_value(after),
+                change,
+                "  REGRESSION" if regressed else "",
+            )
+        )
+    for name in sorted(old.keys() - new.keys()):
+        print("{:<{}}  missing from the results".format(name, width))
+    for name in sorted(new.keys() - old.keys()):
+        print("{:<{}}  not in the baseline".format(name, width))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline", help="pyperf JSON file with the baseline timings")
+    parser.add_argument("results", help="pyperf JSON file with the new timings")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="maximum allowed slowdown of the mean, in percent (default: 10)",
+    )
+    args = parser.parse_args(argv)
+    regressions = compare(
+        pyperf.BenchmarkSuite.load(args.baseline),
+        pyperf.BenchmarkSuite.load(args.results),
+        args.threshold,
+    )
+    if regressions:
+        print(
+            "\n{} benchmark(s) regressed by more than {}%: {}".format(
+                len(regressions), args.threshold, ", ".join(regressions)
+            )
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,49 @@
 from .result import (
     Err,
+    ExceptionRecord,
     Ok,
     OkErr,
     Result,
     UnwrapError,
     as_async_result,
     as_result,
+    result_repr,
     is_ok,
     is_err,
     do,
     do_async,
 )
+from .array import ResultArray, ResultArrayView
+from .compiler import do_function
+from .concurrency import as_completed_results, gather_results
+from .deadlines import DeadlineExceeded, deadline
+from .parallel import parallel_map
+from .pipeline import Pipeline
+from .profiler import profiling
 
 __all__ = [
+    "DeadlineExceeded",
     "Err",
+    "ExceptionRecord",
     "Ok",
     "OkErr",
+    "Pipeline",
     "Result",
+    "ResultArray",
+    "ResultArrayView",
     "UnwrapError",
     "as_async_result",
+    "as_completed_results",
     "as_result",
+    "result_repr",
     "is_ok",
     "is_err",
+    "deadline",
     "do",
     "do_async",
+    "do_function",
+    "gather_results",
+    "parallel_map",
+    "profiling",
 ]
 __version__ = "0.18.0.dev0"
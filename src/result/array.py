@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from itertools import chain, compress
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from .result import Err, Ok, Result
+
+T = TypeVar("T", covariant=True)  # Success type
+E = TypeVar("E", covariant=True)  # Error type
+U = TypeVar("U")
+F = TypeVar("F")
+V = TypeVar("V")
+
+# The eight tags packed into each byte of the mask, least significant bit first.
+_BITS = tuple(tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256))
+# Number of `Ok` tags in each possible byte, for use with `bytes.translate()`.
+_POPCOUNT = bytes(bin(byte).count("1") for byte in range(256))
+_INVERT = bytes(255 - byte for byte in range(256))
+
+
+def _pack(tags: Iterable[bool]) -> bytes:
+    """
+    Pack an iterable of tags into a bitmask, eight tags per byte.
+    """
+    mask = bytearray()
+    byte = 0
+    bit = 1
+    for tag in tags:
+        if tag:
+            byte |= bit
+        bit <<= 1
+        if bit == 256:
+            mask.append(byte)
+            byte = 0
+            bit = 1
+    if bit != 1:
+        mask.append(byte)
+    return bytes(mask)
+
+
+def _unpack(mask: bytes) -> Iterator[bool]:
+    """
+    Iterate over the tags stored in ``mask``.
+
+    This includes the padding bits of the last byte, so it must be paired with
+    (e.g. zipped with) an iterable of the actual length.
+    """
+    return chain.from_iterable(map(_BITS.__getitem__, mask))
+
+
+class ResultArrayView(Sequence[V]):
+    """
+    A read-only view on either the `Ok` values or the `Err` values of a
+    ``ResultArray``.
+
+    The positions of the selected values are only computed when the view is
+    first indexed.
+    """
+
+    __slots__ = ("_values", "_mask", "_length", "_indices")
+
+    def __init__(self, values: List[V], mask: bytes, length: int) -> None:
+        self._values = values
+        self._mask = mask
+        self._length = length
+        self._indices: List[int] | None = None
+
+    def __len__(self) -> int:
+        return sum(self._mask.translate(_POPCOUNT))
+
+    def __iter__(self) -> Iterator[V]:
+        return compress(self._values, _unpack(self._mask))
+
+    @overload
+    def __getitem__(self, index: int) -> V:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[V]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[V, List[V]]:
+        if self._indices is None:
+            self._indices = list(
+                compress(range(self._length), _unpack(self._mask))
+            )
+        if isinstance(index, slice):
+            return [self._values[i] for i in self._indices[index]]
+        return self._values[self._indices[index]]
+
+    def __repr__(self) -> str:
+        return "ResultArrayView({})".format(repr(list(self)))
+
+
+class ResultArray(Generic[T, E]):
+    """
+    An immutable sequence of results stored in columnar form.
+
+    Instead of one ``Ok`` or ``Err`` object per element, the contained values
+    are kept in a single list and the `Ok`/`Err` tag of every element in a
+    packed bitmask. Indexing and iterating produce regular ``Ok`` and ``Err``
+    instances, and the bulk methods behave like calling the method of the same
+    name on every element.
+    """
+
+    __slots__ = ("_values", "_mask", "_length")
+
+    def __init__(self, results: Iterable[Result[T, E]] = ()) -> None:
+        values: List[Any] = []
+        tags: List[bool] = []
+        for result in results:
+            if isinstance(result, Ok):
+                tags.append(True)
+            elif isinstance(result, Err):
+                tags.append(False)
+            else:
+                raise TypeError(
+                    "ResultArray() requires Ok or Err values, got {!r}".format(result)
+                )
+            values.append(result._value)
+        self._values = values
+        self._mask = _pack(tags)
+        self._length = len(values)
+
+    @classmethod
+    def _from_columns(
+        cls, values: List[Any], mask: bytes
+    ) -> ResultArray[Any, Any]:
+        array: ResultArray[Any, Any] = cls.__new__(cls)
+        array._values = values
+        array._mask = mask
+        array._length = len(values)
+        return array
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Result[T, E]]:
+        for value, tag in zip(self._values, _unpack(self._mask)):
+            yield Ok(value) if tag else Err(value)
+
+    @overload
+    def __getitem__(self, index: int) -> Result[T, E]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ResultArray[T, E]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Result[T, E], ResultArray[T, E]]:
+        if isinstance(index, slice):
+            return self._slice(index)
+        value = self._values[index]
+        if index < 0:
+            index += self._length
+        if self._mask[index >> 3] >> (index & 7) & 1:
+            return Ok(value)
+        return Err(value)
+
+    def _slice(self, index: slice) -> ResultArray[T, E]:
+        """
+        Slice the values and the tags, without creating ``Ok`` and ``Err``
+        instances.
+        """
+        start, stop, step = index.indices(self._length)
+        values = self._values[index]
+        length = len(values)
+        if step == 1:
+            # Shift the tags of the slice to the start of the mask, and clear
+            # the padding bits after them.
+            bits = int.from_bytes(self._mask[start >> 3:(stop + 7) >> 3], "little")
+            bits = bits >> (start & 7) & (1 << length) - 1
+            mask = bits.to_bytes((length + 7) >> 3, "little")
+        else:
+            tags = self._mask
+            mask = _pack(
+                bool(tags[i >> 3] >> (i & 7) & 1) for i in range(start, stop, step)
+            )
+        return self._from_columns(values, mask)
+
+    def __repr__(self) -> str:
+        return "ResultArray({})".format(repr(self.to_list()))
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, ResultArray)
+            and self._mask == other._mask
+            and self._values == other._values
+        )
+
+    def __ne__(self, other: Any) -> bool:
+        return not (self == other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def to_list(self) -> List[Result[T, E]]:
+        """
+        Return the contained results as a list of ``Ok`` and ``Err`` instances.
+        """
+        return list(self)
+
+    def oks(self) -> ResultArrayView[T]:
+        """
+        Return a view on the values of the ``Ok`` elements, in order.
+        """
+        return ResultArrayView(self._values, self._mask, self._length)
+
+    def errs(self) -> ResultArrayView[E]:
+        """
+        Return a view on the values of the ``Err`` elements, in order.
+        """
+        return ResultArrayView(self._values, self._err_mask(), self._length)
+
+    def partition(self) -> Tuple[List[T], List[E]]:
+        """
+        Split the array into a list of ``Ok`` values and a list of ``Err``
+        values, preserving the order within each list.
+        """
+        oks: List[Any] = []
+        errs: List[Any] = []
+        for value, tag in zip(self._values, _unpack(self._mask)):
+            (oks if tag else errs).append(value)
+        return oks, errs
+
+    def map(self, op: Callable[[T], U]) -> ResultArray[U, E]:
+        """
+        Map every ``Ok`` value to a new value using the passed in function,
+        leaving ``Err`` elements untouched.
+        """
+        values = [
+            op(value) if tag else value
+            for value, tag in zip(self._values, _unpack(self._mask))
+        ]
+        return self._from_columns(values, self._mask)
+
+    def map_err(self, op: Callable[[E], F]) -> ResultArray[T, F]:
+        """
+        Map every ``Err`` value to a new value using the passed in function,
+        leaving ``Ok`` elements untouched.
+        """
+        values = [
+            value if tag else op(value)
+            for value, tag in zip(self._values, _unpack(self._mask))
+        ]
+        return self._from_columns(values, self._mask)
+
+    def and_then(self, op: Callable[[T], Result[U, F]]) -> ResultArray[U, Union[E, F]]:
+        """
+        Replace every ``Ok`` element with the result of calling `op` with its
+        value, leaving ``Err`` elements untouched.
+        """
+        values: List[Any] = []
+        tags: List[bool] = []
+        for value, tag in zip(self._values, _unpack(self._mask)):
+            if tag:
+                result = op(value)
+                tag = isinstance(result, Ok)
+                value = result._value
+            values.append(value)
+            tags.append(tag)
+        return self._from_columns(values, _pack(tags))
+
+    def _err_mask(self) -> bytes:
+        mask = bytearray(self._mask.translate(_INVERT))
+        # Clear the padding bits of the last byte so they aren't counted as errors.
+        if self._length & 7:
+            mask[-1] &= (1 << (self._length & 7)) - 1
+        return bytes(mask)
@@ -0,0 +1,184 @@
+"""
+Memoization of functions decorated with ``as_result()`` and
+``as_async_result()``, see ``ResultCache``.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .result import ExceptionRecord, Ok, Result
+
+
+class CacheStats(NamedTuple):
+    """
+    Statistics of a ``ResultCache``.
+    """
+
+    hits: int
+    misses: int
+    evictions: int  # Entries removed because the cache was full
+    expirations: int  # Entries removed because their TTL had passed
+    size: int
+    maxsize: Optional[int]
+
+
+class ResultCache:
+    """
+    A cache for the results of functions decorated with ``as_result()`` or
+    ``as_async_result()``, passed to them as the `cache` argument::
+
+        @as_result(LookupError, cache=ResultCache(maxsize=1000, ttl=60))
+        def lookup(key: str) -> Record:
+            ...
+
+    Results are cached per function and arguments, which must be hashable.
+    When the cache holds `maxsize` entries, the least recently used entry is
+    evicted. ``Ok`` results expire after `ttl` seconds, or never if it is
+    ``None``.
+
+    ``Err`` results are handled separately: by default they are not cached at
+    all, so a failed call is retried the next time. Set `err_ttl` to cache them
+    for that many seconds (or without expiry if it is ``None``), e.g. a few
+    seconds to avoid hammering a backend that is down. If `err_types` is
+    given, only errors that are instances of these exception types (or
+    ``ExceptionRecord`` instances of them) are cached.
+
+    A cache can be shared by multiple functions. It is safe to use from
+    multiple threads, but concurrent calls with the same arguments that miss
+    the cache all call the function.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+        err_ttl: Optional[float] = 0,
+        err_types: Optional[Tuple[Type[BaseException], ...]] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1 or None, got {!r}".format(maxsize))
+        for name, value in (("ttl", ttl), ("err_ttl", err_ttl)):
+            if value is not None and value < 0:
+                raise ValueError("{} must not be negative, got {!r}".format(name, value))
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._err_ttl = err_ttl
+        self._err_types = err_types
+        self._timer = timer
+        # Maps keys to (result, expiry time or None), least recently used first.
+        self._entries: OrderedDict[Hashable, Tuple[Result[Any, Any], Optional[float]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Return the hit, miss, eviction and expiration counts and the current
+        size of the cache.
+        """
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                len(self._entries),
+                self._maxsize,
+            )
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def _get(self, key: Hashable) -> Optional[Result[Any, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or self._timer() < expires:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return result
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return None
+
+    def _ttl_for(self, result: Result[Any, Any]) -> Tuple[bool, Optional[float]]:
+        """
+        Return whether to cache `result`, and for how long.
+        """
+        if isinstance(result, Ok):
+            return True, self._ttl
+        if self._err_ttl == 0:
+            return False, None
+        if self._err_types is not None:
+            error = result._value
+            if isinstance(error, ExceptionRecord):
+                cached = issubclass(error.exc_type, self._err_types)
+            else:
+                cached = isinstance(error, self._err_types)
+            if not cached:
+                return False, None
+        return True, self._err_ttl
+
+    def _put(self, key: Hashable, result: Result[Any, Any]) -> None:
+        cached, ttl = self._ttl_for(result)
+        if not cached:
+            return
+        with self._lock:
+            self._entries[key] = (result, None if ttl is None else self._timer() + ttl)
+            self._entries.move_to_end(key)
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _wrap(
+        self, function: Callable[..., Result[Any, Any]]
+    ) -> Callable[..., Result[Any, Any]]:
+        @functools.wraps(function)
+        def cached(*args: Any, **kwargs: Any) -> Result[Any, Any]:
+            key = (function, args, tuple(kwargs.items()))
+            result = self._get(key)
+            if result is None:
+                result = function(*args, **kwargs)
+                self._put(key, result)
+            return result
+
+        return cached
+
+    def _wrap_async(
+        self, function: Callable[..., Awaitable[Result[Any, Any]]]
+    ) -> Callable[..., Awaitable[Result[Any, Any]]]:
+        @functools.wraps(function)
+        async def cached(*args: Any, **kwargs: Any) -> Result[Any, Any]:
+            key = (function, args, tuple(kwargs.items()))
+            result = self._get(key)
+            if result is None:
+                result = await function(*args, **kwargs)
+                self._put(key, result)
+            return result
+
+        return cached
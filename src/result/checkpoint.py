@@ -0,0 +1,317 @@
+"""
+An append-only log of results for resumable batch jobs, see
+``CheckpointLog``.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import time
+import zlib
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from .codec import Serializer
+from .result import Err, Ok, Result
+
+T = TypeVar("T")
+R = TypeVar("R")
+E = TypeVar("E")
+
+# The file starts with a magic number, followed by the records. Every record
+# is a header, the key and the serialized value. The header holds the CRC-32
+# of the rest of the record, the tag (0 for `Ok`, 1 for `Err`), the kind of
+# the key (an integer stored in 8 bytes, or a serialized key), and the lengths
+# of the key and the value.
+_MAGIC = b"RSLTLOG1"
+_HEADER = struct.Struct("<IBBII")
+_CRC = struct.Struct("<I")
+_INT_KEY = struct.Struct("<q")
+_OK = 0
+_ERR = 1
+_KIND_INT = 0
+_KIND_SERIALIZED = 1
+# Non-negative integer keys, such as item indexes, are indexed in an array
+# instead of a dict, which takes 8 bytes per key rather than about 100. The
+# array grows to at most twice its size plus this, and larger keys go into the
+# dict, so that a single large key doesn't allocate a huge array.
+_DENSE_GROWTH = 1 << 16
+
+
+class CheckpointLog:
+    """
+    An append-only file of results, keyed by item index or by any hashable
+    key, for batch jobs that can be resumed after a crash::
+
+        with CheckpointLog("nightly.log") as log:
+            for result in log.run(process, records):
+                ...
+
+    ``run()`` skips the items whose result was recorded as ``Ok`` by a
+    previous run, and returns the recorded result instead. Items recorded as
+    ``Err`` are retried, and new results are appended. Later records for a key
+    take precedence over earlier ones.
+
+    Values and non-integer keys are serialized with `serializer`. Appended
+    records are buffered, and written and flushed to disk with ``fsync()``
+    every `sync_every` records or `sync_interval` seconds, whichever comes
+    first, so a crash loses at most that much work. When the log is opened, a
+    record that was only partially written, or is otherwise corrupted, is
+    detected by its checksum, and it and the rest of the file are discarded.
+
+    Recorded results are read through a memory map of the file and an
+    in-memory index of their offsets. Only one process may write to a log at
+    a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        serializer: Serializer = pickle,
+        sync_every: int = 1000,
+        sync_interval: float = 1.0,
+    ) -> None:
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1, got {!r}".format(sync_every))
+        if sync_interval < 0:
+            raise ValueError(
+                "sync_interval must not be negative, got {!r}".format(sync_interval)
+            )
+        self._serializer = serializer
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        # Offsets of the latest record per key, -1 for missing dense keys.
+        self._dense = array("q")
+        self._sparse: Dict[Hashable, int] = {}
+        self._count = 0
+        self._pending: List[bytes] = []
+        self._last_sync = time.monotonic()
+        self._map: Optional[mmap.mmap] = None
+        # The offsets where the records that were written, and that were
+        # appended, end.
+        self._written = self._end = 0
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                os.write(self._fd, _MAGIC)
+                os.fsync(self._fd)
+                size = len(_MAGIC)
+            self._remap(size)
+            assert self._map is not None
+            if self._map[: len(_MAGIC)] != _MAGIC:
+                raise ValueError("{!r} is not a checkpoint log".format(path))
+            end = self._load()
+            if end < size:
+                # Discard the partially written or corrupted tail.
+                self._map.close()
+                self._map = None
+                os.ftruncate(self._fd, end)
+                os.fsync(self._fd)
+                self._remap(end)
+            self._written = self._end = end
+            os.lseek(self._fd, end, os.SEEK_SET)
+        except BaseException:
+            self.close()
+            raise
+
+    def _remap(self, size: int) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+
+    def _index(self, key: Hashable, offset: int) -> None:
+        dense = self._dense
+        if type(key) is int and 0 <= key < 2 * len(dense) + _DENSE_GROWTH:
+            if key >= len(dense):
+                dense.extend([-1] * max(key + 1 - len(dense), len(dense)))
+            if dense[key] < 0 and self._sparse.pop(key, None) is None:
+                self._count += 1
+            dense[key] = offset
+        else:
+            if key not in self._sparse:
+                self._count += 1
+            self._sparse[key] = offset
+
+    def _offset(self, key: Hashable) -> int:
+        if type(key) is int and 0 <= key < len(self._dense):
+            offset: int = self._dense[key]
+            if offset >= 0:
+                return offset
+        return self._sparse.get(key, -1)
+
+    def _load(self) -> int:
+        """
+        Index the valid records, and return the offset where they end.
+        """
+        assert self._map is not None
+        # Slicing a memoryview doesn't copy the records.
+        data = memoryview(self._map)
+        unpack = _HEADER.unpack_from
+        header_size = _HEADER.size
+        loads = self._serializer.loads
+        offset = len(_MAGIC)
+        size = len(data)
+        try:
+            while offset + header_size <= size:
+                crc, tag, kind, key_length, value_length = unpack(data, offset)
+                end = offset + header_size + key_length + value_length
+                if (
+                    end > size
+                    or tag not in (_OK, _ERR)
+                    or zlib.crc32(data[offset + _CRC.size:end]) != crc
+                ):
+                    break
+                key_offset = offset + header_size
+                if kind == _KIND_INT:
+                    key: Hashable = _INT_KEY.unpack_from(data, key_offset)[0]
+                else:
+                    key = loads(bytes(data[key_offset:key_offset + key_length]))
+                self._index(key, offset)
+                offset = end
+        finally:
+            # The map can't be closed while a view of it exists.
+            data.release()
+        return offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._offset(key) >= 0
+
+    def get(self, key: Hashable) -> Optional[Result[Any, Any]]:
+        """
+        Return the latest result recorded for `key`, or ``None``.
+        """
+        offset = self._offset(key)
+        if offset < 0:
+            return None
+        if offset >= self._written:
+            self._write()
+        data = self._map
+        assert data is not None
+        if offset >= len(data):
+            self._remap(self._written)
+            data = self._map
+            assert data is not None
+        _, tag, _, key_length, value_length = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size + key_length
+        value = self._serializer.loads(data[start:start + value_length])
+        return Ok(value) if tag == _OK else Err(value)
+
+    def append(self, key: Hashable, result: Result[Any, Any]) -> None:
+        """
+        Record `result` for `key`. It is written to disk within `sync_every`
+        records or `sync_interval` seconds.
+        """
+        if type(key) is int and -(1 << 63) <= key < 1 << 63:
+            kind = _KIND_INT
+            key_data = _INT_KEY.pack(key)
+        else:
+            kind = _KIND_SERIALIZED
+            key_data = self._serializer.dumps(key)
+        if isinstance(result, Ok):
+            tag = _OK
+        elif isinstance(result, Err):
+            tag = _ERR
+        else:
+            raise TypeError("expected Ok or Err, got {!r}".format(type(result).__name__))
+        value_data = self._serializer.dumps(result._value)
+        header = _HEADER.pack(0, tag, kind, len(key_data), len(value_data))
+        rest = header[_CRC.size:] + key_data + value_data
+        record = _CRC.pack(zlib.crc32(rest)) + rest
+        self._pending.append(record)
+        self._index(key, self._end)
+        self._end += len(record)
+        if (
+            len(self._pending) >= self._sync_every
+            or time.monotonic() - self._last_sync >= self._sync_interval
+        ):
+            self.sync()
+
+    def _write(self) -> None:
+        if self._pending:
+            data = b"".join(self._pending)
+            self._pending.clear()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            self._written = self._end
+
+    def sync(self) -> None:
+        """
+        Write the buffered records, and flush them to disk.
+        """
+        self._write()
+        os.fsync(self._fd)
+        self._last_sync = time.monotonic()
+
+    def keys(self) -> Iterator[Hashable]:
+        """
+        Iterate over the keys with a recorded result.
+        """
+        for key, offset in enumerate(self._dense):
+            if offset >= 0:
+                yield key
+        yield from self._sparse
+
+    def run(
+        self,
+        function: Callable[[T], Result[R, E]],
+        items: Iterable[T],
+        key: Optional[Callable[[T], Hashable]] = None,
+        retry_errors: bool = True,
+    ) -> Iterator[Result[R, E]]:
+        """
+        Call `function` for every item, typically one decorated with
+        ``as_result()``, record its result under the index of the item, or
+        under ``key(item)``, and yield it.
+
+        Items with a recorded ``Ok`` are skipped, and the recorded result is
+        yielded instead. So are items with a recorded ``Err``, unless
+        `retry_errors` is true.
+        """
+        for index, item in enumerate(items):
+            item_key = index if key is None else key(item)
+            recorded = self.get(item_key)
+            if recorded is not None and (isinstance(recorded, Ok) or not retry_errors):
+                yield recorded
+                continue
+            result = function(item)
+            self.append(item_key, result)
+            yield result
+
+    def close(self) -> None:
+        """
+        Write and flush the buffered records, and close the file.
+        """
+        if self._fd < 0:
+            return
+        try:
+            if self._pending:
+                self.sync()
+        finally:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> CheckpointLog:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
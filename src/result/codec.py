@@ -0,0 +1,115 @@
+"""
+A binary stream format for large sequences of results, see
+``dump_results()`` and ``load_results()``.
+
+Every result is written as a 5 byte header, a tag byte (0 for ``Ok``, 1 for
+``Err``) and the length of the payload as an unsigned 32 bit little-endian
+integer, followed by the payload, the value serialized with the serializer.
+"""
+from __future__ import annotations
+
+import pickle
+import struct
+from typing import IO, Any, Generator, Iterable, List, Protocol
+
+from .result import Err, Ok, Result
+
+_HEADER = struct.Struct("<BI")
+_OK = 0
+_ERR = 1
+# The number of bytes to buffer before writing, and to read at once.
+_CHUNK = 1 << 16
+
+
+class Serializer(Protocol):
+    """
+    The interface of the serializers for the payloads, such as the ``pickle``
+    and ``marshal`` modules.
+    """
+
+    def dumps(self, __value: Any) -> bytes:
+        ...
+
+    def loads(self, __data: bytes) -> Any:
+        ...
+
+
+def dump_results(
+    results: Iterable[Result[Any, Any]],
+    file: IO[bytes],
+    serializer: Serializer = pickle,
+) -> int:
+    """
+    Write `results` to the binary `file`, and return the number of results
+    that were written. The values are serialized with ``serializer.dumps()``.
+
+    The results are written in batches, so the results can be produced lazily,
+    e.g. by a generator, without keeping them all in memory.
+    """
+    header = _HEADER.pack
+    dumps = serializer.dumps
+    parts: List[bytes] = []
+    size = 0
+    count = 0
+    for result in results:
+        if isinstance(result, Ok):
+            payload = dumps(result._value)
+            parts.append(header(_OK, len(payload)))
+        elif isinstance(result, Err):
+            payload = dumps(result._value)
+            parts.append(header(_ERR, len(payload)))
+        else:
+            raise TypeError("expected Ok or Err, got {!r}".format(type(result).__name__))
+        parts.append(payload)
+        count += 1
+        size += len(payload)
+        if size >= _CHUNK:
+            file.write(b"".join(parts))
+            parts.clear()
+            size = 0
+    if parts:
+        file.write(b"".join(parts))
+    return count
+
+
+def load_results(
+    file: IO[bytes],
+    serializer: Serializer = pickle,
+) -> Generator[Result[Any, Any], None, None]:
+    """
+    Read the results written by ``dump_results()`` from the binary `file`,
+    until its end. The values are deserialized with ``serializer.loads()``.
+
+    The file is read in chunks, and the results are produced lazily. Raise
+    ``ValueError`` if the data is truncated or invalid.
+    """
+    unpack = _HEADER.unpack_from
+    header_size = _HEADER.size
+    loads = serializer.loads
+    buffer = b""
+    pos = 0
+    while True:
+        if len(buffer) - pos < header_size:
+            buffer = buffer[pos:] + file.read(_CHUNK)
+            pos = 0
+            if not buffer:
+                return
+            if len(buffer) < header_size:
+                raise ValueError("truncated result header")
+        tag, length = unpack(buffer, pos)
+        start = pos + header_size
+        end = start + length
+        if end > len(buffer):
+            buffer = buffer[pos:] + file.read(max(_CHUNK, end - len(buffer)))
+            pos = 0
+            start = header_size
+            end = start + length
+            if end > len(buffer):
+                raise ValueError("truncated result payload")
+        if tag == _OK:
+            yield Ok(loads(buffer[start:end]))
+        elif tag == _ERR:
+            yield Err(loads(buffer[start:end]))
+        else:
+            raise ValueError("invalid result tag {}".format(tag))
+        pos = end
@@ -0,0 +1,501 @@
+from __future__ import annotations
+
+import __future__
+import ast
+import copy
+import functools
+import inspect
+import itertools
+import sys
+import textwrap
+import types
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+from .concurrency import _gather_in_order
+from .result import Err, Ok, do, do_async
+
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+# Compiled code objects, keyed by whether they were compiled for concurrency
+# and the code object of the original function, so functions that are created
+# repeatedly (e.g. closures) are only compiled once.
+_compiled: Dict[bool, weakref.WeakKeyDictionary[types.CodeType, types.CodeType]] = {
+    False: weakref.WeakKeyDictionary(),
+    True: weakref.WeakKeyDictionary(),
+}
+
+_FUTURE_FLAGS = 0
+for _feature in __future__.all_feature_names:
+    _FUTURE_FLAGS |= getattr(__future__, _feature).compiler_flag
+
+
+def _invalid(value: Any) -> None:
+    raise TypeError("do() requires Ok or Err values, got {!r}".format(value))
+
+
+# Names of the helpers that are made available to the compiled code.
+_HELPERS: Dict[str, Any] = {
+    "_do_Ok": Ok,
+    "_do_Err": Err,
+    "_do_invalid": _invalid,
+    "_do_gather": _gather_in_order,
+}
+
+_NESTED_SCOPES = (
+    ast.Lambda,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+)
+
+
+def _bound_names(target: ast.AST) -> List[str]:
+    return [
+        node.id
+        for node in ast.walk(target)
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store)
+    ]
+
+
+def _isinstance(name: str, class_name: str) -> ast.expr:
+    return ast.Call(
+        ast.Name("isinstance", ast.Load()),
+        [ast.Name(name, ast.Load()), ast.Name(class_name, ast.Load())],
+        [],
+    )
+
+
+def _contains_await(node: ast.AST) -> bool:
+    return any(isinstance(child, ast.Await) for child in ast.walk(node))
+
+
+def _references(node: ast.AST, names: Set[str]) -> bool:
+    return any(
+        isinstance(child, ast.Name) and child.id in names for child in ast.walk(node)
+    )
+
+
+def _rebinds(node: ast.AST, names: Set[str]) -> bool:
+    """
+    Return whether a scope nested inside `node` binds one of `names`, which
+    would make renaming them unsafe.
+    """
+    for child in ast.walk(node):
+        if not isinstance(child, _NESTED_SCOPES):
+            continue
+        for inner in ast.walk(child):
+            if isinstance(inner, ast.arg) and inner.arg in names:
+                return True
+            if isinstance(inner, ast.Name) and inner.id in names:
+                if not isinstance(inner.ctx, ast.Load):
+                    return True
+    return False
+
+
+class _Rename(ast.NodeTransformer):
+    def __init__(self, names: Dict[str, str]) -> None:
+        self.names = names
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        if node.id in self.names:
+            return ast.copy_location(ast.Name(self.names[node.id], node.ctx), node)
+        return node
+
+
+class _Mangle(ast.NodeTransformer):
+    """
+    Apply the name mangling of private names that the compiler would have
+    applied inside the class body the function was defined in.
+    """
+
+    def __init__(self, class_name: str) -> None:
+        self.prefix = "_" + class_name.lstrip("_")
+
+    def _mangle(self, name: str) -> str:
+        if name.startswith("__") and not name.endswith("__") and "." not in name:
+            return self.prefix + name
+        return name
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        node.id = self._mangle(node.id)
+        return node
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        node.attr = self._mangle(node.attr)
+        return self.generic_visit(node)
+
+    def visit_arg(self, node: ast.arg) -> ast.arg:
+        node.arg = self._mangle(node.arg)
+        return node
+
+
+def _enclosing_class(scopes: List[str]) -> Optional[str]:
+    """
+    Return the name of the nearest class among `scopes`, the parts of a
+    qualified name, skipping functions (the parts followed by ``<locals>``).
+    """
+    while scopes:
+        if scopes[-1] != "<locals>":
+            return scopes[-1]
+        scopes = scopes[:-2]
+    return None
+
+
+class _Rewrite(ast.NodeTransformer):
+    """
+    Replace ``do()`` and ``await do_async()`` calls whose value is returned or
+    assigned with the equivalent nested ``if`` statements.
+    """
+
+    def __init__(self, function: Callable[..., Any], concurrent: bool) -> None:
+        code = function.__code__
+        self.concurrent = concurrent
+        self.globals = function.__globals__
+        self.locals = set(code.co_varnames + code.co_cellvars + code.co_freevars)
+        self.counter = itertools.count()
+        self.rewritten = 0
+
+    def _do_call(
+        self, node: Optional[ast.expr]
+    ) -> Optional[Tuple[ast.GeneratorExp, bool]]:
+        """
+        Return the generator expression, and whether it belongs to a
+        ``do_async()`` call, if `node` is a ``do()`` call, or an awaited
+        ``do_async()`` call, that can be rewritten.
+        """
+        if node is None:
+            return None
+        is_async = isinstance(node, ast.Await)
+        if isinstance(node, ast.Await):
+            node = node.value
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id not in self.locals
+            and len(node.args) == 1
+            and not node.keywords
+            and isinstance(node.args[0], ast.GeneratorExp)
+        ):
+            return None
+        if self.globals.get(node.func.id) is not (do_async if is_async else do):
+            return None
+        gen = node.args[0]
+        if any(comp.ifs or comp.is_async for comp in gen.generators):
+            return None
+        if not is_async:
+            # Awaiting anywhere but in the first iterable creates an async
+            # generator, for which `do()` raises a helpful error at runtime.
+            rest = [gen.elt] + [comp.iter for comp in gen.generators[1:]]
+            if any(_contains_await(node) for node in rest):
+                return None
+        names = {name for comp in gen.generators for name in _bound_names(comp.target)}
+        nodes = [gen.elt] + [comp.iter for comp in gen.generators]
+        if any(_rebinds(node, names) for node in nodes):
+            return None
+        return gen, is_async
+
+    def _groups(
+        self, gen: ast.GeneratorExp, is_async: bool
+    ) -> List[List[ast.comprehension]]:
+        """
+        Split the ``for`` clauses into groups that can be awaited concurrently.
+
+        Unless compiling for concurrency, every clause is its own group.
+        Otherwise consecutive ``for x in await ...`` clauses form a group as
+        long as none of them refers to a name bound by another one.
+        """
+        groups: List[List[ast.comprehension]] = []
+        bound: Set[str] = set()
+        for comp in gen.generators:
+            if (
+                self.concurrent
+                and is_async
+                and groups
+                and isinstance(groups[-1][0].iter, ast.Await)
+                and isinstance(comp.iter, ast.Await)
+                and not _references(comp.iter, bound)
+            ):
+                groups[-1].append(comp)
+            else:
+                groups.append([comp])
+                bound = set()
+            bound.update(_bound_names(comp.target))
+        return groups
+
+    def _expand(
+        self,
+        gen: ast.GeneratorExp,
+        is_async: bool,
+        emit: Callable[[ast.expr], ast.stmt],
+    ) -> List[ast.stmt]:
+        renames: Dict[str, str] = {}
+        body: List[ast.stmt] = []
+        statements = body
+        for group in self._groups(gen, is_async):
+            index = next(self.counter)
+            result = "_do_r{}".format(index)
+            iterables = [_Rename(dict(renames)).visit(comp.iter) for comp in group]
+            for comp in group:
+                for name in _bound_names(comp.target):
+                    renames[name] = "_do_{}_{}".format(index, name)
+            targets = [_Rename(dict(renames)).visit(comp.target) for comp in group]
+            if len(group) == 1:
+                iterable, target = iterables[0], targets[0]
+            else:
+                iterable = ast.Await(
+                    ast.Call(
+                        ast.Name("_do_gather", ast.Load()),
+                        [ast.Tuple([it.value for it in iterables], ast.Load())],
+                        [],
+                    )
+                )
+                target = ast.Tuple(targets, ast.Store())
+            ok_branch: List[ast.stmt] = [
+                ast.Assign(
+                    targets=[target],
+                    value=ast.Attribute(
+                        ast.Name(result, ast.Load()), "_value", ast.Load()
+                    ),
+                )
+            ]
+            err_branch: List[ast.stmt] = [
+                ast.If(
+                    test=_isinstance(result, "_do_Err"),
+                    body=[emit(ast.Name(result, ast.Load()))],
+                    orelse=[
+                        ast.Expr(
+                            ast.Call(
+                                ast.Name("_do_invalid", ast.Load()),
+                                [ast.Name(result, ast.Load())],
+                                [],
+                            )
+                        )
+                    ],
+                )
+            ]
+            statements.append(
+                ast.Assign(targets=[ast.Name(result, ast.Store())], value=iterable)
+            )
+            statements.append(
+                ast.If(test=_isinstance(result, "_do_Ok"), body=ok_branch, orelse=err_branch)
+            )
+            statements = ok_branch
+        statements.append(emit(_Rename(renames).visit(gen.elt)))
+        self.rewritten += 1
+        return body
+
+    def visit_Return(self, node: ast.Return) -> Union[ast.stmt, List[ast.stmt]]:
+        call = self._do_call(node.value)
+        if call is None:
+            return cast(ast.stmt, self.generic_visit(node))
+        return [
+            ast.copy_location(statement, node)
+            for statement in self._expand(*call, lambda value: ast.Return(value))
+        ]
+
+    def visit_Assign(self, node: ast.Assign) -> Union[ast.stmt, List[ast.stmt]]:
+        call = self._do_call(node.value)
+        if call is None:
+            return cast(ast.stmt, self.generic_visit(node))
+        return [
+            ast.copy_location(statement, node)
+            for statement in self._expand(
+                *call,
+                lambda value: ast.Assign(targets=copy.deepcopy(node.targets), value=value),
+            )
+        ]
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> Union[ast.stmt, List[ast.stmt]]:
+        call = self._do_call(node.value)
+        if call is None or not node.simple:
+            return cast(ast.stmt, self.generic_visit(node))
+        target = node.target
+        annotation = ast.AnnAssign(target, node.annotation, None, node.simple)
+        expanded = self._expand(
+            *call, lambda value: ast.Assign(targets=[copy.deepcopy(target)], value=value)
+        )
+        return [ast.copy_location(statement, node) for statement in [annotation] + expanded]
+
+
+def _compile(function: Callable[..., Any], concurrent: bool) -> Optional[types.CodeType]:
+    """
+    Return the code object of `function` with its ``do()`` calls rewritten, or
+    `None` if there is nothing to rewrite.
+    """
+    code = function.__code__
+    try:
+        source = textwrap.dedent(inspect.getsource(function))
+        module = ast.parse(source)
+    except (OSError, TypeError, SyntaxError) as exc:
+        raise TypeError(
+            "do_function() requires the source code of {!r}".format(function)
+        ) from exc
+    definition = module.body[0] if module.body else None
+    if (
+        not isinstance(definition, (ast.FunctionDef, ast.AsyncFunctionDef))
+        or definition.name != code.co_name
+    ):
+        raise TypeError(
+            "do_function() can only be applied to functions defined with `def`"
+        )
+    definition.decorator_list = []
+
+    # Private names are mangled with the nearest enclosing class, including
+    # in functions nested inside its methods. If the qualified name doesn't
+    # tell which class that is, the function is left as it is.
+    qualname = getattr(code, "co_qualname", function.__qualname__).split(".")
+    if qualname[-1] != code.co_name or any(
+        part.startswith("<") and part != "<locals>" for part in qualname
+    ):
+        return None
+    class_name = _enclosing_class(qualname[:-1])
+    if class_name is not None and class_name.strip("_"):
+        _Mangle(class_name).visit(definition)
+
+    rewrite = _Rewrite(function, concurrent)
+    rewrite.visit(definition)
+    if not rewrite.rewritten:
+        return None
+
+    # Compile the function nested in a factory whose arguments are the free
+    # variables of the original function, so the compiled code refers to them
+    # as free variables as well and can be used with the original closure.
+    freevars = list(_HELPERS) + list(code.co_freevars)
+    tree = ast.parse("def _do_factory({}): pass".format(", ".join(freevars)))
+    factory = tree.body[0]
+    assert isinstance(factory, ast.FunctionDef)
+    factory.body = [definition, ast.Return(ast.Name(definition.name, ast.Load()))]
+    ast.fix_missing_locations(definition)
+    ast.increment_lineno(definition, code.co_firstlineno - 1)
+    ast.fix_missing_locations(tree)
+    compiled = compile(
+        tree,
+        code.co_filename,
+        "exec",
+        flags=code.co_flags & _FUTURE_FLAGS,
+        dont_inherit=True,
+    )
+    # The module contains the factory, which contains the function.
+    (factory_code,) = [c for c in compiled.co_consts if isinstance(c, types.CodeType)]
+    new_code = next(
+        c
+        for c in factory_code.co_consts
+        if isinstance(c, types.CodeType) and c.co_name == code.co_name
+    )
+    if sys.version_info >= (3, 11):
+        new_code = new_code.replace(co_qualname=code.co_qualname)
+    return new_code
+
+
+def _do_function(function: FuncT, concurrent: bool) -> FuncT:
+    if not isinstance(function, types.FunctionType):
+        raise TypeError("do_function() can only be applied to functions")
+    code = function.__code__
+    cache = _compiled[concurrent]
+    new_code = cache.get(code)
+    if new_code is None:
+        new_code = cache[code] = _compile(function, concurrent) or code
+    if new_code is code:
+        return function
+
+    cells = dict(zip(code.co_freevars, function.__closure__ or ()))
+    for name, value in _HELPERS.items():
+        cells[name] = types.CellType(value)
+    missing = set(new_code.co_freevars) - set(cells)
+    if missing:
+        raise TypeError(
+            "do_function() can't compile {!r}, it refers to {}".format(
+                function, ", ".join(sorted(missing))
+            )
+        )
+    compiled = types.FunctionType(
+        new_code,
+        function.__globals__,
+        function.__name__,
+        function.__defaults__,
+        tuple(cells[name] for name in new_code.co_freevars),
+    )
+    compiled.__kwdefaults__ = function.__kwdefaults__
+    compiled.__qualname__ = function.__qualname__
+    compiled.__module__ = function.__module__
+    compiled.__doc__ = function.__doc__
+    compiled.__annotations__ = function.__annotations__
+    compiled.__dict__.update(function.__dict__)
+    return cast(FuncT, compiled)
+
+
+@overload
+def do_function(function: FuncT) -> FuncT:
+    ...
+
+
+@overload
+def do_function(*, concurrent: bool = False) -> Callable[[FuncT], FuncT]:
+    ...
+
+
+def do_function(
+    function: Optional[FuncT] = None, *, concurrent: bool = False
+) -> Union[FuncT, Callable[[FuncT], FuncT]]:
+    """
+    Decorator that compiles the ``do()`` and ``do_async()`` expressions of a
+    function into plain ``if`` statements.
+
+    Each ``do()`` call whose value is returned or assigned to a variable, and
+    each such awaited ``do_async()`` call, is rewritten once at decoration
+    time into code that checks every result with ``isinstance()`` and returns
+    the first ``Err`` early, without creating a generator per call:
+
+    ``` python
+    @do_function
+    def get_output(a: str, b: bool) -> Result[float, int]:
+        return do(Ok(len(x) + int(y)) for x in parse(a) for y in check(b))
+    ```
+
+    The rewritten code behaves like the original, except that iterating over
+    anything other than an ``Ok`` or ``Err`` raises a ``TypeError``. Calls that
+    can't be rewritten, e.g. with ``if`` clauses, or a ``do()`` call for which
+    Python creates an async generator (which raises the usual helpful error),
+    are left as they are.
+
+    With ``@do_function(concurrent=True)``, consecutive ``for x in await ...``
+    clauses of a ``do_async()`` call that don't use each other's names are
+    awaited concurrently instead of one after another:
+
+    ``` python
+    @do_function(concurrent=True)
+    async def get_output(user_id: int) -> Result[Page, str]:
+        return await do_async(
+            Ok(render(user, orders))
+            for user in await fetch_user(user_id)
+            for orders in await fetch_orders(user_id)
+        )
+    ```
+
+    The result is still the first ``Err`` in clause order. Once an ``Err`` is
+    known, the awaitables of the later clauses in the same group are
+    cancelled.
+
+    The function's source code must be available, and ``do_function`` must be
+    the innermost decorator.
+    """
+    if function is None:
+        return functools.partial(_do_function, concurrent=concurrent)
+    return _do_function(function, concurrent)
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from collections import deque
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Deque,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from .result import Ok, Result
+
+T = TypeVar("T")
+E = TypeVar("E")
+
+
+def _retrieve_exception(task: asyncio.Future[Any]) -> None:
+    # Mark the exception of a task whose outcome is no longer needed as
+    # retrieved, so asyncio doesn't log it as never retrieved.
+    if not task.cancelled():
+        task.exception()
+
+
+async def _gather_in_order(
+    awaitables: Sequence[Awaitable[Result[Any, Any]]]
+) -> Result[Tuple[Any, ...], Any]:
+    """
+    Await results concurrently, and return ``Ok`` with a tuple of all values,
+    or the first result in input order that is not ``Ok``.
+
+    The outcome is the same as awaiting the results one after another and
+    stopping at the first ``Err`` (or exception). As soon as a result is known
+    to not be ``Ok``, the awaitables after it are cancelled, since their
+    results can no longer be used. Only the ones before it are still awaited,
+    as one of those might fail as well.
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    indices: Dict[asyncio.Future[Any], int] = {task: i for i, task in enumerate(tasks)}
+    failed = len(tasks)
+    try:
+        for task in tasks:
+            task.add_done_callback(_retrieve_exception)
+        pending = set(tasks)
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = indices[task]
+                if index < failed and (
+                    task.cancelled()
+                    or task.exception() is not None
+                    or not isinstance(task.result(), Ok)
+                ):
+                    failed = index
+                    for later in tasks[index + 1:]:
+                        later.cancel()
+            pending = {task for task in tasks[:failed] if not task.done()}
+        if failed < len(tasks):
+            result: Result[Tuple[Any, ...], Any] = tasks[failed].result()
+            return result
+        values: List[Any] = [task.result()._value for task in tasks]
+        return Ok(tuple(values))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _close(awaitable: Awaitable[Any]) -> None:
+    # Close coroutines that will never be awaited, so that Python doesn't warn
+    # about them.
+    if inspect.iscoroutine(awaitable):
+        awaitable.close()
+
+
+@overload
+async def gather_results(
+    awaitables: Iterable[Awaitable[Result[T, E]]],
+    *,
+    limit: Optional[int] = ...,
+    fail_fast: Literal[True] = ...,
+) -> Result[List[T], E]:
+    ...
+
+
+@overload
+async def gather_results(
+    awaitables: Iterable[Awaitable[Result[T, E]]],
+    *,
+    limit: Optional[int] = ...,
+    fail_fast: Literal[False],
+) -> List[Result[T, E]]:
+    ...
+
+
+async def gather_results(
+    awaitables: Iterable[Awaitable[Result[T, E]]],
+    *,
+    limit: Optional[int] = None,
+    fail_fast: bool = True,
+) -> Union[Result[List[T], E], List[Result[T, E]]]:
+    """
+    Await results concurrently, running at most `limit` of them at once.
+
+    By default, return ``Ok`` with a list of all values in input order, or the
+    first ``Err`` that completes. In that case the awaitables that are still
+    running are cancelled, and the ones that weren't started yet are never
+    started. If `fail_fast` is false, return a list of all results in input
+    order instead.
+
+    If an awaitable raises an exception, the others are cancelled as well and
+    the exception is propagated.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1 or None, got {!r}".format(limit))
+    inputs = list(awaitables)
+    results: List[Any] = [None] * len(inputs)
+    running: Dict[asyncio.Future[Any], int] = {}
+    started = 0
+    try:
+        while started < len(inputs) or running:
+            while started < len(inputs) and (limit is None or len(running) < limit):
+                task: asyncio.Future[Any] = asyncio.ensure_future(inputs[started])
+                task.add_done_callback(_retrieve_exception)
+                running[task] = started
+                started += 1
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=running.__getitem__):
+                index = running.pop(task)
+                result: Result[T, E] = task.result()
+                if fail_fast and not isinstance(result, Ok):
+                    return result
+                results[index] = result
+        if fail_fast:
+            return Ok([result._value for result in results])
+        return results
+    finally:
+        for task in running:
+            task.cancel()
+        for awaitable in inputs[started:]:
+            _close(awaitable)
+
+
+class AsCompletedResults(AsyncIterator[Tuple[int, Result[T, E]]]):
+    """
+    The async iterator returned by ``as_completed_results()``.
+    """
+
+    def __init__(
+        self,
+        awaitables: Union[
+            Iterable[Awaitable[Result[T, E]]], AsyncIterable[Awaitable[Result[T, E]]]
+        ],
+        limit: Optional[int],
+    ) -> None:
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1 or None, got {!r}".format(limit))
+        self._limit = limit
+        self._source = awaitables
+        self._iterator: Optional[Iterator[Awaitable[Result[T, E]]]] = None
+        self._async_iterator: Optional[AsyncIterator[Awaitable[Result[T, E]]]] = None
+        if isinstance(awaitables, AsyncIterable):
+            self._async_iterator = awaitables.__aiter__()
+        else:
+            self._iterator = iter(awaitables)
+        self._exhausted = False
+        self._started = 0
+        self._running: Dict[asyncio.Future[Any], int] = {}
+        # Tasks that are done, but whose results weren't returned yet.
+        self._done: Deque[Tuple[int, asyncio.Future[Any]]] = deque()
+
+    def __aiter__(self) -> AsCompletedResults[T, E]:
+        return self
+
+    async def __aenter__(self) -> AsCompletedResults[T, E]:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def _next_awaitable(self) -> Optional[Awaitable[Result[T, E]]]:
+        try:
+            if self._async_iterator is not None:
+                return await self._async_iterator.__anext__()
+            assert self._iterator is not None
+            return next(self._iterator)
+        except (StopIteration, StopAsyncIteration):
+            self._exhausted = True
+            return None
+
+    async def __anext__(self) -> Tuple[int, Result[T, E]]:
+        if not self._done:
+            # Only take new awaitables from the input when there is room for
+            # them, so that at most `limit` are held at a time.
+            while not self._exhausted and (
+                self._limit is None or len(self._running) < self._limit
+            ):
+                awaitable = await self._next_awaitable()
+                if awaitable is None:
+                    break
+                task: asyncio.Future[Any] = asyncio.ensure_future(awaitable)
+                task.add_done_callback(_retrieve_exception)
+                self._running[task] = self._started
+                self._started += 1
+            if not self._running:
+                raise StopAsyncIteration
+            done, _ = await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=self._running.__getitem__):
+                self._done.append((self._running.pop(task), task))
+        index, task = self._done.popleft()
+        try:
+            result: Result[T, E] = task.result()
+        except BaseException:
+            await self.aclose()
+            raise
+        return index, result
+
+    async def aclose(self) -> None:
+        """
+        Stop the iteration: cancel the awaitables that are still running, and
+        don't take any more from the input.
+        """
+        self._exhausted = True
+        for task in self._running:
+            task.cancel()
+        self._running.clear()
+        self._done.clear()
+        close = getattr(self._async_iterator, "aclose", None)
+        if close is not None:
+            await close()
+
+
+def as_completed_results(
+    awaitables: Union[Iterable[Awaitable[Result[T, E]]], AsyncIterable[Awaitable[Result[T, E]]]],
+    *,
+    limit: Optional[int] = None,
+) -> AsCompletedResults[T, E]:
+    """
+    Await results concurrently, and iterate over ``(index, result)`` pairs in
+    the order in which they complete, where `index` is the position of the
+    awaitable in the input.
+
+    The input can be an iterable or an async iterable. It is consumed lazily:
+    at most `limit` awaitables are taken from it and run at once, and the next
+    one is only taken when a result was returned. So with a limit, a large or
+    even unbounded input, e.g. a generator of coroutines, is processed with
+    bounded memory. Without it, all awaitables are started at once.
+
+    To stop early, call ``aclose()`` or use the iterator as an async context
+    manager, which cancels the awaitables that are still running::
+
+        async with as_completed_results(fetches, limit=10) as results:
+            async for index, result in results:
+                if isinstance(result, Ok):
+                    break
+
+    If an awaitable raises an exception, the iteration stops in the same way
+    and the exception is propagated.
+    """
+    return AsCompletedResults(awaitables, limit)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[Any]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+def _single_flight(
+    function: Callable[..., Awaitable[Result[Any, Any]]]
+) -> Callable[..., Awaitable[Result[Any, Any]]]:
+    """
+    Wrap an async function so that concurrent calls with equal arguments share
+    a single call. Calls with unhashable arguments aren't shared.
+
+    The first call runs the function in a task, and calls with equal arguments
+    that are made before the task is done await the same task and get the same
+    result. The task is shielded from the cancellation of a single caller and
+    is only cancelled when all its callers are.
+    """
+    flights: Dict[Hashable, _Flight] = {}
+
+    def finished(key: Hashable, flight: _Flight, *_: Any) -> None:
+        if flights.get(key) is flight:
+            del flights[key]
+
+    @functools.wraps(function)
+    async def single_flight(*args: Any, **kwargs: Any) -> Result[Any, Any]:
+        # Tasks are bound to their event loop, so calls on different loops
+        # don't share them.
+        key = (asyncio.get_running_loop(), args, tuple(kwargs.items()))
+        try:
+            flight = flights.get(key)
+        except TypeError:
+            # An unhashable argument, such as a list, so the call isn't shared.
+            return await function(*args, **kwargs)
+        if flight is None:
+            flight = flights[key] = _Flight(asyncio.ensure_future(function(*args, **kwargs)))
+            flight.task.add_done_callback(functools.partial(finished, key, flight))
+        flight.waiters += 1
+        try:
+            result: Result[Any, Any] = await asyncio.shield(flight.task)
+            return result
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # The last caller was cancelled, so nobody needs the result.
+                finished(key, flight)
+                flight.task.cancel()
+
+    return single_flight
@@ -0,0 +1,58 @@
+"""
+Deadlines for chains of async operations, see ``deadline()``.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# The deadline of the current context as a `time.monotonic()` value, if any.
+_deadline: ContextVar[Optional[float]] = ContextVar("result_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The deadline set with ``deadline()`` passed before an operation finished.
+    """
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Give the async operations run in the context a budget of `seconds`, and
+    return the deadline as a ``time.monotonic()`` value::
+
+        with deadline(0.5):
+            result = await Ok(request).and_then_async(authorize).and_then_async(fetch)
+
+    The functions passed to ``Ok.map_async()`` and ``Ok.and_then_async()``,
+    and the functions decorated with ``as_async_result()``, are only called if
+    the deadline hasn't passed yet, and are cancelled when it passes. In both
+    cases, ``DeadlineExceeded`` is raised. Functions decorated with
+    ``as_async_result()`` return it as an ``Err`` if it's one of their
+    exception types, e.g. with ``TimeoutError``.
+
+    A nested deadline can only shorten the budget, never extend it. The
+    deadline is stored in a context variable, so it applies to tasks started
+    in the context as well.
+    """
+    end = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < end:
+        end = current
+    token = _deadline.set(end)
+    try:
+        yield end
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Return the number of seconds until the deadline of the current context,
+    which is negative once it passed, or ``None`` if there is none.
+    """
+    end = _deadline.get()
+    return None if end is None else end - time.monotonic()
@@ -0,0 +1,165 @@
+"""
+Hedged calls of functions decorated with ``as_async_result()``, see ``Hedge``.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, NamedTuple, Optional
+
+from .concurrency import _retrieve_exception
+from .result import Ok, Result
+
+# The number of latencies needed before the learned delay is used.
+_MIN_SAMPLES = 20
+
+
+class HedgeStats(NamedTuple):
+    """
+    Statistics of a ``Hedge``.
+    """
+
+    calls: int
+    hedged: int  # Calls that started a second attempt
+    hedge_wins: int  # Calls whose result came from the second attempt
+    delay: float  # The current delay before a second attempt, in seconds
+
+
+class Hedge:
+    """
+    A hedging policy for functions decorated with ``as_async_result()``,
+    passed to them as the `hedge` argument::
+
+        @as_async_result(HTTPError, hedge=Hedge(percentile=95, budget=0.05))
+        async def fetch(url: str) -> bytes:
+            ...
+
+    If a call hasn't returned after a delay, the function is called a second
+    time with the same arguments, and the first ``Ok`` of the two attempts is
+    returned. The other attempt is then cancelled. If both return an ``Err``,
+    the first one is returned. An ``Err`` returned before the delay is returned
+    right away, as hedging is meant to cut the latency of slow calls, not to
+    retry failed ones.
+
+    The delay is `delay` seconds, or with a `percentile`, that percentile of
+    the latencies of the last `window` completed attempts, once there are at
+    least 20 of them. At most a `budget` fraction of the last `window` calls
+    are hedged, which caps the extra load on the backend.
+
+    Only use it for functions that are safe to call twice. A hedge can be
+    shared by multiple functions of the same backend.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.1,
+        percentile: Optional[float] = None,
+        window: int = 1000,
+        budget: float = 0.1,
+    ) -> None:
+        if delay < 0:
+            raise ValueError("delay must not be negative, got {!r}".format(delay))
+        if percentile is not None and not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100, got {!r}".format(percentile))
+        if window < 1:
+            raise ValueError("window must be at least 1, got {!r}".format(window))
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1, got {!r}".format(budget))
+        self._delay = delay
+        self._percentile = percentile
+        self._budget = budget
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._observed = 0
+        # Whether each of the last `window` calls was hedged.
+        self._recent: Deque[bool] = deque(maxlen=window)
+        self._recent_hedged = 0
+        self._calls = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def stats(self) -> HedgeStats:
+        """
+        Return the number of calls, how many of them were hedged, and the
+        current delay.
+        """
+        return HedgeStats(self._calls, self._hedged, self._hedge_wins, self._delay)
+
+    def _observe(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._observed += 1
+        # Sorting the latencies for every attempt would be too slow, so the
+        # delay is only updated every tenth of a window.
+        if (
+            self._percentile is not None
+            and len(self._latencies) >= _MIN_SAMPLES
+            and self._observed % max(1, len(self._latencies) // 10) == 0
+        ):
+            latencies = sorted(self._latencies)
+            index = min(len(latencies) - 1, int(len(latencies) * self._percentile / 100))
+            self._delay = latencies[index]
+
+    def _record_call(self, slow: bool) -> bool:
+        """
+        Record a call, and return whether to hedge it, which is the case if it
+        is `slow` and within the budget.
+        """
+        hedge = slow and self._recent_hedged + 1 <= self._budget * (len(self._recent) + 1)
+        if len(self._recent) == self._recent.maxlen and self._recent[0]:
+            self._recent_hedged -= 1
+        self._recent.append(hedge)
+        if hedge:
+            self._recent_hedged += 1
+            self._hedged += 1
+        return hedge
+
+    def _wrap_async(
+        self, function: Callable[..., Awaitable[Result[Any, Any]]]
+    ) -> Callable[..., Awaitable[Result[Any, Any]]]:
+        @functools.wraps(function)
+        async def hedged(*args: Any, **kwargs: Any) -> Result[Any, Any]:
+            loop = asyncio.get_running_loop()
+
+            def attempt() -> asyncio.Future[Result[Any, Any]]:
+                started = loop.time()
+
+                def observe(task: asyncio.Future[Result[Any, Any]]) -> None:
+                    if not task.cancelled() and task.exception() is None:
+                        self._observe(loop.time() - started)
+
+                task = asyncio.ensure_future(function(*args, **kwargs))
+                task.add_done_callback(observe)
+                return task
+
+            self._calls += 1
+            tasks: List[asyncio.Future[Result[Any, Any]]] = [attempt()]
+            try:
+                done, _ = await asyncio.wait(tasks, timeout=self._delay)
+                if not self._record_call(slow=not done):
+                    return await tasks[0]
+                tasks.append(attempt())
+                pending = set(tasks)
+                first_err: Optional[Result[Any, Any]] = None
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in tasks:
+                        if task not in done:
+                            continue
+                        result = task.result()
+                        if isinstance(result, Ok):
+                            if task is not tasks[0]:
+                                self._hedge_wins += 1
+                            return result
+                        if first_err is None:
+                            first_err = result
+                assert first_err is not None
+                return first_err
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.add_done_callback(_retrieve_exception)
+                        task.cancel()
+
+        return hedged
@@ -0,0 +1,241 @@
+"""
+Hooks for observing every call of a function decorated with ``as_result()`` or
+``as_async_result()``.
+
+A hook is called after each call with the function that the decorator
+wrapped, the returned ``Ok`` or ``Err`` and the duration of the call in
+seconds. That is the undecorated function, except with the `limiter` of
+``as_async_result()``, where it's the wrapper that applies the limits. That
+wrapper has the name and module of the undecorated function, and refers to it
+as ``__wrapped__``. Exceptions raised by a hook propagate to the caller.
+
+While no hook is registered, the decorated functions run exactly the same code
+as without this module. Registering the first hook swaps the code of all of
+them, including the ones decorated later, for an instrumented version, and
+removing the last hook swaps it back.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Tuple
+
+from .result import ExceptionRecord, Ok, Result, _set_hooks
+from . import result as _result
+
+Hook = Callable[[Callable[..., Any], Result[Any, Any], float], Any]
+
+# The default upper bounds of the latency histogram buckets, in seconds.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0
+)
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Register a hook, to be called after every call of a function decorated
+    with ``as_result()`` or ``as_async_result()``.
+    """
+    _set_hooks(_result._hooks + (hook,))
+
+
+def remove_hook(hook: Hook) -> None:
+    """
+    Unregister a hook. Raises ``ValueError`` if it isn't registered.
+    """
+    hooks = list(_result._hooks)
+    hooks.remove(hook)
+    _set_hooks(tuple(hooks))
+
+
+def hooks() -> List[Hook]:
+    """
+    Return the registered hooks, in the order they are called.
+    """
+    return list(_result._hooks)
+
+
+def _error_type(error: Any) -> str:
+    if isinstance(error, ExceptionRecord):
+        return error.exc_type.__name__
+    return type(error).__name__
+
+
+class _FunctionMetrics:
+    __slots__ = ("ok", "err", "errors", "duration", "buckets")
+
+    def __init__(self, buckets: int) -> None:
+        self.ok = 0
+        self.err = 0
+        self.errors: Dict[str, int] = {}
+        self.duration = 0.0
+        # The number of calls per bucket (not cumulative), the last one being
+        # the calls slower than the largest bound.
+        self.buckets = [0] * (buckets + 1)
+
+
+class ResultMetrics:
+    """
+    A hook that aggregates, per decorated function, the number of ``Ok`` and
+    ``Err`` results, the number of errors by exception type, and a histogram
+    of the call durations.
+
+    Register it with ``add_hook(metrics)``, and use ``snapshot()`` or
+    ``to_openmetrics()`` to read the aggregated values. It is safe to use from
+    multiple threads.
+
+    Functions are told apart by their module and qualified name, so the calls
+    of functions with the same name, e.g. closures created by a factory, are
+    aggregated together. The functions themselves aren't kept alive.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets must be strictly increasing")
+        self._bounds = tuple(buckets)
+        self._functions: Dict[Tuple[Any, str], _FunctionMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, function: Callable[..., Any], result: Result[Any, Any], duration: float
+    ) -> None:
+        key = _key(function)
+        with self._lock:
+            metrics = self._functions.get(key)
+            if metrics is None:
+                metrics = self._functions[key] = _FunctionMetrics(len(self._bounds))
+            if isinstance(result, Ok):
+                metrics.ok += 1
+            else:
+                metrics.err += 1
+                error_type = _error_type(result._value)
+                metrics.errors[error_type] = metrics.errors.get(error_type, 0) + 1
+            metrics.duration += duration
+            metrics.buckets[bisect_left(self._bounds, duration)] += 1
+
+    def reset(self) -> None:
+        """
+        Discard all aggregated values.
+        """
+        with self._lock:
+            self._functions.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the aggregated values as a dictionary that maps the qualified
+        name of each function to its values, e.g.::
+
+            {
+                "app.fetch": {
+                    "ok": 10,
+                    "err": 2,
+                    "errors": {"TimeoutError": 2},
+                    "duration": {
+                        "sum": 0.24,
+                        "buckets": {0.01: 5, 0.05: 11, ..., inf: 12},
+                    },
+                },
+            }
+
+        The histogram buckets are cumulative, i.e. map each upper bound to the
+        number of calls that took at most that long.
+        """
+        with self._lock:
+            items = [
+                (key, metrics.ok, metrics.err, dict(metrics.errors),
+                 metrics.duration, list(metrics.buckets))
+                for key, metrics in self._functions.items()
+            ]
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for key, ok, err, errors, duration, buckets in items:
+            cumulative: Dict[float, int] = {}
+            count = 0
+            for bound, calls in zip(self._bounds + (float("inf"),), buckets):
+                count += calls
+                cumulative[bound] = count
+            snapshot["{}.{}".format(*key)] = {
+                "ok": ok,
+                "err": err,
+                "errors": errors,
+                "duration": {"sum": duration, "buckets": cumulative},
+            }
+        return snapshot
+
+    def to_openmetrics(self) -> str:
+        """
+        Return the aggregated values in the OpenMetrics text format.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# TYPE result_calls counter",
+            "# HELP result_calls Calls of functions decorated with as_result().",
+        ]
+        for name, values in snapshot.items():
+            for outcome in ("ok", "err"):
+                lines.append(
+                    "result_calls_total{{function={},outcome=\"{}\"}} {}".format(
+                        _label(name), outcome, values[outcome]
+                    )
+                )
+        lines += [
+            "# TYPE result_errors counter",
+            "# HELP result_errors Err results by exception type.",
+        ]
+        for name, values in snapshot.items():
+            for error_type, count in values["errors"].items():
+                lines.append(
+                    "result_errors_total{{function={},type={}}} {}".format(
+                        _label(name), _label(error_type), count
+                    )
+                )
+        lines += [
+            "# TYPE result_call_duration_seconds histogram",
+            "# UNIT result_call_duration_seconds seconds",
+            "# HELP result_call_duration_seconds Duration of the calls.",
+        ]
+        for name, values in snapshot.items():
+            buckets = values["duration"]["buckets"]
+            for bound, count in buckets.items():
+                lines.append(
+                    "result_call_duration_seconds_bucket{{function={},le=\"{}\"}} {}".format(
+                        _label(name), "+Inf" if bound == float("inf") else repr(bound), count
+                    )
+                )
+            lines.append(
+                "result_call_duration_seconds_sum{{function={}}} {!r}".format(
+                    _label(name), values["duration"]["sum"]
+                )
+            )
+            lines.append(
+                "result_call_duration_seconds_count{{function={}}} {}".format(
+                    _label(name), values["ok"] + values["err"]
+                )
+            )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path: str) -> None:
+        """
+        Write the aggregated values in the OpenMetrics text format to a file,
+        e.g. one that is read by the textfile collector of a metrics agent.
+
+        The file is replaced atomically, so readers never see a partial file.
+        """
+        temporary = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_openmetrics())
+        os.replace(temporary, path)
+
+
+def _key(function: Callable[..., Any]) -> Tuple[Any, str]:
+    return (
+        getattr(function, "__module__", None),
+        getattr(function, "__qualname__", None) or repr(function),
+    )
+
+
+def _label(value: str) -> str:
+    return '"{}"'.format(
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
@@ -0,0 +1,217 @@
+"""
+Concurrency and rate limiting of functions decorated with
+``as_async_result()``, see ``Limiter``.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, NamedTuple, Optional, TypeVar
+
+R = TypeVar("R")
+
+
+class LimiterTimeout(TimeoutError):
+    """
+    A call waited longer than the `timeout` of its ``Limiter`` to start.
+    """
+
+
+class LimiterStats(NamedTuple):
+    """
+    Statistics of a ``Limiter``.
+    """
+
+    running: int  # Calls that are currently running
+    queued: int  # Calls that are currently waiting to start
+    max_queued: int  # The highest number of waiting calls so far
+    started: int
+    timeouts: int
+    total_wait: float  # The total time calls waited before starting, in seconds
+    max_wait: float
+
+
+class Limiter:
+    """
+    A limit on the calls of functions decorated with ``as_async_result()``,
+    passed to them as the `limiter` argument::
+
+        @as_async_result(HTTPError, LimiterTimeout, limiter=Limiter(max_concurrency=10))
+        async def fetch(url: str) -> bytes:
+            ...
+
+    At most `max_concurrency` calls run at once, and with a `rate`, calls are
+    started at most `rate` times per second on average, with bursts of up to
+    `burst` calls (a token bucket). Calls over the limits wait in a queue and
+    are started in the order in which they were made.
+
+    If a call waits longer than `timeout` seconds, it returns
+    ``Err(LimiterTimeout(...))`` without calling the function, so
+    ``LimiterTimeout`` (or one of its base classes, such as ``TimeoutError``)
+    must be one of the exception types of the decorated function.
+
+    A limiter can be shared by multiple functions, which then share the limits.
+    It is meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                "max_concurrency must be at least 1 or None, got {!r}".format(max_concurrency)
+            )
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive or None, got {!r}".format(rate))
+        if burst < 1:
+            raise ValueError("burst must be at least 1, got {!r}".format(burst))
+        if timeout is not None and timeout < 0:
+            raise ValueError("timeout must not be negative, got {!r}".format(timeout))
+        self._max_concurrency = max_concurrency
+        self._rate = rate
+        self._burst = burst
+        self._timeout = timeout
+        self._tokens = float(burst)
+        self._refilled: Optional[float] = None
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._refill_handle: Optional[asyncio.TimerHandle] = None
+        self._running = 0
+        self._max_queued = 0
+        self._started = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """
+        Return how long calls wait to start at most, in seconds.
+        """
+        return self._timeout
+
+    def stats(self) -> LimiterStats:
+        """
+        Return the number of running and waiting calls, and how long calls
+        waited to start.
+        """
+        return LimiterStats(
+            self._running,
+            len(self._waiters),
+            self._max_queued,
+            self._started,
+            self._timeouts,
+            self._total_wait,
+            self._max_wait,
+        )
+
+    def _take_token(self, now: float) -> Optional[float]:
+        """
+        Take a token if there is one and return ``None``, or return how long
+        it takes until there is one.
+        """
+        if self._rate is None:
+            return None
+        if self._refilled is not None:
+            self._tokens = min(
+                float(self._burst), self._tokens + (now - self._refilled) * self._rate
+            )
+        self._refilled = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self._rate
+        self._tokens -= 1
+        return None
+
+    def _record_wait(self, wait: float) -> None:
+        self._started += 1
+        self._total_wait += wait
+        if wait > self._max_wait:
+            self._max_wait = wait
+
+    def _dispatch(self) -> None:
+        """
+        Start waiting calls from the front of the queue while the limits allow.
+        """
+        self._refill_handle = None
+        loop = asyncio.get_running_loop()
+        while self._waiters:
+            if self._waiters[0].done():
+                # Cancelled while waiting.
+                self._waiters.popleft()
+                continue
+            if self._max_concurrency is not None and self._running >= self._max_concurrency:
+                return
+            delay = self._take_token(loop.time())
+            if delay is not None:
+                self._refill_handle = loop.call_later(delay, self._dispatch)
+                return
+            self._waiters.popleft().set_result(None)
+            self._running += 1
+
+    def _release(self) -> None:
+        self._running -= 1
+        if self._waiters and self._refill_handle is None:
+            self._dispatch()
+
+    async def _acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        enqueued = loop.time()
+        if not self._waiters and (
+            self._max_concurrency is None or self._running < self._max_concurrency
+        ):
+            if self._take_token(enqueued) is None:
+                self._running += 1
+                self._record_wait(0.0)
+                return
+
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters.append(waiter)
+        if len(self._waiters) > self._max_queued:
+            self._max_queued = len(self._waiters)
+        if self._refill_handle is None:
+            self._dispatch()
+        expire = None
+        if self._timeout is not None and not waiter.done():
+            expire = loop.call_later(self._timeout, self._expire, waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.cancelled():
+                # Cancelled while waiting, so it no longer counts as queued.
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            elif waiter.done() and waiter.exception() is None:
+                # The call was started, but it was cancelled before it ran.
+                self._release()
+            raise
+        finally:
+            if expire is not None:
+                expire.cancel()
+        self._record_wait(loop.time() - enqueued)
+
+    def _expire(self, waiter: asyncio.Future[None]) -> None:
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            self._timeouts += 1
+            waiter.set_exception(
+                LimiterTimeout("waited more than {}s to start".format(self._timeout))
+            )
+
+    def _wrap_async(
+        self, function: Callable[..., Awaitable[R]]
+    ) -> Callable[..., Awaitable[R]]:
+        @functools.wraps(function)
+        async def limited(*args: Any, **kwargs: Any) -> R:
+            await self._acquire()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                self._release()
+
+        return limited
@@ -0,0 +1,283 @@
+"""
+NumPy-backed batches of numeric results.
+
+This module requires NumPy, which is an optional dependency (install it with
+``pip install result[numpy]``). Importing ``result`` itself never imports it.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .result import Err, Ok, Result
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "result.numeric requires NumPy, install it with `pip install result[numpy]`"
+    ) from exc
+
+
+def _readonly(array: npt.NDArray[Any]) -> npt.NDArray[Any]:
+    array.flags.writeable = False
+    return array
+
+
+class NumericResultArray:
+    """
+    A batch of results with numeric `Ok` values, stored as NumPy arrays.
+
+    The `Ok` values live in one value array and the `Err` elements are marked
+    in a boolean error mask. Since error values are usually not numeric, they
+    are kept in a side table that maps the position of every `Err` element to
+    its error value. The value array holds a placeholder at those positions.
+    """
+
+    __slots__ = ("_values", "_errors", "_payloads")
+
+    def __init__(
+        self,
+        values: npt.ArrayLike,
+        errors: Optional[npt.ArrayLike] = None,
+        payloads: Optional[Mapping[int, Any]] = None,
+    ) -> None:
+        self._values = _readonly(np.array(values))
+        if self._values.ndim != 1:
+            raise ValueError("NumericResultArray() requires one-dimensional values")
+        if errors is None:
+            self._errors = _readonly(np.zeros(len(self._values), dtype=bool))
+        else:
+            self._errors = _readonly(np.array(errors, dtype=bool))
+            if self._errors.shape != self._values.shape:
+                raise ValueError("values and errors must have the same length")
+        self._payloads: Dict[int, Any] = dict(payloads or {})
+        if set(self._payloads) - set(np.flatnonzero(self._errors).tolist()):
+            raise ValueError("payloads can only be given for Err elements")
+
+    @classmethod
+    def _from_arrays(
+        cls,
+        values: npt.NDArray[Any],
+        errors: npt.NDArray[np.bool_],
+        payloads: Dict[int, Any],
+    ) -> NumericResultArray:
+        # Skips the copying and validation of ``__init__()`` for arrays that
+        # were created by the methods below.
+        array: NumericResultArray = cls.__new__(cls)
+        array._values = _readonly(values) if values.flags.writeable else values
+        array._errors = errors
+        array._payloads = payloads
+        return array
+
+    @classmethod
+    def from_results(
+        cls, results: Iterable[Result[Any, Any]], dtype: npt.DTypeLike = float
+    ) -> NumericResultArray:
+        """
+        Build a batch from ``Ok`` and ``Err`` instances.
+        """
+        values: List[Any] = []
+        errors: List[bool] = []
+        payloads: Dict[int, Any] = {}
+        for index, result in enumerate(results):
+            if isinstance(result, Ok):
+                values.append(result._value)
+                errors.append(False)
+            elif isinstance(result, Err):
+                values.append(0)
+                errors.append(True)
+                payloads[index] = result._value
+            else:
+                raise TypeError(
+                    "from_results() requires Ok or Err values, got {!r}".format(result)
+                )
+        return cls(np.array(values, dtype=dtype), errors, payloads)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> Result[Any, Any]:
+        if self._errors[index]:
+            return Err(self._payloads.get(index % len(self._values)))
+        return Ok(self._values[index].item())
+
+    def __iter__(self) -> Iterator[Result[Any, Any]]:
+        return iter(self.to_list())
+
+    def __repr__(self) -> str:
+        return "NumericResultArray({})".format(repr(self.to_list()))
+
+    @property
+    def values(self) -> npt.NDArray[Any]:
+        """
+        Return the read-only value array, including placeholders at the
+        positions of `Err` elements.
+        """
+        return self._values
+
+    @property
+    def errors(self) -> npt.NDArray[np.bool_]:
+        """
+        Return the read-only error mask, which is ``True`` for `Err` elements.
+        """
+        return self._errors
+
+    def to_list(self) -> List[Result[Any, Any]]:
+        """
+        Return the contained results as a list of ``Ok`` and ``Err`` instances.
+        """
+        return [
+            Err(self._payloads.get(index)) if error else Ok(value)
+            for index, (value, error) in enumerate(
+                zip(self._values.tolist(), self._errors.tolist())
+            )
+        ]
+
+    def oks(self) -> npt.NDArray[Any]:
+        """
+        Return an array of the values of the ``Ok`` elements, in order.
+        """
+        oks: npt.NDArray[Any] = self._values[~self._errors]
+        return oks
+
+    def errs(self) -> List[Any]:
+        """
+        Return a list of the values of the ``Err`` elements, in order.
+        """
+        return [
+            self._payloads.get(index) for index in np.flatnonzero(self._errors).tolist()
+        ]
+
+    def map(
+        self,
+        op: Callable[[npt.NDArray[Any]], npt.ArrayLike],
+        *,
+        check_finite: bool = True,
+        check_overflow: bool = True,
+    ) -> NumericResultArray:
+        """
+        Map all ``Ok`` values to new values with one call of the passed in
+        vectorized function (usually a ufunc), leaving ``Err`` elements
+        untouched.
+
+        The values of the new batch have the dtype returned by the function.
+        The function runs with NumPy floating point errors ignored. Unless
+        `check_finite` is false, every ``Ok`` element that is mapped to NaN or
+        infinity, which is how NumPy reports such errors, becomes an ``Err``
+        holding a ``FloatingPointError``.
+
+        For integer results, NumPy reports a division by zero, which yields 0,
+        only as an error flag. If it's raised, the function is called again for
+        each element to find the failed ones, which become an ``Err`` holding
+        a ``FloatingPointError``. Overflows wrap around without any error, so
+        unless `check_overflow` is false, the function is called again with
+        the values as ``float64``, and elements whose results differ become an
+        ``Err`` holding an ``OverflowError``.
+        """
+        flagged: List[str] = []
+        with np.errstate(all="call", call=lambda error, flag: flagged.append(error)):
+            mapped = np.asarray(op(self._values))
+        if mapped.shape != self._values.shape:
+            raise ValueError(
+                "map() requires an elementwise function, got shape {} for {}".format(
+                    mapped.shape, self._values.shape
+                )
+            )
+        # Replace the mapped placeholders of the `Err` elements, without
+        # promoting the dtype to that of the placeholders.
+        values = mapped.copy()
+        values[self._errors] = 0
+        name = getattr(op, "__name__", repr(op))
+        failed: Dict[int, Exception] = {}
+        if values.dtype.kind in "iu":
+            if flagged:
+                failed.update(self._failed_elements(op))
+            if check_overflow:
+                for index in self._overflowed(op, values).tolist():
+                    failed.setdefault(index, OverflowError(
+                        "{} overflowed for {!r}".format(name, self._values[index].item())
+                    ))
+        elif check_finite and np.issubdtype(values.dtype, np.inexact):
+            for index in np.flatnonzero(~self._errors & ~np.isfinite(values)).tolist():
+                failed[index] = FloatingPointError(
+                    "{} returned {!r}".format(name, values[index].item())
+                )
+        if not failed:
+            return self._from_arrays(values, self._errors, self._payloads)
+        errors = self._errors.copy()
+        errors[list(failed)] = True
+        payloads = dict(self._payloads)
+        payloads.update(failed)
+        return self._from_arrays(values, _readonly(errors), payloads)
+
+    def _failed_elements(
+        self, op: Callable[[npt.NDArray[Any]], npt.ArrayLike]
+    ) -> Dict[int, Exception]:
+        """
+        Call `op` for every ``Ok`` element on its own, and return the errors
+        NumPy raised by position.
+        """
+        failed: Dict[int, Exception] = {}
+        with np.errstate(all="raise"):
+            for index in np.flatnonzero(~self._errors).tolist():
+                try:
+                    op(self._values[index:index + 1])
+                except FloatingPointError as exc:
+                    failed[index] = exc
+        return failed
+
+    def _overflowed(
+        self, op: Callable[[npt.NDArray[Any]], npt.ArrayLike], values: npt.NDArray[Any]
+    ) -> npt.NDArray[np.intp]:
+        """
+        Return the positions of the ``Ok`` elements whose integer results
+        differ from the results for the values as ``float64`` by more than
+        rounding errors can explain.
+        """
+        try:
+            with np.errstate(all="ignore"):
+                exact = np.asarray(op(self._values.astype(np.float64)), dtype=np.float64)
+        except (TypeError, ValueError):
+            # Not defined for floats, e.g. a bitwise operation.
+            return np.flatnonzero(np.zeros(0, dtype=bool))
+        if exact.shape != values.shape:
+            return np.flatnonzero(np.zeros(0, dtype=bool))
+        # A result that wrapped around is off by a multiple of 2 ** bits, far
+        # more than the rounding errors of ``float64`` for results in range.
+        with np.errstate(all="ignore"):
+            error = values.astype(np.float64)
+            error -= exact
+            np.abs(error, out=error)
+            overflowed = error >= 2.0 ** (values.dtype.itemsize * 8 - 1)
+        overflowed &= ~self._errors
+        return np.flatnonzero(overflowed)
+
+    def map_err(self, op: Callable[[Any], Any]) -> NumericResultArray:
+        """
+        Map the value of every ``Err`` element to a new value using the passed
+        in function, leaving ``Ok`` elements untouched.
+        """
+        payloads = {
+            index: op(self._payloads.get(index))
+            for index in np.flatnonzero(self._errors).tolist()
+        }
+        return self._from_arrays(self._values, self._errors, payloads)
+
+    def unwrap_or(self, default: Any) -> npt.NDArray[Any]:
+        """
+        Return an array of all values, with `default` filled in for every
+        ``Err`` element.
+
+        The array keeps the dtype of the values if `default` can be represented
+        in it exactly, e.g. ``0.0`` for integer values, and is promoted
+        otherwise, e.g. to ``float64`` for ``0.5``.
+        """
+        dtype = self._values.dtype
+        fill = np.asarray(default)
+        if fill.dtype != dtype and fill.dtype.kind in "biuf" and dtype.kind in "biuf":
+            with np.errstate(all="ignore"):
+                cast = fill.astype(dtype)
+            if np.array_equal(cast, fill, equal_nan=dtype.kind == "f"):
+                fill = cast
+        return np.where(self._errors, fill, self._values)
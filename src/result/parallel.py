@@ -0,0 +1,149 @@
+"""
+Parallel mapping of functions over many items on thread and process pools,
+see ``parallel_map()``.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from .result import Err, ExceptionRecord, Ok, Result
+
+T = TypeVar("T")
+R = TypeVar("R")
+TBE = TypeVar("TBE", bound=BaseException)
+
+
+def _picklable(value: Any) -> bool:
+    # Some exceptions can be pickled, but not unpickled, e.g. when their
+    # `__init__()` takes other arguments than their `args`.
+    try:
+        pickle.loads(pickle.dumps(value))
+    except Exception:
+        return False
+    return True
+
+
+def _transferable(exc: BaseException) -> Union[BaseException, ExceptionRecord[Any]]:
+    """
+    Return `exc` if it can be sent back from a worker process, or else an
+    ``ExceptionRecord`` of it that can.
+    """
+    if _picklable(exc):
+        return exc
+    record = ExceptionRecord.from_exception(exc)
+    if _picklable(record):
+        return record
+    # Fall back to the representation of the arguments, and to the nearest
+    # base class that can be pickled, e.g. for exception classes defined in a
+    # function.
+    args = tuple(repr(arg) for arg in exc.args)
+    for exc_type in type(exc).__mro__:
+        record = ExceptionRecord(exc_type, args)
+        if _picklable(record):
+            return record
+    raise AssertionError("BaseException can always be pickled")  # pragma: no cover
+
+
+def _run_chunk(
+    fn: Callable[[Any], Any],
+    exceptions: Tuple[Type[BaseException], ...],
+    items: List[Any],
+    in_process: bool,
+) -> List[Result[Any, Any]]:
+    results: List[Result[Any, Any]] = []
+    for item in items:
+        try:
+            results.append(Ok(fn(item)))
+        except exceptions as exc:
+            results.append(Err(_transferable(exc) if in_process else exc))
+    return results
+
+
+def parallel_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *exceptions: Type[TBE],
+    executor: Optional[Executor] = None,
+    chunksize: int = 1,
+    max_pending: Optional[int] = None,
+) -> Generator[Result[R, Union[TBE, ExceptionRecord[TBE]]], None, None]:
+    """
+    Call `fn` for every item on `executor`, and iterate over the results in
+    the order of the items. Like with ``as_result()``, return values are
+    turned into ``Ok(value)``, and raised exceptions of the given types into
+    ``Err(exc)``. Other exceptions are raised by the iterator::
+
+        with ProcessPoolExecutor() as pool:
+            for result in parallel_map(parse, lines, ValueError, executor=pool, chunksize=1000):
+                ...
+
+    The items are sent to the workers in chunks of `chunksize`, which cuts the
+    overhead per item on process pools. They are taken from `items` lazily, and
+    at most `max_pending` chunks (by default twice the number of CPUs) are
+    submitted ahead of the results that were iterated over, so large or
+    unbounded inputs are processed with bounded memory.
+
+    On a ``ProcessPoolExecutor``, exceptions that can't be pickled are returned
+    as an ``ExceptionRecord`` instead. Without an `executor`, a
+    ``ThreadPoolExecutor`` is used, which is shut down after the iteration.
+    Closing the iterator early cancels the chunks that haven't started yet.
+    """
+    if not exceptions:
+        raise TypeError("parallel_map() requires one or more exception types")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1, got {!r}".format(chunksize))
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+    elif max_pending < 1:
+        raise ValueError("max_pending must be at least 1, got {!r}".format(max_pending))
+    return _parallel_map(fn, items, exceptions, executor, chunksize, max_pending)
+
+
+def _parallel_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    exceptions: Tuple[Type[BaseException], ...],
+    executor: Optional[Executor],
+    chunksize: int,
+    max_pending: int,
+) -> Generator[Result[Any, Any], None, None]:
+    # Imported here, as importing the process pool imports `multiprocessing`.
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    owned = executor is None
+    pool = ThreadPoolExecutor() if executor is None else executor
+    in_process = isinstance(pool, ProcessPoolExecutor)
+    iterator = iter(items)
+    pending: Deque[Future[List[Result[Any, Any]]]] = deque()
+    try:
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(iterator, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_run_chunk, fn, exceptions, chunk, in_process))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from .result import Err, Ok, Result
+
+T = TypeVar("T")  # Success type of the input
+E = TypeVar("E")  # Error type of the input
+U = TypeVar("U")  # Success type of the output
+F = TypeVar("F")  # Error type of the output
+V = TypeVar("V")
+G = TypeVar("G")
+
+# The stage kinds, and whether each one runs on `Ok` (True) or `Err` (False).
+_BRANCHES: Dict[str, bool] = {
+    "map": True,
+    "and_then": True,
+    "inspect": True,
+    "map_err": False,
+    "or_else": False,
+    "inspect_err": False,
+}
+
+# The body of each stage, given the name of its function. `value` holds the
+# current value, `ok` whether it is an `Ok`, and `result` the current `Ok` or
+# `Err` instance, or `None` if it still needs to be created.
+_STAGE_SOURCE: Dict[str, str] = {
+    "map": "value = {op}(value); result = None",
+    "map_err": "value = {op}(value); result = None",
+    "and_then": "result = {op}(value); ok = isinstance(result, Ok); value = result._value",
+    "or_else": "result = {op}(value); ok = isinstance(result, Ok); value = result._value",
+    "inspect": "{op}(value)",
+    "inspect_err": "{op}(value)",
+}
+
+
+def _compile(
+    stages: Tuple[Tuple[str, Callable[[Any], Any]], ...]
+) -> Callable[[Result[Any, Any]], Result[Any, Any]]:
+    """
+    Generate a function that runs all stages on the unwrapped value, and only
+    creates an `Ok` or `Err` for the final value.
+    """
+    namespace: Dict[str, Any] = {"Ok": Ok, "Err": Err}
+    lines = [
+        "def pipeline(result):",
+        "    ok = isinstance(result, Ok)",
+        "    value = result._value",
+    ]
+    previous: Optional[Tuple[str, bool]] = None
+    for index, (kind, op) in enumerate(stages):
+        name = "op{}".format(index)
+        namespace[name] = op
+        branch = _BRANCHES[kind]
+        # Consecutive stages on the same branch share one `if`, unless an
+        # earlier stage in the group can switch between `Ok` and `Err`.
+        if previous is None or previous[1] != branch or previous[0] in ("and_then", "or_else"):
+            lines.append("    if {}ok:".format("" if branch else "not "))
+        lines.append("        " + _STAGE_SOURCE[kind].format(op=name))
+        previous = (kind, branch)
+    lines += [
+        "    if result is None:",
+        "        return Ok(value) if ok else Err(value)",
+        "    return result",
+    ]
+    exec(compile("\n".join(lines), "<result.Pipeline>", "exec"), namespace)
+    function: Callable[[Result[Any, Any]], Result[Any, Any]] = namespace["pipeline"]
+    return function
+
+
+class Pipeline(Generic[T, E, U, F]):
+    """
+    A reusable sequence of ``map``, ``map_err``, ``and_then``, ``or_else``,
+    ``inspect`` and ``inspect_err`` stages.
+
+    Calling a pipeline with a result returns the same as calling the recorded
+    methods on it one after another, e.g. ``Pipeline().map(f).and_then(g)(r)``
+    equals ``r.map(f).and_then(g)``. The stages are compiled into a single
+    function the first time the pipeline is called, which passes the unwrapped
+    value from stage to stage and only creates an ``Ok`` or ``Err`` for the
+    final value.
+
+    Pipelines are immutable: every builder method returns a new pipeline.
+    """
+
+    __slots__ = ("_stages", "_compiled")
+
+    def __init__(self) -> None:
+        self._stages: Tuple[Tuple[str, Callable[[Any], Any]], ...] = ()
+        self._compiled: Optional[Callable[[Result[Any, Any]], Result[Any, Any]]] = None
+
+    def _add(self, kind: str, op: Callable[[Any], Any]) -> Pipeline[Any, Any, Any, Any]:
+        pipeline: Pipeline[Any, Any, Any, Any] = Pipeline()
+        pipeline._stages = self._stages + ((kind, op),)
+        return pipeline
+
+    def __repr__(self) -> str:
+        return "Pipeline({})".format(
+            ", ".join(
+                "{}({})".format(kind, getattr(op, "__qualname__", repr(op)))
+                for kind, op in self._stages
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self._stages)
+
+    def __call__(self, result: Result[T, E]) -> Result[U, F]:
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = _compile(self._stages)
+        return compiled(result)
+
+    def compile(self) -> Callable[[Result[T, E]], Result[U, F]]:
+        """
+        Return the compiled function, without the overhead of calling the
+        pipeline object itself.
+        """
+        if self._compiled is None:
+            self._compiled = _compile(self._stages)
+        return self._compiled
+
+    def map(self, op: Callable[[U], V]) -> Pipeline[T, E, V, F]:
+        """
+        Add a stage that maps an `Ok` value, see ``Ok.map()``.
+        """
+        return self._add("map", op)
+
+    def map_err(self, op: Callable[[F], G]) -> Pipeline[T, E, U, G]:
+        """
+        Add a stage that maps an `Err` value, see ``Err.map_err()``.
+        """
+        return self._add("map_err", op)
+
+    def and_then(self, op: Callable[[U], Result[V, G]]) -> Pipeline[T, E, V, Union[F, G]]:
+        """
+        Add a stage that replaces an `Ok` with the result of `op`, see
+        ``Ok.and_then()``.
+        """
+        return self._add("and_then", op)
+
+    def or_else(self, op: Callable[[F], Result[V, G]]) -> Pipeline[T, E, Union[U, V], G]:
+        """
+        Add a stage that replaces an `Err` with the result of `op`, see
+        ``Err.or_else()``.
+        """
+        return self._add("or_else", op)
+
+    def inspect(self, op: Callable[[U], Any]) -> Pipeline[T, E, U, F]:
+        """
+        Add a stage that calls `op` with an `Ok` value, see ``Ok.inspect()``.
+        """
+        return self._add("inspect", op)
+
+    def inspect_err(self, op: Callable[[F], Any]) -> Pipeline[T, E, U, F]:
+        """
+        Add a stage that calls `op` with an `Err` value, see ``Err.inspect_err()``.
+        """
+        return self._add("inspect_err", op)
+
+    def stages(self) -> List[Tuple[str, Callable[[Any], Any]]]:
+        """
+        Return the recorded stages as ``(method name, function)`` pairs.
+        """
+        return list(self._stages)
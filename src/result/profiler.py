@@ -0,0 +1,320 @@
+"""
+Per-callable latency profiling for the ``Ok`` and ``Err`` combinators.
+
+While ``profiling()`` is active, the combinator methods that call a function,
+such as ``map()``, ``and_then()``, ``or_else()`` and their async variants, are
+replaced with versions that time every call of that function. Outside of it,
+the regular methods are used, so there is no overhead.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from .result import Err, Ok
+
+# The default upper bounds of the latency histogram buckets, in seconds.
+DEFAULT_BUCKETS: Tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+# The profiles that are currently active, and the lock that guards them and
+# the patching of the methods.
+_active: List[Profile] = []
+_lock = threading.Lock()
+
+
+def _qualified_name(op: Any) -> str:
+    while isinstance(op, functools.partial):
+        op = op.func
+    qualname = getattr(op, "__qualname__", None) or type(op).__qualname__
+    module = getattr(op, "__module__", None)
+    return "{}.{}".format(module, qualname) if module else qualname
+
+
+def _record(op: Any, duration: float, ok_to_err: bool) -> None:
+    name = _qualified_name(op)
+    for profile in _active:
+        profile._add(name, duration, ok_to_err)
+
+
+def _call(op: Callable[..., Any], *args: Any) -> Any:
+    start = perf_counter()
+    try:
+        return op(*args)
+    finally:
+        _record(op, perf_counter() - start, False)
+
+
+def _call_and_then(op: Callable[..., Any], value: Any) -> Any:
+    start = perf_counter()
+    result = None
+    try:
+        result = op(value)
+        return result
+    finally:
+        _record(op, perf_counter() - start, isinstance(result, Err))
+
+
+async def _call_async(op: Callable[..., Awaitable[Any]], value: Any) -> Any:
+    start = perf_counter()
+    try:
+        return await op(value)
+    finally:
+        _record(op, perf_counter() - start, False)
+
+
+async def _call_and_then_async(op: Callable[..., Awaitable[Any]], value: Any) -> Any:
+    start = perf_counter()
+    result = None
+    try:
+        result = await op(value)
+        return result
+    finally:
+        _record(op, perf_counter() - start, isinstance(result, Err))
+
+
+# The profiled versions of the methods that call a function.
+
+
+def _ok_map(self: Ok[Any], op: Callable[[Any], Any]) -> Ok[Any]:
+    return Ok(_call(op, self._value))
+
+
+async def _ok_map_async(self: Ok[Any], op: Callable[[Any], Awaitable[Any]]) -> Any:
+    # The original methods of the async combinators handle deadlines.
+    return await _originals[Ok, "map_async"](self, functools.partial(_call_async, op))
+
+
+def _ok_map_or(self: Ok[Any], default: object, op: Callable[[Any], Any]) -> Any:
+    return _call(op, self._value)
+
+
+def _ok_map_or_else(self: Ok[Any], default_op: object, op: Callable[[Any], Any]) -> Any:
+    return _call(op, self._value)
+
+
+def _ok_and_then(self: Ok[Any], op: Callable[[Any], Any]) -> Any:
+    return _call_and_then(op, self._value)
+
+
+async def _ok_and_then_async(self: Ok[Any], op: Callable[[Any], Awaitable[Any]]) -> Any:
+    return await _originals[Ok, "and_then_async"](
+        self, functools.partial(_call_and_then_async, op)
+    )
+
+
+def _ok_inspect(self: Ok[Any], op: Callable[[Any], Any]) -> Ok[Any]:
+    _call(op, self._value)
+    return self
+
+
+def _err_map_err(self: Err[Any], op: Callable[[Any], Any]) -> Err[Any]:
+    return Err(_call(op, self._value))
+
+
+def _err_or_else(self: Err[Any], op: Callable[[Any], Any]) -> Any:
+    return _call(op, self._value)
+
+
+def _err_unwrap_or_else(self: Err[Any], op: Callable[[Any], Any]) -> Any:
+    return _call(op, self._value)
+
+
+def _err_map_or_else(self: Err[Any], default_op: Callable[[], Any], op: object) -> Any:
+    return _call(default_op)
+
+
+def _err_inspect_err(self: Err[Any], op: Callable[[Any], Any]) -> Err[Any]:
+    _call(op, self._value)
+    return self
+
+
+_PATCHES: List[Tuple[type, str, Callable[..., Any]]] = [
+    (Ok, "map", _ok_map),
+    (Ok, "map_async", _ok_map_async),
+    (Ok, "map_or", _ok_map_or),
+    (Ok, "map_or_else", _ok_map_or_else),
+    (Ok, "and_then", _ok_and_then),
+    (Ok, "and_then_async", _ok_and_then_async),
+    (Ok, "inspect", _ok_inspect),
+    (Err, "map_err", _err_map_err),
+    (Err, "or_else", _err_or_else),
+    (Err, "unwrap_or_else", _err_unwrap_or_else),
+    (Err, "map_or_else", _err_map_or_else),
+    (Err, "inspect_err", _err_inspect_err),
+]
+_originals: Dict[Tuple[type, str], Any] = {
+    (cls, name): cls.__dict__[name] for cls, name, _ in _PATCHES
+}
+
+
+def _patch() -> None:
+    for cls, name, replacement in _PATCHES:
+        setattr(cls, name, functools.wraps(_originals[cls, name])(replacement))
+
+
+def _unpatch() -> None:
+    for cls, name, _ in _PATCHES:
+        setattr(cls, name, _originals[cls, name])
+
+
+class _OpStats:
+    __slots__ = ("calls", "total", "max", "ok_to_err", "buckets")
+
+    def __init__(self, buckets: int) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.ok_to_err = 0
+        # The number of calls per bucket, the last one being the calls slower
+        # than the largest bound.
+        self.buckets = [0] * (buckets + 1)
+
+
+class Profile:
+    """
+    The timings recorded by ``profiling()``, per function passed to the
+    combinators, keyed by its qualified name.
+
+    For every function this records the number of calls, the total and the
+    maximum wall time, a histogram of the wall times, and for ``and_then()``
+    and ``and_then_async()`` how often the function turned an ``Ok`` into an
+    ``Err``.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets must be strictly increasing")
+        self._bounds = tuple(buckets)
+        self._ops: Dict[str, _OpStats] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name: str, duration: float, ok_to_err: bool) -> None:
+        with self._lock:
+            stats = self._ops.get(name)
+            if stats is None:
+                stats = self._ops[name] = _OpStats(len(self._bounds))
+            stats.calls += 1
+            stats.total += duration
+            if duration > stats.max:
+                stats.max = duration
+            if ok_to_err:
+                stats.ok_to_err += 1
+            stats.buckets[bisect_left(self._bounds, duration)] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the recorded values as a dictionary that maps the qualified
+        name of each function to its values, e.g.::
+
+            {
+                "app.parse": {
+                    "calls": 3,
+                    "total": 0.0021,
+                    "mean": 0.0007,
+                    "max": 0.0015,
+                    "ok_to_err": 1,
+                    "histogram": {1e-06: 0, ..., 0.001: 2, 0.01: 1, ..., inf: 0},
+                },
+            }
+
+        The histogram maps the upper bound of each bucket to the number of
+        calls that took longer than the previous bound and at most this one.
+        """
+        bounds = self._bounds + (float("inf"),)
+        with self._lock:
+            return {
+                name: {
+                    "calls": stats.calls,
+                    "total": stats.total,
+                    "mean": stats.total / stats.calls,
+                    "max": stats.max,
+                    "ok_to_err": stats.ok_to_err,
+                    "histogram": dict(zip(bounds, stats.buckets)),
+                }
+                for name, stats in self._ops.items()
+            }
+
+    def top(self, n: int = 10, by: str = "total") -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the `n` functions with the highest value of `by`, which can be
+        ``"total"``, ``"mean"``, ``"max"``, ``"calls"`` or ``"ok_to_err"``, as
+        ``(name, values)`` pairs.
+        """
+        if by not in ("total", "mean", "max", "calls", "ok_to_err"):
+            raise ValueError("cannot sort by {!r}".format(by))
+        return sorted(self.stats().items(), key=lambda item: item[1][by], reverse=True)[:n]
+
+    def report(self, n: int = 10, by: str = "total") -> str:
+        """
+        Return a table of the `n` functions with the highest value of `by` (see
+        ``top()``), each followed by its histogram.
+        """
+        lines = [
+            "{:<40} {:>8} {:>10} {:>10} {:>10} {:>8}".format(
+                "function", "calls", "total", "mean", "max", "ok->err"
+            )
+        ]
+        for name, values in self.top(n, by):
+            lines.append(
+                "{:<40} {:>8} {:>10} {:>10} {:>10} {:>8}".format(
+                    name,
+                    values["calls"],
+                    _format_duration(values["total"]),
+                    _format_duration(values["mean"]),
+                    _format_duration(values["max"]),
+                    values["ok_to_err"],
+                )
+            )
+            lines.append(
+                "    "
+                + "  ".join(
+                    "{}{}: {}".format(
+                        "<=" if bound != float("inf") else ">",
+                        _format_duration(bound if bound != float("inf") else self._bounds[-1]),
+                        count,
+                    )
+                    for bound, count in values["histogram"].items()
+                    if count
+                )
+            )
+        return "\n".join(lines)
+
+
+def _format_duration(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "{:.3g} {}".format(seconds / scale, unit)
+    return "{:.3g} ns".format(seconds / 1e-9)
+
+
+@contextmanager
+def profiling(buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Iterator[Profile]:
+    """
+    Record the wall time of every function passed to the ``Ok`` and ``Err``
+    combinators while the context is active, and return the recorded timings
+    as a ``Profile``::
+
+        with profiling() as profile:
+            run_pipeline()
+        print(profile.report())
+
+    The methods are replaced for all threads, so calls from other threads are
+    recorded as well. Contexts can be nested, in which case each one records
+    the calls made while it is active.
+    """
+    profile = Profile(buckets)
+    with _lock:
+        if not _active:
+            _patch()
+        _active.append(profile)
+    try:
+        yield profile
+    finally:
+        with _lock:
+            _active.remove(profile)
+            if not _active:
+                _unpatch()
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import functools
 import inspect
+import reprlib
 import sys
+import threading
+import weakref
+from itertools import islice
+from time import monotonic, perf_counter
+from types import CodeType, FunctionType
 from warnings import warn
 from typing import (
+    TYPE_CHECKING,
     Any,
     AsyncGenerator,
     Awaitable,
     Callable,
+    Dict,
     Final,
     Generator,
     Generic,
     Iterator,
+    List,
     Literal,
     NoReturn,
+    Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
+    overload,
 )
 
 from typing_extensions import TypeIs
 
+from .deadlines import DeadlineExceeded, _deadline
+
+if TYPE_CHECKING:
+    from .caching import ResultCache
+    from .hedging import Hedge
+    from .limiting import Limiter
+
 if sys.version_info >= (3, 10):
     from typing import ParamSpec, TypeAlias
 else:
@@ -37,6 +58,66 @@ R = TypeVar("R")
 TBE = TypeVar("TBE", bound=BaseException)
 
 
+class _ResultRepr(reprlib.Repr):
+    """
+    A ``reprlib.Repr`` that also limits the values inside ``Ok`` and ``Err``,
+    and keeps the order of dictionaries.
+    """
+
+    def repr_Ok(self, x: Ok[Any], level: int) -> str:
+        if level <= 0:
+            return "Ok({})".format(self.fillvalue)
+        return "Ok({})".format(self.repr1(x._value, level - 1))
+
+    def repr_Err(self, x: Err[Any], level: int) -> str:
+        if level <= 0:
+            return "Err({})".format(self.fillvalue)
+        return "Err({})".format(self.repr1(x._value, level - 1))
+
+    def repr_dict(self, x: Dict[Any, Any], level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{" + self.fillvalue + "}"
+        pieces = [
+            "{}: {}".format(self.repr1(key, level - 1), self.repr1(value, level - 1))
+            for key, value in islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append(self.fillvalue)
+        return "{" + ", ".join(pieces) + "}"
+
+
+# Limits the size of the `repr()` of `Ok` and `Err` values, also in the
+# messages of `UnwrapError`. The defaults are much larger than those of
+# `reprlib` and only cut off large payloads. Set its attributes to change the
+# limits, e.g. `result_repr.maxstring = 100`.
+result_repr: Final = _ResultRepr()
+result_repr.fillvalue = "..."
+result_repr.maxlevel = 10
+result_repr.maxtuple = result_repr.maxlist = result_repr.maxarray = 100
+result_repr.maxdict = result_repr.maxset = result_repr.maxfrozenset = 100
+result_repr.maxdeque = 100
+result_repr.maxstring = result_repr.maxlong = result_repr.maxother = 1000
+
+_SHORT_REPR_TYPES: Final = frozenset({type(None), bool, float})
+
+
+def _limited_repr(value: Any) -> str:
+    """
+    Return ``result_repr.repr(value)``, without its overhead for the common
+    values whose builtin ``repr()`` is known to be within the limits.
+    """
+    cls = type(value)
+    if cls in _SHORT_REPR_TYPES:
+        return repr(value)
+    if cls is int or (cls is str and len(value) <= result_repr.maxstring):
+        text = repr(value)
+        if len(text) <= (result_repr.maxlong if cls is int else result_repr.maxstring):
+            return text
+    return result_repr.repr(value)
+
+
 class Ok(Generic[T]):
     """
     A value that indicates success and which stores arbitrary data for the return value.
@@ -51,8 +132,33 @@ class Ok(Generic[T]):
     def __init__(self, value: T) -> None:
         self._value = value
 
+    @classmethod
+    def of(cls, value: U) -> Ok[U]:
+        """
+        Return an `Ok` with the given value, like `Ok(value)`, but reuse an
+        existing instance if possible.
+
+        The instances for `None`, `True`, `False` and small integers are
+        created once, and instances for other integers and short strings and
+        bytes are kept in a bounded table. Instances are reused for values that
+        are equal and of the same type, so the contained value may be a
+        different, but equal, object than the given one.
+        """
+        return _interned(Ok, _OK_COMMON, _ok_interned, value)
+
     def __repr__(self) -> str:
-        return "Ok({})".format(repr(self._value))
+        return "Ok({})".format(_limited_repr(self._value))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (self._value,))
+
+    def __copy__(self) -> Ok[T]:
+        # Immutable, so there is nothing to copy.
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Ok[T]:
+        value = copy.deepcopy(self._value, memo)
+        return self if value is self._value else Ok(value)
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Ok) and self._value == other._value
@@ -159,8 +265,14 @@ class Ok(Generic[T]):
         """
         The contained result is `Ok`, so return the result of `op` with the
         original value passed in
+
+        Within a ``deadline()``, raise ``DeadlineExceeded`` if it passes before
+        `op` is done.
         """
-        return Ok(await op(self._value))
+        end = _deadline.get()
+        if end is None:
+            return Ok(await op(self._value))
+        return Ok(await _call_within_deadline(end, op, (self._value,), {}))
 
     def map_or(self, default: object, op: Callable[[T], U]) -> U:
         """
@@ -195,8 +307,15 @@ class Ok(Generic[T]):
         """
         The contained result is `Ok`, so return the result of `op` with the
         original value passed in
+
+        Within a ``deadline()``, raise ``DeadlineExceeded`` if it passes before
+        `op` is done.
         """
-        return await op(self._value)
+        end = _deadline.get()
+        if end is None:
+            return await op(self._value)
+        result: Result[U, E] = await _call_within_deadline(end, op, (self._value,), {})
+        return result
 
     def or_else(self, op: object) -> Ok[T]:
         """
@@ -227,10 +346,29 @@ class DoException(Exception):
     we just return `self` (the Err).
     """
 
-    def __init__(self, err: Err[E]) -> None:
+    def __init__(self, err: Err[Any]) -> None:
         self.err = err
 
 
+class _ErrIterator:
+    """
+    The iterator of an `Err`, which raises ``DoException`` when it's advanced
+    rather than when it's created. This stops the whole generator passed to
+    `do()`, including any loops around the one over the `Err`.
+    """
+
+    __slots__ = ("_err",)
+
+    def __init__(self, err: Err[Any]) -> None:
+        self._err = err
+
+    def __iter__(self) -> _ErrIterator:
+        return self
+
+    def __next__(self) -> NoReturn:
+        raise DoException(self._err)
+
+
 class Err(Generic[E]):
     """
     A value that signifies failure and which stores arbitrary data for the error.
@@ -240,18 +378,32 @@ class Err(Generic[E]):
     __slots__ = ("_value",)
 
     def __iter__(self) -> Iterator[NoReturn]:
-        def _iter() -> Iterator[NoReturn]:
-            # Exception will be raised when the iterator is advanced, not when it's created
-            raise DoException(self)
-            yield  # This yield will never be reached, but is necessary to create a generator
-
-        return _iter()
+        return _ErrIterator(self)
 
     def __init__(self, value: E) -> None:
         self._value = value
 
+    @classmethod
+    def of(cls, value: F) -> Err[F]:
+        """
+        Return an `Err` with the given value, like `Err(value)`, but reuse an
+        existing instance if possible. See `Ok.of()`.
+        """
+        return _interned(Err, _ERR_COMMON, _err_interned, value)
+
     def __repr__(self) -> str:
-        return "Err({})".format(repr(self._value))
+        return "Err({})".format(_limited_repr(self._value))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (self._value,))
+
+    def __copy__(self) -> Err[E]:
+        # Immutable, so there is nothing to copy.
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Err[E]:
+        value = copy.deepcopy(self._value, memo)
+        return self if value is self._value else Err(value)
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Err) and self._value == other._value
@@ -307,10 +459,7 @@ class Err(Generic[E]):
         """
         Raises an `UnwrapError`.
         """
-        exc = UnwrapError(
-            self,
-            f"{message}: {self._value!r}",
-        )
+        exc = UnwrapError._with_value(self, message)
         if isinstance(self._value, BaseException):
             raise exc from self._value
         raise exc
@@ -325,10 +474,7 @@ class Err(Generic[E]):
         """
         Raises an `UnwrapError`.
         """
-        exc = UnwrapError(
-            self,
-            f"Called `Result.unwrap()` on an `Err` value: {self._value!r}",
-        )
+        exc = UnwrapError._with_value(self, "Called `Result.unwrap()` on an `Err` value")
         if isinstance(self._value, BaseException):
             raise exc from self._value
         raise exc
@@ -439,6 +585,65 @@ This is purely for convenience sake, as you could also just write `isinstance(re
 OkErr: Final = (Ok, Err)
 
 
+# The maximum number of instances for uncommon values kept by `Ok.of()` and
+# `Err.of()` each. The oldest one is dropped when the table is full.
+_INTERN_MAXSIZE: Final = 1024
+# Values that are likely to repeat are kept in the table: integers, and short
+# strings and bytes. Other values, such as long messages or arbitrary objects,
+# are mostly distinct, so a table entry would only cost memory. Floats and
+# tuples are left out since values that compare equal can differ, e.g. `0.0`
+# and `-0.0`, or `(1,)` and `(True,)`, and the caller must get its own back.
+_INTERN_MAX_LENGTH: Final = 64
+_INTERN_TYPES: Final = frozenset({int, str, bytes})
+_INTERN_SIZED_TYPES: Final = frozenset({str, bytes})
+_COMMON_VALUES: Final = (None, True, False, *range(-5, 257))
+
+_OK_COMMON: Final[Dict[Tuple[type, Any], Ok[Any]]] = {
+    (type(value), value): Ok(value) for value in _COMMON_VALUES
+}
+_ERR_COMMON: Final[Dict[Tuple[type, Any], Err[Any]]] = {
+    (type(value), value): Err(value) for value in _COMMON_VALUES
+}
+_ok_interned: Dict[Tuple[type, Any], Ok[Any]] = {}
+_err_interned: Dict[Tuple[type, Any], Err[Any]] = {}
+# Lookups don't need the lock, but evicting iterates over the table, which
+# fails if another thread adds an entry at the same time.
+_intern_lock = threading.Lock()
+
+_OkOrErr = TypeVar("_OkOrErr", Ok[Any], Err[Any])
+
+
+def _interned(
+    cls: Callable[[Any], _OkOrErr],
+    common: Dict[Tuple[type, Any], _OkOrErr],
+    table: Dict[Tuple[type, Any], _OkOrErr],
+    value: Any,
+) -> _OkOrErr:
+    # The type is part of the key so that e.g. `1`, `1.0` and `True`, which
+    # are equal, don't share an instance.
+    value_type = type(value)
+    key = (value_type, value)
+    try:
+        instance = common.get(key)
+    except TypeError:  # Unhashable value
+        return cls(value)
+    if instance is not None:
+        return instance
+    if value_type not in _INTERN_TYPES or (
+        value_type in _INTERN_SIZED_TYPES and len(value) > _INTERN_MAX_LENGTH
+    ):
+        return cls(value)
+    instance = table.get(key)
+    if instance is None:
+        with _intern_lock:
+            instance = table.get(key)
+            if instance is None:
+                if len(table) >= _INTERN_MAXSIZE:
+                    del table[next(iter(table))]
+                instance = table[key] = cls(value)
+    return instance
+
+
 class UnwrapError(Exception):
     """
     Exception raised from ``.unwrap_<...>`` and ``.expect_<...>`` calls.
@@ -451,11 +656,26 @@ class UnwrapError(Exception):
     """
 
     _result: Result[object, object]
+    _show_value = False
 
     def __init__(self, result: Result[object, object], message: str) -> None:
         self._result = result
         super().__init__(message)
 
+    @classmethod
+    def _with_value(cls, result: Result[object, object], message: str) -> UnwrapError:
+        # The value is only formatted when the message is needed, since that
+        # can be expensive for large values and the error is often caught.
+        exc = cls(result, message)
+        exc._show_value = True
+        return exc
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self._show_value:
+            message = "{}: {}".format(message, _limited_repr(self._result._value))
+        return message
+
     @property
     def result(self) -> Result[Any, Any]:
         """
@@ -464,71 +684,425 @@ class UnwrapError(Exception):
         return self._result
 
 
+class ExceptionRecord(Generic[TBE]):
+    """
+    A compact record of an exception, which ``as_result()`` and
+    ``as_async_result()`` store instead of the exception itself when called
+    with ``capture="record"``.
+
+    Unlike the exception, the record doesn't keep the traceback alive, and with
+    it every frame and its local variables. It only holds the exception type,
+    the exception arguments and, optionally, the location of the innermost
+    frames. Use ``to_exception()`` to turn it back into an exception.
+    """
+
+    __slots__ = ("_exc_type", "_args", "_frames")
+
+    def __init__(
+        self,
+        exc_type: Type[TBE],
+        args: Tuple[Any, ...],
+        frames: Tuple[Tuple[str, int, str], ...] = (),
+    ) -> None:
+        self._exc_type = exc_type
+        self._args = args
+        self._frames = frames
+
+    @classmethod
+    def from_exception(cls, exc: TBE, frames: int = 0) -> ExceptionRecord[TBE]:
+        """
+        Record an exception, including the location of its `frames` innermost
+        traceback frames.
+        """
+        summary = []
+        if frames:
+            tb = exc.__traceback__
+            while tb is not None:
+                code = tb.tb_frame.f_code
+                summary.append((code.co_filename, tb.tb_lineno, code.co_name))
+                tb = tb.tb_next
+        return cls(type(exc), exc.args, tuple(summary[-frames:]) if frames else ())
+
+    def __repr__(self) -> str:
+        return "ExceptionRecord({}, {})".format(self._exc_type.__name__, repr(self._args))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (ExceptionRecord, (self._exc_type, self._args, self._frames))
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, ExceptionRecord)
+            and self._exc_type is other._exc_type
+            and self._args == other._args
+            and self._frames == other._frames
+        )
+
+    def __ne__(self, other: Any) -> bool:
+        return not (self == other)
+
+    def __hash__(self) -> int:
+        return hash((self._exc_type, self._args, self._frames))
+
+    @property
+    def exc_type(self) -> Type[TBE]:
+        """
+        Return the type of the recorded exception.
+        """
+        return self._exc_type
+
+    @property
+    def args(self) -> Tuple[Any, ...]:
+        """
+        Return the ``args`` of the recorded exception.
+        """
+        return self._args
+
+    @property
+    def frames(self) -> Tuple[Tuple[str, int, str], ...]:
+        """
+        Return the recorded frames as ``(filename, line number, function name)``
+        tuples, innermost last.
+        """
+        return self._frames
+
+    def to_exception(self) -> TBE:
+        """
+        Create a new exception of the recorded type with the recorded arguments.
+
+        The new exception has no traceback. If the exception type can't be
+        called with the recorded arguments, the arguments are assigned to
+        ``args`` of an uninitialized instance instead.
+        """
+        try:
+            return self._exc_type(*self._args)
+        except Exception:
+            exc = self._exc_type.__new__(self._exc_type)
+            exc.args = self._args
+            return exc
+
+
+def _strip_tracebacks(exc: TBE) -> TBE:
+    # Also strip the exceptions this one was raised from or while handling,
+    # since they keep their own tracebacks alive.
+    seen = set()
+    pending: List[Optional[BaseException]] = [exc]
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        current.__traceback__ = None
+        pending += [current.__cause__, current.__context__]
+    return exc
+
+
+async def _call_within_deadline(
+    end: float,
+    op: Callable[..., Awaitable[U]],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> U:
+    """
+    Call `op` and await its result, unless the deadline `end` (a
+    ``time.monotonic()`` value) passes first. Raise ``DeadlineExceeded``
+    if it passed already, without calling `op`.
+    """
+    timeout = end - monotonic()
+    if timeout <= 0:
+        raise DeadlineExceeded("the deadline passed before the call")
+    try:
+        return await asyncio.wait_for(op(*args, **kwargs), timeout)
+    except asyncio.TimeoutError:
+        if monotonic() < end:
+            raise  # Raised by `op` itself.
+        raise DeadlineExceeded("the deadline passed during the call") from None
+
+
+def _capture(capture: str, frames: int) -> Optional[Callable[[Any], Any]]:
+    """
+    Return the function that converts a caught exception for the given
+    capture mode, or ``None`` if it is stored as is.
+    """
+    if frames < 0:
+        raise ValueError("frames must not be negative, got {!r}".format(frames))
+    if frames and capture != "record":
+        raise ValueError('frames can only be used with capture="record"')
+    if capture == "exception":
+        return None
+    if capture == "strip":
+        return _strip_tracebacks
+    if capture == "record":
+        return functools.partial(ExceptionRecord.from_exception, frames=frames)
+    raise ValueError(
+        'capture must be "exception", "strip" or "record", got {!r}'.format(capture)
+    )
+
+
+@overload
 def as_result(
     *exceptions: Type[TBE],
+    capture: Literal["exception", "strip"] = ...,
+    cache: Optional[ResultCache] = ...,
 ) -> Callable[[Callable[P, R]], Callable[P, Result[R, TBE]]]:
+    ...
+
+
+@overload
+def as_result(
+    *exceptions: Type[TBE],
+    capture: Literal["record"],
+    frames: int = ...,
+    cache: Optional[ResultCache] = ...,
+) -> Callable[[Callable[P, R]], Callable[P, Result[R, ExceptionRecord[TBE]]]]:
+    ...
+
+
+def as_result(
+    *exceptions: Type[TBE],
+    capture: str = "exception",
+    frames: int = 0,
+    cache: Optional[ResultCache] = None,
+) -> Callable[[Callable[P, R]], Callable[P, Result[R, Any]]]:
     """
     Make a decorator to turn a function into one that returns a ``Result``.
 
     Regular return values are turned into ``Ok(return_value)``. Raised
     exceptions of the specified exception type(s) are turned into ``Err(exc)``.
+
+    The `capture` mode determines what is stored in the ``Err``:
+
+    - ``"exception"`` (the default) stores the exception itself.
+    - ``"strip"`` stores the exception without its traceback, and without the
+      tracebacks of its ``__cause__`` and ``__context__`` exceptions, so that
+      the frames of the failed call can be freed.
+    - ``"record"`` stores an ``ExceptionRecord`` of the exception, which also
+      contains the location of the `frames` innermost frames if given.
+
+    If a ``result.caching.ResultCache`` is passed as `cache`, results are
+    memoized in it according to its policies.
     """
     if not exceptions or not all(
         inspect.isclass(exception) and issubclass(exception, BaseException)
         for exception in exceptions
     ):
         raise TypeError("as_result() requires one or more exception types")
+    convert = _capture(capture, frames)
 
-    def decorator(f: Callable[P, R]) -> Callable[P, Result[R, TBE]]:
+    def decorator(f: Callable[P, R]) -> Callable[P, Result[R, Any]]:
         """
         Decorator to turn a function into one that returns a ``Result``.
         """
 
         @functools.wraps(f)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[R, TBE]:
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[R, Any]:
             try:
                 return Ok(f(*args, **kwargs))
             except exceptions as exc:
-                return Err(exc)
+                return Err(exc if convert is None else convert(exc))
 
+        _track(wrapper)
+        if cache is not None:
+            return cache._wrap(wrapper)
         return wrapper
 
     return decorator
 
 
+@overload
 def as_async_result(
     *exceptions: Type[TBE],
+    capture: Literal["exception", "strip"] = ...,
+    cache: Optional[ResultCache] = ...,
+    single_flight: bool = ...,
+    limiter: Optional[Limiter] = ...,
+    hedge: Optional[Hedge] = ...,
 ) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[Result[R, TBE]]]]:
+    ...
+
+
+@overload
+def as_async_result(
+    *exceptions: Type[TBE],
+    capture: Literal["record"],
+    frames: int = ...,
+    cache: Optional[ResultCache] = ...,
+    single_flight: bool = ...,
+    limiter: Optional[Limiter] = ...,
+    hedge: Optional[Hedge] = ...,
+) -> Callable[
+    [Callable[P, Awaitable[R]]], Callable[P, Awaitable[Result[R, ExceptionRecord[TBE]]]]
+]:
+    ...
+
+
+def as_async_result(
+    *exceptions: Type[TBE],
+    capture: str = "exception",
+    frames: int = 0,
+    cache: Optional[ResultCache] = None,
+    single_flight: bool = False,
+    limiter: Optional[Limiter] = None,
+    hedge: Optional[Hedge] = None,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[Result[R, Any]]]]:
     """
     Make a decorator to turn an async function into one that returns a ``Result``.
     Regular return values are turned into ``Ok(return_value)``. Raised
     exceptions of the specified exception type(s) are turned into ``Err(exc)``.
+
+    See ``as_result()`` for the `capture`, `frames` and `cache` arguments.
+
+    With `single_flight`, concurrent calls with equal (hashable) arguments
+    share a single call of the function, and all get its result. Cancelling
+    one of the callers doesn't cancel the shared call, unless all of them are
+    cancelled. Calls with unhashable arguments run on their own.
+
+    With a `limiter`, a ``result.limiting.Limiter``, calls of the function
+    over its concurrency or rate limits wait in a queue. The limits only apply
+    to actual calls, not to results taken from the cache or shared with other
+    callers.
+
+    With a `hedge`, a ``result.hedging.Hedge``, a call that is slower than its
+    delay is raced against a second call with the same arguments.
+
+    Within a ``deadline()``, the function is only called if the deadline
+    hasn't passed yet, and it is cancelled when it passes. In both cases,
+    ``DeadlineExceeded`` is raised, which like any other exception is only
+    returned as an ``Err`` if it's one of the `exceptions`, e.g. with
+    ``TimeoutError``.
     """
     if not exceptions or not all(
         inspect.isclass(exception) and issubclass(exception, BaseException)
         for exception in exceptions
     ):
         raise TypeError("as_result() requires one or more exception types")
+    convert = _capture(capture, frames)
+    if limiter is not None and limiter.timeout is not None:
+        from .limiting import LimiterTimeout
+
+        if not issubclass(LimiterTimeout, exceptions):
+            raise TypeError(
+                "a limiter with a timeout requires LimiterTimeout or one of its "
+                "base classes as an exception type"
+            )
 
     def decorator(
         f: Callable[P, Awaitable[R]]
-    ) -> Callable[P, Awaitable[Result[R, TBE]]]:
+    ) -> Callable[P, Awaitable[Result[R, Any]]]:
         """
         Decorator to turn a function into one that returns a ``Result``.
         """
+        if limiter is not None:
+            # Wait for the limiter inside the wrapper, so that a timeout is
+            # turned into an `Err` like any other exception.
+            f = limiter._wrap_async(f)
 
         @functools.wraps(f)
-        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[R, TBE]:
+        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Result[R, Any]:
             try:
-                return Ok(await f(*args, **kwargs))
+                end = _deadline.get()
+                if end is None:
+                    return Ok(await f(*args, **kwargs))
+                return Ok(await _call_within_deadline(end, f, args, kwargs))
             except exceptions as exc:
-                return Err(exc)
+                return Err(exc if convert is None else convert(exc))
+
+        _track(async_wrapper)
+        wrapped: Callable[P, Awaitable[Result[R, Any]]] = async_wrapper
+        if hedge is not None:
+            wrapped = hedge._wrap_async(wrapped)
+        if single_flight:
+            from .concurrency import _single_flight
 
-        return async_wrapper
+            wrapped = _single_flight(wrapped)
+        if cache is not None:
+            wrapped = cache._wrap_async(wrapped)
+        return wrapped
 
     return decorator
 
 
+# Hooks that are called after every call of a function decorated with
+# `as_result()` or `as_async_result()`, see `result.instrumentation`. While
+# there are none, the wrappers run their plain code without any overhead.
+# Setting hooks swaps the code of all wrappers for an instrumented version.
+_hooks: Tuple[Callable[[Callable[..., Any], Result[Any, Any], float], Any], ...] = ()
+_hooks_lock = threading.Lock()
+_wrappers: weakref.WeakSet[FunctionType] = weakref.WeakSet()
+_plain_code: Dict[str, CodeType] = {}
+
+
+def _instrumented_template(
+    f: Callable[..., Any],
+    exceptions: Tuple[Type[BaseException], ...],
+    convert: Optional[Callable[[Any], Any]],
+) -> None:
+    # Only used for the code of the inner functions, which replaces the code
+    # of the wrappers of the same name in `as_result()` and `as_async_result()`
+    # while there are hooks. They must use the same free variables.
+
+    def wrapper(*args: Any, **kwargs: Any) -> Result[Any, Any]:
+        start = perf_counter()
+        try:
+            result: Result[Any, Any] = Ok(f(*args, **kwargs))
+        except exceptions as exc:
+            result = Err(exc if convert is None else convert(exc))
+        duration = perf_counter() - start
+        for hook in _hooks:
+            hook(f, result, duration)
+        return result
+
+    async def async_wrapper(*args: Any, **kwargs: Any) -> Result[Any, Any]:
+        start = perf_counter()
+        try:
+            end = _deadline.get()
+            if end is None:
+                result: Result[Any, Any] = Ok(await f(*args, **kwargs))
+            else:
+                result = Ok(await _call_within_deadline(end, f, args, kwargs))
+        except exceptions as exc:
+            result = Err(exc if convert is None else convert(exc))
+        duration = perf_counter() - start
+        for hook in _hooks:
+            hook(f, result, duration)
+        return result
+
+
+_instrumented_code: Dict[str, CodeType] = {
+    code.co_name: code
+    for code in _instrumented_template.__code__.co_consts
+    if isinstance(code, CodeType)
+}
+
+
+def _track(wrapper: Any) -> None:
+    """
+    Register a wrapper created by ``as_result()`` or ``as_async_result()``, so
+    that its code can be swapped when hooks are set.
+    """
+    with _hooks_lock:
+        _plain_code.setdefault(wrapper.__code__.co_name, wrapper.__code__)
+        _wrappers.add(wrapper)
+        if _hooks:
+            wrapper.__code__ = _instrumented_code[wrapper.__code__.co_name]
+
+
+def _set_hooks(
+    hooks: Tuple[Callable[[Callable[..., Any], Result[Any, Any], float], Any], ...]
+) -> None:
+    """
+    Replace the registered hooks, and swap the code of all wrappers if hooks
+    were added or removed.
+    """
+    global _hooks
+    with _hooks_lock:
+        swap = bool(hooks) != bool(_hooks)
+        _hooks = hooks
+        if swap:
+            codes = _instrumented_code if hooks else _plain_code
+            for wrapper in list(_wrappers):
+                wrapper.__code__ = codes[wrapper.__code__.co_name]
+
+
 def is_ok(result: Result[T, E]) -> TypeIs[Ok[T]]:
     """A type guard to check if a result is an Ok
 
@@ -594,7 +1168,7 @@ def do(gen: Generator[Result[T, E], None, None]) -> Result[T, E]:
     try:
         return next(gen)
     except DoException as e:
-        out: Err[E] = e.err  # type: ignore
+        out: Err[E] = e.err
         return out
     except TypeError as te:
         # Turn this into a more helpful error message.
@@ -665,5 +1239,5 @@ async def do_async(
         else:
             return next(gen)
     except DoException as e:
-        out: Err[E] = e.err  # type: ignore
+        out: Err[E] = e.err
         return out
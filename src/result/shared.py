@@ -0,0 +1,265 @@
+"""
+Batches of results with fixed-width values in shared memory, for handing
+them to other processes without pickling every result, see
+``SharedResultBatch``.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Iterable, Iterator, List, Set, Tuple
+
+from .array import _pack, _unpack
+from .codec import Serializer
+from .result import Err, Ok, Result
+
+# The layout of a batch is a header, the tag bitmask (a set bit for every
+# `Ok`, as in `ResultArray`), the packed values, with zeros at the positions of
+# the `Err` elements, and the error side buffer. The side buffer holds the
+# number of errors, their element indices, the offsets of their serialized
+# values, and the serialized values.
+_MAGIC = b"RESULTS1"
+_HEADER = struct.Struct("<8sQ8sQQ")  # magic, length, format, values offset, errors offset
+_COUNT = struct.Struct("<Q")
+_ALIGN = 8
+# The names of the segments created by this process.
+_created: Set[str] = set()
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    if os.name != "posix" or name in _created:
+        return SharedMemory(name)
+    # Before Python 3.13, attaching registers the segment with the resource
+    # tracker, which would unlink it when this process exits, although it
+    # doesn't own it. The tracker keeps a set of names, and processes started
+    # by `multiprocessing` share the tracker of their parent, where the owner
+    # already registered the segment. Only a tracker of this process's own
+    # has to forget it again.
+    import multiprocessing
+    from multiprocessing import resource_tracker
+
+    inherited = (
+        multiprocessing.parent_process() is not None
+        and getattr(resource_tracker._resource_tracker, "_fd", None) is not None
+    )
+    shm = SharedMemory(name)
+    if not inherited:
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class SharedResultBatch:
+    """
+    A read-only batch of results in a ``multiprocessing.shared_memory``
+    segment, whose ``Ok`` values are numbers of a fixed-width `format` of the
+    ``array`` module, such as ``"d"`` (float) or ``"q"`` (64 bit integer).
+
+    The tags are stored as a bitmask and the ``Ok`` values packed next to
+    each other, so they are read without copying or unpickling. The ``Err``
+    values, which can be anything, are serialized into a side buffer with
+    `serializer`, and only deserialized when they are accessed.
+
+    The process that creates a batch with ``create()`` owns the segment, and
+    must ``unlink()`` it once the other processes are done with it, e.g. after
+    joining them. Other processes ``attach()`` to it by its ``name``, or by
+    receiving the pickled batch, and ``close()`` it when they are done. Both
+    can use the batch as a context manager, which closes it on exit, and for
+    the owner also unlinks it::
+
+        with SharedResultBatch.create(results, "d") as batch:
+            pool.map(consume, [batch.name] * 4)
+
+        def consume(name):
+            with SharedResultBatch.attach(name) as batch:
+                total = sum(result.unwrap_or(0) for result in batch)
+
+    If the owner exits without unlinking the segment, the resource tracker of
+    ``multiprocessing`` unlinks it.
+    """
+
+    __slots__ = ("_shm", "_owner", "_serializer", "_length", "_mask", "_values", "_errors")
+
+    def __init__(self, shm: SharedMemory, owner: bool, serializer: Serializer) -> None:
+        # Use `create()` or `attach()`.
+        self._shm = shm
+        self._owner = owner
+        self._serializer = serializer
+        buf = shm.buf
+        assert buf is not None
+        magic, length, format, values_offset, errors_offset = _HEADER.unpack_from(buf)
+        if magic != _MAGIC:
+            raise ValueError("{!r} is not a shared result batch".format(shm.name))
+        format = format.rstrip(b"\0").decode()
+        self._length: int = length
+        self._mask = buf[_HEADER.size:_HEADER.size + -(-length // 8)]
+        self._values = buf[values_offset:errors_offset].cast(format)
+        (count,) = _COUNT.unpack_from(buf, errors_offset)
+        indices_offset = errors_offset + _COUNT.size
+        offsets_offset = indices_offset + count * 8
+        payload_offset = offsets_offset + (count + 1) * 8
+        self._errors: Tuple[memoryview, memoryview, memoryview] = (
+            buf[indices_offset:offsets_offset].cast("Q"),
+            buf[offsets_offset:payload_offset].cast("Q"),
+            buf[payload_offset:],
+        )
+
+    @classmethod
+    def create(
+        cls,
+        results: Iterable[Result[Any, Any]],
+        format: str = "d",
+        serializer: Serializer = pickle,
+    ) -> SharedResultBatch:
+        """
+        Write `results` into a new shared memory segment, owned by this
+        process.
+        """
+        values = array(format)
+        tags: List[bool] = []
+        error_indices: List[int] = []
+        payloads: List[bytes] = []
+        for index, result in enumerate(results):
+            if isinstance(result, Ok):
+                values.append(result._value)
+                tags.append(True)
+            else:
+                values.append(0)
+                tags.append(False)
+                error_indices.append(index)
+                payloads.append(serializer.dumps(result._value))
+        mask = _pack(tags)
+        offsets = [0]
+        for payload in payloads:
+            offsets.append(offsets[-1] + len(payload))
+
+        values_offset = _aligned(_HEADER.size + len(mask))
+        errors_offset = _aligned(values_offset + len(values) * values.itemsize)
+        size = errors_offset + _COUNT.size + 8 * (2 * len(payloads) + 1) + offsets[-1]
+        shm = SharedMemory(create=True, size=size)
+        _created.add(shm.name)
+        try:
+            buf = shm.buf
+            assert buf is not None
+            _HEADER.pack_into(
+                buf, 0, _MAGIC, len(tags), format.encode(), values_offset, errors_offset
+            )
+            buf[_HEADER.size:_HEADER.size + len(mask)] = mask
+            buf[values_offset:values_offset + len(values) * values.itemsize] = values.tobytes()
+            position = errors_offset
+            for part in (
+                _COUNT.pack(len(payloads)),
+                array("Q", error_indices).tobytes(),
+                array("Q", offsets).tobytes(),
+                *payloads,
+            ):
+                buf[position:position + len(part)] = part
+                position += len(part)
+            del buf
+            return cls(shm, True, serializer)
+        except BaseException:
+            _created.discard(shm.name)
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name: str, serializer: Serializer = pickle) -> SharedResultBatch:
+        """
+        Attach to the batch in the shared memory segment `name`, created by
+        another process, without copying it.
+        """
+        shm = _attach(name)
+        try:
+            return cls(shm, False, serializer)
+        except BaseException:
+            shm.close()
+            raise
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Unpickling attaches to the segment, rather than copying it. Modules
+        # can't be pickled, so the default serializer is left out.
+        if self._serializer is pickle:
+            return (SharedResultBatch.attach, (self._shm.name,))
+        return (SharedResultBatch.attach, (self._shm.name, self._serializer))
+
+    @property
+    def name(self) -> str:
+        """
+        Return the name of the shared memory segment.
+        """
+        return self._shm.name
+
+    @property
+    def values(self) -> memoryview:
+        """
+        Return a read-only view of the packed values, with zeros at the
+        positions of the ``Err`` elements. Release it before closing the batch.
+        """
+        return self._values.toreadonly()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def is_ok(self, index: int) -> bool:
+        """
+        Return whether the element at `index` is an ``Ok``.
+        """
+        if not -self._length <= index < self._length:
+            raise IndexError("SharedResultBatch index out of range")
+        index %= self._length
+        return bool(self._mask[index >> 3] >> (index & 7) & 1)
+
+    def _error(self, index: int) -> Any:
+        indices, offsets, payloads = self._errors
+        position = bisect_left(indices, index)
+        return self._serializer.loads(bytes(payloads[offsets[position]:offsets[position + 1]]))
+
+    def __getitem__(self, index: int) -> Result[Any, Any]:
+        if self.is_ok(index):
+            return Ok(self._values[index])
+        return Err(self._error(index % self._length))
+
+    def __iter__(self) -> Iterator[Result[Any, Any]]:
+        for index, (value, ok) in enumerate(zip(self._values, _unpack(self._mask.tobytes()))):
+            yield Ok(value) if ok else Err(self._error(index))
+
+    def __repr__(self) -> str:
+        return "SharedResultBatch(name={!r}, length={})".format(self._shm.name, self._length)
+
+    def close(self) -> None:
+        """
+        Release the views into the segment and unmap it from this process.
+        The batch can't be used afterwards.
+        """
+        for view in (self._mask, self._values, *self._errors):
+            view.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory segment, once all processes are done with it.
+        Only the process that created the batch may do so.
+        """
+        if not self._owner:
+            raise RuntimeError("only the process that created the batch can unlink it")
+        _created.discard(self._shm.name)
+        self._shm.unlink()
+
+    def __enter__(self) -> SharedResultBatch:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
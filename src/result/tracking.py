@@ -0,0 +1,167 @@
+"""
+Sampled tracking of the code locations that create ``Err`` values.
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+from types import FrameType, TracebackType
+from typing import Any, Dict, List, Optional, Tuple
+
+from .result import Err
+
+# A creation site, as (filename, line number, function name).
+Site = Tuple[str, int, str]
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+def _frame_site(frame: Optional[FrameType]) -> Optional[Site]:
+    # Skip the frames of this package, e.g. of `Err.map_err()`, to get to the
+    # code that called it.
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+
+
+def _traceback_site(tb: TracebackType) -> Site:
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    code = tb.tb_frame.f_code
+    return (code.co_filename, tb.tb_lineno, code.co_name)
+
+
+class ErrSiteSampler:
+    """
+    Record where ``Err`` values are created, for one in every `every` of them
+    on average.
+
+    The site of an ``Err`` is the location of the code that created it,
+    outside of this package. For an ``Err`` holding an exception with a
+    traceback, such as one created by ``as_result()``, it is the location where
+    the exception was raised instead.
+
+    While started, ``Err.__init__()`` is replaced with a version that counts
+    down to the next sample, so the overhead for the errors that aren't
+    sampled is a few nanoseconds, and the cost of looking up the site is only
+    paid for the sampled ones. The sampled sites are counted in a table of at
+    most `max_sites` entries. When it is full, a new site replaces the one with
+    the lowest count and takes over its count, so that sites which are
+    frequent overall stay in the table (the "space-saving" algorithm). Counts
+    can be overestimated by at most the count they took over.
+
+    Only one sampler can be started at a time. It can be used as a context
+    manager, which starts it on entry and stops it on exit.
+    """
+
+    def __init__(self, every: int = 100, max_sites: int = 1000) -> None:
+        if every < 1:
+            raise ValueError("every must be at least 1, got {!r}".format(every))
+        if max_sites < 1:
+            raise ValueError("max_sites must be at least 1, got {!r}".format(max_sites))
+        self._every = every
+        self._max_sites = max_sites
+        self._sites: Dict[Site, int] = {}
+        self._sampled = 0
+        self._lock = threading.Lock()
+
+    @property
+    def every(self) -> int:
+        """
+        Return the average number of errors per sample.
+        """
+        return self._every
+
+    @property
+    def sampled(self) -> int:
+        """
+        Return the number of sampled errors.
+        """
+        return self._sampled
+
+    def _record(self, site: Site) -> None:
+        with self._lock:
+            self._sampled += 1
+            sites = self._sites
+            count = sites.get(site)
+            if count is None and len(sites) >= self._max_sites:
+                victim = min(sites, key=sites.__getitem__)
+                count = sites.pop(victim)
+            sites[site] = (count or 0) + 1
+
+    def _countdown(self) -> int:
+        # Randomize the distance between samples, so that errors which are
+        # created in a fixed rotation are still sampled evenly.
+        return random.randint(1, 2 * self._every - 1)
+
+    def start(self) -> None:
+        """
+        Start sampling.
+        """
+        global _sampler
+        with _lock:
+            if _sampler is not None:
+                raise RuntimeError("another ErrSiteSampler is already started")
+            _sampler = self
+            remaining = self._countdown()
+
+            def __init__(err: Err[Any], value: Any) -> None:
+                nonlocal remaining
+                err._value = value  # Same as the original `Err.__init__()`.
+                remaining -= 1
+                if remaining <= 0:
+                    remaining = self._countdown()
+                    tb = getattr(value, "__traceback__", None)
+                    if isinstance(value, BaseException) and tb is not None:
+                        site: Optional[Site] = _traceback_site(tb)
+                    else:
+                        site = _frame_site(sys._getframe(1))
+                    if site is not None:
+                        self._record(site)
+
+            Err.__init__ = __init__  # type: ignore[assignment]
+
+    def stop(self) -> None:
+        """
+        Stop sampling. The recorded sites are kept.
+        """
+        global _sampler
+        with _lock:
+            if _sampler is self:
+                Err.__init__ = _original_init  # type: ignore[method-assign]
+                _sampler = None
+
+    def __enter__(self) -> ErrSiteSampler:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def top(self, n: int = 10) -> List[Tuple[Site, int]]:
+        """
+        Return the `n` sites with the most sampled errors, as ``(site, count)``
+        pairs where each site is a ``(filename, line number, function name)``
+        tuple. Multiply the counts by ``every`` to estimate the total number of
+        errors.
+        """
+        with self._lock:
+            items = list(self._sites.items())
+        return sorted(items, key=lambda item: item[1], reverse=True)[:n]
+
+    def reset(self) -> None:
+        """
+        Discard the recorded sites.
+        """
+        with self._lock:
+            self._sites.clear()
+            self._sampled = 0
+
+
+_original_init = Err.__init__
+_sampler: Optional[ErrSiteSampler] = None
+_lock = threading.Lock()
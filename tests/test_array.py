@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from result import Err, Ok, Result, ResultArray
+
+
+def _results(n: int) -> List[Result[int, str]]:
+    return [Ok(i) if i % 3 else Err(str(i)) for i in range(n)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 8, 9, 100])
+def test_roundtrip(n: int) -> None:
+    results = _results(n)
+    array = ResultArray(results)
+    assert len(array) == n
+    assert array.to_list() == results
+    assert list(array) == results
+    assert ResultArray(array.to_list()) == array
+
+
+def test_invalid_element() -> None:
+    with pytest.raises(TypeError, match="requires Ok or Err values"):
+        ResultArray([Ok(1), 2])  # type: ignore[arg-type]
+
+
+def test_getitem() -> None:
+    results = _results(20)
+    array = ResultArray(results)
+    for i in range(-20, 20):
+        assert array[i] == results[i]
+    assert array[3:12:2] == ResultArray(results[3:12:2])
+    with pytest.raises(IndexError):
+        array[20]
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        slice(None),
+        slice(3, 12),
+        slice(8, 16),
+        slice(5, 6),
+        slice(-7, None),
+        slice(10, 3),
+        slice(3, 12, 2),
+        slice(None, None, -1),
+        slice(15, 2, -3),
+    ],
+)
+def test_slice(index: slice) -> None:
+    results = _results(21)
+    sliced = ResultArray(results)[index]
+    assert sliced == ResultArray(results[index])
+    assert sliced.to_list() == results[index]
+
+
+def test_eq_and_repr() -> None:
+    results: List[Result[int, str]] = [Ok(1), Err("a")]
+    array = ResultArray(results)
+    assert array == ResultArray(list(results))
+    assert array != ResultArray([Ok(1), Ok(2)])
+    assert array != [Ok(1), Err("a")]
+    assert repr(array) == "ResultArray([Ok(1), Err('a')])"
+
+
+@pytest.mark.parametrize("n", [0, 5, 8, 21])
+def test_oks_errs(n: int) -> None:
+    results = _results(n)
+    array = ResultArray(results)
+    oks = [r.ok_value for r in results if isinstance(r, Ok)]
+    errs = [r.err_value for r in results if isinstance(r, Err)]
+    assert list(array.oks()) == oks
+    assert list(array.errs()) == errs
+    assert len(array.oks()) == len(oks)
+    assert len(array.errs()) == len(errs)
+    assert array.oks()[:] == oks
+    assert array.errs()[::-1] == errs[::-1]
+    if oks:
+        assert array.oks()[-1] == oks[-1]
+    assert array.partition() == (oks, errs)
+
+
+def test_map_and_map_err() -> None:
+    results = _results(30)
+    array = ResultArray(results)
+    assert array.map(lambda x: x * 2).to_list() == [r.map(lambda x: x * 2) for r in results]
+    assert array.map_err(len).to_list() == [r.map_err(len) for r in results]
+
+
+def test_and_then() -> None:
+    def half(x: int) -> Result[int, str]:
+        return Ok(x // 2) if x % 2 == 0 else Err("odd")
+
+    results = _results(30)
+    array = ResultArray(results)
+    assert array.and_then(half).to_list() == [r.and_then(half) for r in results]
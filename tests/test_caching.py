@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from result import Err, Ok, as_async_result, as_result
+from result.caching import CacheStats, ResultCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_ok_results() -> None:
+    calls: List[int] = []
+    cache = ResultCache(maxsize=2)
+
+    @as_result(ValueError, cache=cache)
+    def double(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    assert double(1) == Ok(2)
+    assert double(1) == Ok(2)
+    assert double(x=1) == Ok(2)  # Keyword arguments are a different key
+    assert calls == [1, 1]
+    double(2)  # Evicts `double(1)`
+    double(x=1)
+    double(1)
+    assert calls == [1, 1, 2, 1]
+    assert cache.stats() == CacheStats(
+        hits=2, misses=4, evictions=2, expirations=0, size=2, maxsize=2
+    )
+
+    cache.clear()
+    assert cache.stats() == CacheStats(0, 0, 0, 0, 0, 2)
+
+
+def test_cache_ttl() -> None:
+    clock = _Clock()
+    calls: List[int] = []
+
+    @as_result(ValueError, cache=ResultCache(ttl=10, timer=clock))
+    def double(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    double(1)
+    clock.now = 9.9
+    double(1)
+    assert calls == [1]
+    clock.now = 10
+    double(1)
+    assert calls == [1, 1]
+
+
+def test_cache_err_policies() -> None:
+    clock = _Clock()
+    calls: List[str] = []
+
+    def parse(text: str) -> int:
+        calls.append(text)
+        if text == "-":
+            raise KeyError(text)
+        return int(text)
+
+    never = as_result(ValueError, KeyError, cache=ResultCache(timer=clock))(parse)
+    assert isinstance(never("x"), Err)
+    assert isinstance(never("x"), Err)
+    assert calls == ["x", "x"]
+
+    calls.clear()
+    briefly = as_result(ValueError, cache=ResultCache(ttl=60, err_ttl=1, timer=clock))(parse)
+    briefly("x")
+    briefly("x")
+    clock.now = 1
+    briefly("x")
+    assert calls == ["x", "x"]
+
+    calls.clear()
+    only_key_errors = as_result(
+        ValueError, KeyError, cache=ResultCache(err_ttl=None, err_types=(KeyError,))
+    )(parse)
+    for _ in range(2):
+        only_key_errors("-")
+        only_key_errors("x")
+    assert calls == ["-", "x", "x"]
+
+    calls.clear()
+    records = as_result(
+        KeyError, capture="record", cache=ResultCache(err_ttl=None, err_types=(LookupError,))
+    )(parse)
+    records("-")
+    records("-")
+    assert calls == ["-"]
+
+
+@pytest.mark.asyncio
+async def test_cache_async() -> None:
+    calls: List[int] = []
+    cache = ResultCache()
+
+    @as_async_result(ValueError, cache=cache)
+    async def double(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    assert await double(1) == Ok(2)
+    assert await double(1) == Ok(2)
+    assert calls == [1]
+    assert cache.stats().hits == 1
+
+
+def test_cache_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="maxsize"):
+        ResultCache(maxsize=0)
+    with pytest.raises(ValueError, match="err_ttl must not be negative"):
+        ResultCache(err_ttl=-1)
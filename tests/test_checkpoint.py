@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import marshal
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from result import Err, Ok, Result, as_result
+from result.checkpoint import CheckpointLog
+
+
+def test_append_and_get(tmp_path: Path) -> None:
+    path = str(tmp_path / "run.log")
+    with CheckpointLog(path, sync_every=3) as log:
+        log.append(0, Ok(1))
+        log.append("key", Err("failed"))
+        log.append(("a", 1), Ok([1, 2]))
+        log.append(-5, Ok(None))
+        assert log.get(0) == Ok(1)
+        assert log.get("key") == Err("failed")
+        assert log.get(("a", 1)) == Ok([1, 2])
+        assert log.get(-5) == Ok(None)
+        assert log.get(1) is None
+        log.append("key", Ok("fixed"))
+        assert log.get("key") == Ok("fixed")
+        assert len(log) == 4
+        assert 0 in log and 1 not in log
+
+    with CheckpointLog(path) as log:
+        assert len(log) == 4
+        assert log.get("key") == Ok("fixed")
+        assert sorted(map(repr, log.keys())) == ["'key'", "('a', 1)", "-5", "0"]
+
+
+def test_large_integer_keys(tmp_path: Path) -> None:
+    with CheckpointLog(str(tmp_path / "run.log")) as log:
+        log.append(1 << 40, Ok(1))
+        log.append(1 << 70, Ok(2))
+        log.append(3, Ok(3))
+        assert len(log._dense) < 1 << 20
+        assert [log.get(key) for key in (1 << 40, 1 << 70, 3)] == [Ok(1), Ok(2), Ok(3)]
+
+
+@as_result(ValueError)
+def _parse(text: str) -> int:
+    return int(text)
+
+
+def test_run_resumes(tmp_path: Path) -> None:
+    path = str(tmp_path / "run.log")
+    calls: List[str] = []
+
+    def parse(text: str) -> Result[int, ValueError]:
+        calls.append(text)
+        return _parse(text)
+
+    items = ["1", "x", "3"]
+    with CheckpointLog(path) as log:
+        results = list(log.run(parse, items))
+    assert results[0] == Ok(1) and results[2] == Ok(3)
+    assert calls == items
+
+    # Only the failed item is retried, and the recorded results are returned.
+    calls.clear()
+    items[1] = "2"
+    with CheckpointLog(path) as log:
+        assert list(log.run(parse, items)) == [Ok(1), Ok(2), Ok(3)]
+        assert calls == ["2"]
+        calls.clear()
+        assert list(log.run(parse, items, key=str)) == [Ok(1), Ok(2), Ok(3)]
+        assert calls == items
+
+    with CheckpointLog(path) as log:
+        calls.clear()
+        list(log.run(parse, ["x"], key=lambda item: "bad"))
+        list(log.run(parse, ["x"], key=lambda item: "bad", retry_errors=False))
+        assert calls == ["x"]
+
+
+def test_torn_write_discarded(tmp_path: Path) -> None:
+    path = str(tmp_path / "run.log")
+    with CheckpointLog(path, serializer=marshal) as log:
+        for i in range(10):
+            log.append(i, Ok(i))
+    size = os.path.getsize(path)
+
+    # A crash during a write leaves a partial record at the end.
+    with open(path, "r+b") as file:
+        file.truncate(size - 3)
+    with CheckpointLog(path, serializer=marshal) as log:
+        assert len(log) == 9
+        assert log.get(9) is None
+        log.append(9, Ok(9))
+    with CheckpointLog(path, serializer=marshal) as log:
+        assert [log.get(i) for i in range(10)] == [Ok(i) for i in range(10)]
+
+    # A corrupted record is detected by its checksum.
+    with open(path, "r+b") as file:
+        file.seek(size - 1)
+        file.write(b"\xff")
+    with CheckpointLog(path, serializer=marshal) as log:
+        assert len(log) == 9
+
+
+def test_sync_batches(tmp_path: Path) -> None:
+    path = str(tmp_path / "run.log")
+    log = CheckpointLog(path, sync_every=5, sync_interval=60)
+    for i in range(4):
+        log.append(i, Ok(i))
+    assert os.path.getsize(path) == 8
+    log.append(4, Ok(4))
+    assert os.path.getsize(path) > 8
+    log.append(5, Ok(5))
+    # Reading a buffered record writes it, without waiting for the sync.
+    assert log.get(5) == Ok(5)
+    log.close()
+    log.close()
+
+
+def test_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a log file")
+    with pytest.raises(ValueError, match="not a checkpoint log"):
+        CheckpointLog(str(path))
+    with pytest.raises(ValueError, match="sync_every"):
+        CheckpointLog(str(tmp_path / "run.log"), sync_every=0)
+    with pytest.raises(ValueError, match="sync_interval"):
+        CheckpointLog(str(tmp_path / "run.log"), sync_interval=-1)
+    with CheckpointLog(str(tmp_path / "run.log")) as log:
+        with pytest.raises(TypeError, match="expected Ok or Err"):
+            log.append(0, 1)  # type: ignore[arg-type]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import copy
+import io
+import json
+import marshal
+import pickle
+from typing import Any, List
+
+import pytest
+
+from result import Err, ExceptionRecord, Ok, Result
+from result.codec import dump_results, load_results
+
+
+class _Json:
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+def test_pickle_round_trip() -> None:
+    values: List[Any] = [
+        Ok(1),
+        Err("error"),
+        Ok([1, {"a": None}]),
+        Err(ExceptionRecord(ValueError, ("x",), (("file.py", 1, "f"),))),
+    ]
+    for value in values:
+        assert pickle.loads(pickle.dumps(value)) == value
+    # The compact form only stores the class and the value.
+    assert len(pickle.dumps(Ok(1))) < 45
+
+
+def test_copy() -> None:
+    ok = Ok([1, [2]])
+    assert copy.copy(ok) is ok
+    deep = copy.deepcopy(ok)
+    assert deep == ok
+    assert deep.ok_value is not ok.ok_value
+    assert deep.ok_value[1] is not ok.ok_value[1]
+
+    err = Err("immutable")
+    assert copy.deepcopy(err) is err
+    # Shared values stay shared.
+    shared = [1]
+    pair = copy.deepcopy((Ok(shared), Err(shared)))
+    assert pair[0].ok_value is pair[1].err_value
+
+
+def test_dump_and_load_results() -> None:
+    results: List[Result[Any, Any]] = [Ok(i) if i % 3 else Err(str(i)) for i in range(50_000)]
+    results.append(Ok("x" * 200_000))  # Larger than a chunk.
+    file = io.BytesIO()
+    assert dump_results(iter(results), file) == len(results)
+    file.seek(0)
+    assert list(load_results(file)) == results
+
+    for serializer in (marshal, _Json()):
+        file = io.BytesIO()
+        dump_results(results[:10], file, serializer)
+        file.seek(0)
+        assert list(load_results(file, serializer)) == results[:10]
+
+
+def test_load_results_invalid() -> None:
+    file = io.BytesIO()
+    dump_results([Ok(1), Err(2)], file)
+    data = file.getvalue()
+    assert list(load_results(io.BytesIO(b""))) == []
+    with pytest.raises(ValueError, match="truncated result header"):
+        list(load_results(io.BytesIO(data[:-len(pickle.dumps(2)) - 2])))
+    with pytest.raises(ValueError, match="truncated result payload"):
+        list(load_results(io.BytesIO(data[:-1])))
+    with pytest.raises(ValueError, match="invalid result tag 7"):
+        list(load_results(io.BytesIO(b"\x07" + data[1:])))
+    with pytest.raises(TypeError, match="expected Ok or Err"):
+        dump_results([1], io.BytesIO())  # type: ignore[list-item]
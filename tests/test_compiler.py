@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from typing import Any, Callable, List, Tuple
+
+import pytest
+
+from result import Err, Ok, Result, do, do_async, do_function
+
+
+def resx(is_suc: bool) -> Result[str, int]:
+    return Ok("hello") if is_suc else Err(1)
+
+
+def resy(is_suc: bool) -> Result[bool, int]:
+    return Ok(True) if is_suc else Err(2)
+
+
+async def aresx(is_suc: bool) -> Result[str, int]:
+    return resx(is_suc)
+
+
+async def aresy(is_suc: bool) -> Result[bool, int]:
+    return resy(is_suc)
+
+
+x = "global"
+
+
+def _is_compiled(function: Callable[..., Any]) -> bool:
+    return "do" not in function.__code__.co_names
+
+
+def test_return() -> None:
+    @do_function
+    def get_output(is_suc1: bool, is_suc2: bool) -> Result[float, int]:
+        return do(Ok(len(x) + int(y) + 0.5) for x in resx(is_suc1) for y in resy(is_suc2))
+
+    assert _is_compiled(get_output)
+    assert get_output(True, True) == Ok(6.5)
+    assert get_output(True, False) == Err(2)
+    assert get_output(False, True) == Err(1)
+    assert get_output(False, False) == Err(1)
+
+
+def test_assignment_does_not_leak_names() -> None:
+    @do_function
+    def get_output(is_suc1: bool, is_suc2: bool) -> Any:
+        out: Result[float, int] = do(
+            Ok(len(x) + int(y) + 0.5) for x in resx(is_suc1) for y in resy(is_suc2)
+        )
+        first: Result[Any, int] = do(Ok((x, y)) for x in resx(is_suc1) for y in resy(is_suc2))
+        return out, first, x
+
+    assert _is_compiled(get_output)
+    assert get_output(True, True) == (Ok(6.5), Ok(("hello", True)), "global")
+    assert get_output(False, True) == (Err(1), Err(1), "global")
+
+
+def test_later_clauses_see_earlier_names() -> None:
+    @do_function
+    def get_output(value: int) -> Result[int, str]:
+        return do(
+            Ok(x + y + z)
+            for x in Ok(value)
+            for y in (Ok(x * 2) if x > 0 else Err("x"))
+            for z in (Ok(y + 1) if y > 2 else Err("y"))
+        )
+
+    for value in (-1, 1, 2):
+        assert get_output(value) == do(
+            Ok(x + y + z)
+            for x in Ok(value)
+            for y in (Ok(x * 2) if x > 0 else Err("x"))
+            for z in (Ok(y + 1) if y > 2 else Err("y"))
+        )
+
+
+def test_closure_and_tuple_targets() -> None:
+    offset = 1
+
+    @do_function
+    def get_output(pair: Result[Any, str]) -> Result[int, str]:
+        return do(Ok(a + b + offset) for a, b in pair)
+
+    assert _is_compiled(get_output)
+    assert get_output(Ok((1, 2))) == Ok(4)
+    offset = 10
+    assert get_output(Ok((1, 2))) == Ok(13)
+    assert get_output(Err("nay")) == Err("nay")
+
+
+def test_invalid_value() -> None:
+    @do_function
+    def get_output() -> Result[int, str]:
+        return do(Ok(x) for x in [1])
+
+    with pytest.raises(TypeError, match="requires Ok or Err values"):
+        get_output()
+
+
+def test_private_names_in_methods() -> None:
+    class Parser:
+        __prefix = "value: "
+
+        @do_function
+        def parse(self, raw: Result[str, int]) -> Result[str, int]:
+            return do(Ok(self.__prefix + x) for x in raw)
+
+    assert _is_compiled(Parser.parse)
+    assert Parser().parse(Ok("a")) == Ok("value: a")
+
+
+def test_private_names_in_functions_nested_in_methods() -> None:
+    class Parser:
+        __prefix = "value: "
+
+        def parse(self, raw: Result[str, int]) -> Result[str, int]:
+            @do_function
+            def inner() -> Result[str, int]:
+                return do(Ok(self.__prefix + x) for x in raw)
+
+            assert _is_compiled(inner)
+            return inner()
+
+    assert Parser().parse(Ok("a")) == Ok("value: a")
+    assert Parser().parse(Err(1)) == Err(1)
+
+
+def test_nested_scope_rebinding_is_left_alone() -> None:
+    @do_function
+    def get_output() -> Result[List[int], str]:
+        return do(Ok([y for y in range(y)]) for y in Ok(3))
+
+    assert not _is_compiled(get_output)
+    assert get_output() == Ok([0, 1, 2])
+
+
+def test_functions_are_compiled_once() -> None:
+    def make() -> Callable[[], Result[int, str]]:
+        @do_function
+        def get_output() -> Result[int, str]:
+            return do(Ok(x) for x in Ok(1))
+
+        return get_output
+
+    assert make().__code__ is make().__code__
+
+
+def test_without_source() -> None:
+    with pytest.raises(TypeError, match="source code"):
+        do_function(eval("lambda: None"))
+    with pytest.raises(TypeError, match="only be applied to functions"):
+        do_function(len)
+
+
+@pytest.mark.asyncio
+async def test_do_async() -> None:
+    @do_function
+    async def get_output(is_suc1: bool, is_suc2: bool) -> Result[float, int]:
+        return await do_async(
+            Ok(len(x) + int(y) + 0.5)
+            for x in await aresx(is_suc1)
+            for y in await aresy(is_suc2)
+        )
+
+    assert _is_compiled(get_output)
+    for is_suc1, is_suc2 in itertools.product([True, False], repeat=2):
+        assert await get_output(is_suc1, is_suc2) == await do_async(
+            Ok(len(x) + int(y) + 0.5)
+            for x in await aresx(is_suc1)
+            for y in await aresy(is_suc2)
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_generator_error_is_kept() -> None:
+    @do_function
+    async def get_output() -> Result[float, int]:
+        return do(
+            Ok(len(x) + int(y) + 0.5)  # type: ignore[arg-type]
+            for x in await aresx(True)
+            for y in await aresy(True)
+        )
+
+    with pytest.raises(TypeError, match="Got async_generator but expected generator"):
+        await get_output()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_do_async() -> None:
+    started: List[str] = []
+    release = asyncio.Event()
+
+    async def fetch(name: str, result: Result[str, str]) -> Result[str, str]:
+        started.append(name)
+        await release.wait()
+        return result
+
+    @do_function(concurrent=True)
+    async def get_output(a: Result[str, str], b: Result[str, str]) -> Result[str, str]:
+        return await do_async(
+            Ok(x + y + z)
+            for x in await fetch("a", a)
+            for y in await fetch("b", b)
+            for z in await fetch("c", Ok(x))
+        )
+
+    async def release_when_started() -> None:
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        # Both independent clauses run before either of them finished.
+        assert started == ["a", "b"]
+        release.set()
+
+    options: List[Tuple[Result[str, str], Result[str, str]]] = list(
+        itertools.product([Ok("a"), Err("1")], [Ok("b"), Err("2")])
+    )
+    for a, b in options:
+        started.clear()
+        release.clear()
+        output, _ = await asyncio.gather(get_output(a, b), release_when_started())
+        assert output == await do_async(
+            Ok(x + y + z) for x in a for y in b for z in Ok(x)
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_do_async_cancels_after_err() -> None:
+    cancelled = asyncio.Event()
+
+    async def fail() -> Result[int, str]:
+        return Err("nay")
+
+    async def hang() -> Result[int, str]:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return Ok(1)
+
+    @do_function(concurrent=True)
+    async def get_output() -> Result[int, str]:
+        return await do_async(Ok(x + y) for x in await fail() for y in await hang())
+
+    assert await get_output() == Err("nay")
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Dict, Iterator, List
+
+import pytest
+
+from result import (
+    Err,
+    Ok,
+    Result,
+    as_async_result,
+    as_completed_results,
+    gather_results,
+)
+from result.concurrency import _gather_in_order
+
+
+async def _after(delay: float, result: Result[int, str]) -> Result[int, str]:
+    await asyncio.sleep(delay)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_gather_in_order_ok() -> None:
+    assert await _gather_in_order([_after(0.02, Ok(1)), _after(0, Ok(2))]) == Ok((1, 2))
+    assert await _gather_in_order([]) == Ok(())
+
+
+@pytest.mark.asyncio
+async def test_gather_in_order_returns_first_err_in_input_order() -> None:
+    # The second Err is known first, but the first one still wins.
+    results = [_after(0.02, Err("first")), _after(0, Err("second"))]
+    assert await _gather_in_order(results) == Err("first")
+    results = [_after(0.02, Ok(1)), _after(0, Err("second"))]
+    assert await _gather_in_order(results) == Err("second")
+
+
+@pytest.mark.asyncio
+async def test_gather_in_order_cancels_later_awaitables() -> None:
+    finished: List[int] = []
+
+    async def slow(index: int) -> Result[int, str]:
+        await asyncio.sleep(0.05)
+        finished.append(index)
+        return Ok(index)
+
+    result = await _gather_in_order([slow(0), _after(0, Err("nay")), slow(2)])
+    assert result == Err("nay")
+    await asyncio.sleep(0.1)
+    assert finished == [0]
+
+
+@pytest.mark.asyncio
+async def test_gather_in_order_raises_first_exception() -> None:
+    async def boom() -> Result[int, str]:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await _gather_in_order([_after(0.01, Ok(1)), boom(), _after(0, Err("nay"))])
+    assert await _gather_in_order([_after(0, Err("nay")), boom()]) == Err("nay")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_calls() -> None:
+    calls: List[int] = []
+
+    @as_async_result(ValueError, single_flight=True)
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        if x < 0:
+            raise ValueError(x)
+        return x * 2
+
+    results = await asyncio.gather(*[fetch(x) for x in [1, 1, 2, 1, -1, -1]])
+    assert results[:4] == [Ok(2), Ok(2), Ok(4), Ok(2)]
+    assert results[4] is results[5]
+    assert isinstance(results[4], Err)
+    assert sorted(calls) == [-1, 1, 2]
+
+    # Once done, the next call runs the function again.
+    assert await fetch(1) == Ok(2)
+    assert sorted(calls) == [-1, 1, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancellation() -> None:
+    calls: List[int] = []
+    started = asyncio.Event()
+
+    @as_async_result(ValueError, single_flight=True)
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        started.set()
+        await asyncio.sleep(0.02)
+        return x
+
+    first = asyncio.ensure_future(fetch(1))
+    second = asyncio.ensure_future(fetch(1))
+    await started.wait()
+    first.cancel()
+    assert await second == Ok(1)
+    assert first.cancelled()
+    assert calls == [1]
+
+    # When all callers are cancelled, so is the shared call, and the next call
+    # starts a new one.
+    started.clear()
+    only = asyncio.ensure_future(fetch(2))
+    await started.wait()
+    only.cancel()
+    await asyncio.sleep(0)
+    assert await fetch(2) == Ok(2)
+    assert calls == [1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_unhashable_arguments() -> None:
+    calls: List[List[int]] = []
+
+    @as_async_result(ValueError, single_flight=True)
+    async def total(values: List[int], *, scale: Dict[str, int]) -> int:
+        calls.append(values)
+        await asyncio.sleep(0)
+        return sum(values) * scale["factor"]
+
+    results = await asyncio.gather(*[total([1, 2], scale={"factor": 2}) for _ in range(2)])
+    assert results == [Ok(6), Ok(6)]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_gather_results() -> None:
+    assert await gather_results([_after(0.02, Ok(1)), _after(0, Ok(2))]) == Ok([1, 2])
+    assert await gather_results([]) == Ok([])
+    results = [_after(0.02, Ok(1)), _after(0, Err("a")), _after(0.01, Err("b"))]
+    assert await gather_results(results, fail_fast=False) == [Ok(1), Err("a"), Err("b")]
+
+
+@pytest.mark.asyncio
+async def test_gather_results_fail_fast() -> None:
+    finished: List[int] = []
+
+    async def slow(i: int) -> Result[int, str]:
+        await asyncio.sleep(0.05)
+        finished.append(i)
+        return Ok(i)
+
+    # The first Err to complete is returned, and the rest are cancelled.
+    results = [slow(0), _after(0.01, Err("late")), _after(0, Err("early")), slow(3)]
+    assert await gather_results(results) == Err("early")
+    await asyncio.sleep(0.1)
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_gather_results_limit() -> None:
+    running = 0
+    most = 0
+
+    async def work(i: int) -> Result[int, str]:
+        nonlocal running, most
+        running += 1
+        most = max(most, running)
+        await asyncio.sleep(0.001 * (i % 3))
+        running -= 1
+        return Ok(i) if i != 6 else Err("six")
+
+    assert await gather_results([work(i) for i in range(6)], limit=2) == Ok(list(range(6)))
+    assert most == 2
+
+    # Awaitables that weren't started when an Err was returned never start.
+    started: List[int] = []
+
+    async def track(i: int) -> Result[int, str]:
+        started.append(i)
+        return await work(i)
+
+    assert await gather_results([track(i) for i in range(6, 10)], limit=1) == Err("six")
+    assert started == [6]
+    with pytest.raises(ValueError, match="limit"):
+        await gather_results([], limit=0)
+
+
+@pytest.mark.asyncio
+async def test_gather_results_exception() -> None:
+    async def fail() -> Result[int, str]:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await gather_results([fail(), _after(1, Ok(1))])
+
+
+@pytest.mark.asyncio
+async def test_as_completed_results() -> None:
+    results = [_after(0.02, Ok(0)), _after(0, Err("a")), _after(0.01, Ok(2))]
+    assert [pair async for pair in as_completed_results(results)] == [
+        (1, Err("a")),
+        (2, Ok(2)),
+        (0, Ok(0)),
+    ]
+    nothing: List[Awaitable[Result[int, str]]] = []
+    assert [pair async for pair in as_completed_results(nothing)] == []
+    with pytest.raises(ValueError, match="limit"):
+        as_completed_results([], limit=0)
+
+
+@pytest.mark.asyncio
+async def test_as_completed_results_lazy_input() -> None:
+    taken = 0
+    running = 0
+    most = 0
+
+    async def work(i: int) -> Result[int, str]:
+        nonlocal running, most
+        running += 1
+        most = max(most, running)
+        await asyncio.sleep(0.001 * (i % 3))
+        running -= 1
+        return Ok(i)
+
+    def produce() -> Iterator[Awaitable[Result[int, str]]]:
+        nonlocal taken
+        for i in range(20):
+            taken += 1
+            yield work(i)
+
+    async def produce_async() -> AsyncIterator[Awaitable[Result[int, str]]]:
+        for awaitable in produce():
+            yield awaitable
+
+    for source in (produce, produce_async):
+        taken = most = 0
+        seen: List[int] = []
+        async for index, result in as_completed_results(source(), limit=3):
+            assert taken <= len(seen) + 3
+            seen.append(index)
+            assert result == Ok(index)
+        assert sorted(seen) == list(range(20))
+        assert most == 3
+
+
+@pytest.mark.asyncio
+async def test_as_completed_results_stop_early() -> None:
+    finished: List[int] = []
+
+    async def slow(i: int) -> Result[int, str]:
+        await asyncio.sleep(0.05)
+        finished.append(i)
+        return Ok(i)
+
+    async with as_completed_results([slow(0), _after(0, Err("a")), slow(2)]) as results:
+        async for index, result in results:
+            assert (index, result) == (1, Err("a"))
+            break
+    await asyncio.sleep(0.1)
+    assert finished == []
+
+    results = as_completed_results([_after(0, Ok(0)), slow(1)])
+    assert await results.__anext__() == (0, Ok(0))
+    await results.aclose()
+    with pytest.raises(StopAsyncIteration):
+        await results.__anext__()
+    await asyncio.sleep(0.1)
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_as_completed_results_exception() -> None:
+    finished: List[int] = []
+
+    async def fail() -> Result[int, str]:
+        raise RuntimeError("boom")
+
+    async def slow() -> Result[int, str]:
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return Ok(1)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        async for _ in as_completed_results([fail(), slow()]):
+            pass
+    await asyncio.sleep(0.1)
+    assert finished == []
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from result import DeadlineExceeded, Err, Ok, Result, as_async_result, deadline
+from result.deadlines import remaining
+from result.instrumentation import add_hook, remove_hook
+
+
+async def _slow(x: int) -> int:
+    await asyncio.sleep(0.05)
+    return x
+
+
+async def _check(x: int) -> Result[int, str]:
+    await asyncio.sleep(0.001)
+    return Ok(x) if x > 0 else Err("not positive")
+
+
+def test_deadline_nesting() -> None:
+    assert remaining() is None
+    with deadline(10) as outer:
+        with deadline(20) as inner:
+            assert inner == outer
+        with deadline(1) as inner:
+            assert inner < outer
+            budget = remaining()
+            assert budget is not None and 0 < budget <= 1
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_combinators() -> None:
+    with deadline(1):
+        assert await Ok(1).map_async(_slow) == Ok(1)
+        assert await Ok(1).and_then_async(_check) == Ok(1)
+        assert await Ok(0).and_then_async(_check) == Err("not positive")
+
+    with deadline(0.01):
+        with pytest.raises(DeadlineExceeded):
+            await Ok(1).map_async(_slow)
+
+
+@pytest.mark.asyncio
+async def test_deadline_skips_later_stages() -> None:
+    calls: List[int] = []
+
+    async def stage(x: int) -> Result[int, str]:
+        calls.append(x)
+        await asyncio.sleep(0.02)
+        return Ok(x + 1)
+
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.03):
+            result = await Ok(0).and_then_async(stage)
+            result = await result.and_then_async(stage)
+            result = await result.and_then_async(stage)
+    # The second stage was cancelled at the deadline, and the third never ran.
+    assert calls == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_deadline_as_async_result() -> None:
+    finished: List[int] = []
+
+    @as_async_result(ValueError, DeadlineExceeded)
+    async def fetch(x: int) -> int:
+        await asyncio.sleep(0.05)
+        finished.append(x)
+        return x
+
+    with deadline(0.01):
+        result = await fetch(1)
+        assert isinstance(result, Err)
+        assert isinstance(result.err(), DeadlineExceeded)
+        assert "during" in str(result.err())
+        result = await fetch(2)
+        assert "before" in str(result.err())
+    await asyncio.sleep(0.06)
+    assert finished == []
+    assert await fetch(3) == Ok(3)
+
+    # The instrumented wrappers handle deadlines as well.
+    durations: List[float] = []
+
+    def hook(function: object, result: object, duration: float) -> None:
+        durations.append(duration)
+
+    add_hook(hook)
+    try:
+        with deadline(0.01):
+            result = await fetch(4)
+    finally:
+        remove_hook(hook)
+    assert isinstance(result, Err)
+    assert len(durations) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_not_caught_unless_listed() -> None:
+    @as_async_result(ValueError)
+    async def fetch() -> int:
+        return await _slow(1)
+
+    with deadline(0.01):
+        with pytest.raises(DeadlineExceeded):
+            await fetch()
+
+    @as_async_result(TimeoutError)
+    async def fetch_timeout() -> int:
+        return await _slow(1)
+
+    with deadline(0.01):
+        result = await fetch_timeout()
+    assert isinstance(result.err(), DeadlineExceeded)
+
+
+@pytest.mark.asyncio
+async def test_deadline_own_timeout_not_confused() -> None:
+    @as_async_result(asyncio.TimeoutError)
+    async def fetch() -> int:
+        return await asyncio.wait_for(_slow(1), 0.001)
+
+    with deadline(1):
+        result = await fetch()
+    assert isinstance(result, Err)
+    assert not isinstance(result.err(), DeadlineExceeded)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from result import Err, Ok, Result, as_async_result
+from result.hedging import Hedge
+
+
+class _Backend:
+    """
+    A fake backend whose attempts take the given delays in turn.
+    """
+
+    def __init__(self, *delays: float, fail: bool = False) -> None:
+        self.delays = list(delays)
+        self.fail = fail
+        self.started = 0
+        self.finished: List[int] = []
+
+    async def call(self, key: str) -> str:
+        attempt = self.started
+        self.started += 1
+        await asyncio.sleep(self.delays[attempt % len(self.delays)])
+        self.finished.append(attempt)
+        if self.fail:
+            raise ConnectionError(attempt)
+        return "{}:{}".format(key, attempt)
+
+
+@pytest.mark.asyncio
+async def test_hedge_fast_call_not_hedged() -> None:
+    backend = _Backend(0)
+    hedge = Hedge(delay=0.05, budget=1)
+    fetch = as_async_result(ConnectionError, hedge=hedge)(backend.call)
+    assert await fetch("a") == Ok("a:0")
+    assert backend.started == 1
+    assert hedge.stats()[:3] == (1, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_hedge_slow_call_hedged() -> None:
+    backend = _Backend(0.2, 0.01)
+    hedge = Hedge(delay=0.01, budget=1)
+    fetch = as_async_result(ConnectionError, hedge=hedge)(backend.call)
+    assert await fetch("a") == Ok("a:1")
+    assert hedge.stats()[:3] == (1, 1, 1)
+    # The slow attempt was cancelled.
+    await asyncio.sleep(0.25)
+    assert backend.finished == [1]
+
+
+@pytest.mark.asyncio
+async def test_hedge_both_err() -> None:
+    backend = _Backend(0.03, 0.01, fail=True)
+    fetch = as_async_result(ConnectionError, hedge=Hedge(delay=0.01, budget=1))(backend.call)
+    result = await fetch("a")
+    assert isinstance(result, Err)
+    assert result.err().args == (1,)
+    assert backend.finished == [1, 0]
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget() -> None:
+    backend = _Backend(0.02)
+    hedge = Hedge(delay=0.001, budget=0.25)
+    fetch = as_async_result(ConnectionError, hedge=hedge)(backend.call)
+    results: List[Result[str, ConnectionError]] = await asyncio.gather(
+        *(fetch(str(i)) for i in range(40))
+    )
+    assert all(result.is_ok() for result in results)
+    calls, hedged, _, _ = hedge.stats()
+    assert calls == 40
+    assert hedged == 10
+    assert backend.started == 50
+
+
+@pytest.mark.asyncio
+async def test_hedge_learned_delay() -> None:
+    backend = _Backend(*[0.001] * 9, 0.05)
+    hedge = Hedge(delay=1, percentile=50, budget=0)
+    fetch = as_async_result(ConnectionError, hedge=hedge)(backend.call)
+    for i in range(40):
+        await fetch(str(i))
+    assert hedge.stats().delay < 0.05
+
+
+@pytest.mark.asyncio
+async def test_hedge_cancelled_caller() -> None:
+    backend = _Backend(0.05)
+    fetch = as_async_result(ConnectionError, hedge=Hedge(delay=0.01, budget=1))(backend.call)
+    task = asyncio.ensure_future(fetch("a"))
+    await asyncio.sleep(0.02)
+    assert backend.started == 2
+    task.cancel()
+    await asyncio.sleep(0.06)
+    assert backend.finished == []
+
+
+def test_hedge_invalid_arguments() -> None:
+    for kwargs in (
+        {"delay": -1},
+        {"percentile": 100},
+        {"window": 0},
+        {"budget": 2},
+    ):
+        with pytest.raises(ValueError, match=next(iter(kwargs))):
+            Hedge(**kwargs)
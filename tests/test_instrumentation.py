@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import gc
+import weakref
+from typing import Any, Callable, Iterator, List, Tuple
+
+import pytest
+
+from result import Err, Ok, Result, as_async_result, as_result
+from result.instrumentation import ResultMetrics, add_hook, hooks, remove_hook
+from result.limiting import Limiter
+
+Call = Tuple[Callable[..., Any], Result[Any, Any], float]
+
+
+@as_result(ValueError)
+def _parse(text: str) -> int:
+    return int(text)
+
+
+@as_async_result(ValueError)
+async def _parse_async(text: str) -> int:
+    return int(text)
+
+
+@pytest.fixture
+def calls() -> Iterator[List[Call]]:
+    recorded: List[Call] = []
+
+    def hook(function: Callable[..., Any], result: Result[Any, Any], duration: float) -> None:
+        recorded.append((function, result, duration))
+
+    add_hook(hook)
+    try:
+        yield recorded
+    finally:
+        remove_hook(hook)
+
+
+def test_hooks_swap_code() -> None:
+    """
+    The wrappers only run instrumented code while hooks are registered.
+    """
+    plain = _parse.__code__
+
+    def hook(function: Callable[..., Any], result: Result[Any, Any], duration: float) -> None:
+        pass
+
+    add_hook(hook)
+    assert hooks() == [hook]
+    assert _parse.__code__ is not plain
+    remove_hook(hook)
+    assert hooks() == []
+    assert _parse.__code__ is plain
+    with pytest.raises(ValueError):
+        remove_hook(hook)
+
+
+def test_hooks_called(calls: List[Call]) -> None:
+    assert _parse("1") == Ok(1)
+    assert isinstance(_parse("x"), Err)
+
+    @as_result(ValueError)
+    def decorated_later() -> int:
+        return 2
+
+    assert decorated_later() == Ok(2)
+    assert [(function.__name__, type(result)) for function, result, _ in calls] == [
+        ("_parse", Ok),
+        ("_parse", Err),
+        ("decorated_later", Ok),
+    ]
+    assert all(duration >= 0 for _, _, duration in calls)
+
+
+@pytest.mark.asyncio
+async def test_hooks_called_async(calls: List[Call]) -> None:
+    assert await _parse_async("1") == Ok(1)
+    assert isinstance(await _parse_async("x"), Err)
+    assert [type(result) for _, result, _ in calls] == [Ok, Err]
+
+
+@pytest.mark.asyncio
+async def test_hooks_called_with_limiter(calls: List[Call]) -> None:
+    async def fetch() -> int:
+        return 1
+
+    limited = as_async_result(ValueError, limiter=Limiter(max_concurrency=1))(fetch)
+    assert await limited() == Ok(1)
+    [(function, _, _)] = calls
+    assert function.__qualname__ == fetch.__qualname__
+    assert function.__wrapped__ is fetch  # type: ignore[attr-defined]
+
+
+def test_result_metrics() -> None:
+    metrics = ResultMetrics(buckets=(0.5, 1.0))
+    metrics(_parse.__wrapped__, Ok(1), 0.1)  # type: ignore[attr-defined]
+    metrics(_parse.__wrapped__, Err(ValueError()), 0.7)  # type: ignore[attr-defined]
+    metrics(_parse.__wrapped__, Err(ValueError()), 2.0)  # type: ignore[attr-defined]
+
+    name = "{}._parse".format(__name__)
+    assert metrics.snapshot() == {
+        name: {
+            "ok": 1,
+            "err": 2,
+            "errors": {"ValueError": 2},
+            "duration": {
+                "sum": pytest.approx(2.8),
+                "buckets": {0.5: 1, 1.0: 2, float("inf"): 3},
+            },
+        }
+    }
+
+    text = metrics.to_openmetrics()
+    assert 'result_calls_total{{function="{}",outcome="err"}} 2\n'.format(name) in text
+    assert 'result_errors_total{{function="{}",type="ValueError"}} 2\n'.format(name) in text
+    assert (
+        'result_call_duration_seconds_bucket{{function="{}",le="+Inf"}} 3\n'.format(name)
+        in text
+    )
+    assert text.endswith("# EOF\n")
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_result_metrics_by_name() -> None:
+    """
+    Functions with the same qualified name are aggregated together, and
+    aren't kept alive.
+    """
+
+    def make_handler(factor: int) -> Callable[[str], Result[int, ValueError]]:
+        @as_result(ValueError)
+        def handle(text: str) -> int:
+            return int(text) * factor
+
+        return handle
+
+    metrics = ResultMetrics()
+    add_hook(metrics)
+    try:
+        handlers = [make_handler(factor) for factor in range(3)]
+        for handler in handlers:
+            handler("1")
+    finally:
+        remove_hook(metrics)
+    reference = weakref.ref(handlers[0].__wrapped__)  # type: ignore[attr-defined]
+    del handlers, handler
+    gc.collect()
+    assert reference() is None
+
+    [values] = metrics.snapshot().values()
+    assert (values["ok"], values["err"]) == (3, 0)
+
+
+def test_result_metrics_as_hook(tmp_path: Any) -> None:
+    metrics = ResultMetrics()
+    add_hook(metrics)
+    try:
+        _parse("1")
+        _parse("x")
+    finally:
+        remove_hook(metrics)
+    _parse("2")
+
+    values = metrics.snapshot()["{}._parse".format(__name__)]
+    assert (values["ok"], values["err"]) == (1, 1)
+
+    path = tmp_path / "result.prom"
+    metrics.write_openmetrics(str(path))
+    assert path.read_text() == metrics.to_openmetrics()
+
+
+def test_result_metrics_invalid_buckets() -> None:
+    with pytest.raises(ValueError, match="strictly increasing"):
+        ResultMetrics(buckets=(1.0, 0.5))
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from result import Err, Ok, Result, as_async_result
+from result.limiting import Limiter, LimiterTimeout
+
+
+@pytest.mark.asyncio
+async def test_limiter_max_concurrency() -> None:
+    limiter = Limiter(max_concurrency=2)
+    running = 0
+    most = 0
+    started: List[int] = []
+
+    @as_async_result(ValueError, limiter=limiter)
+    async def work(i: int) -> int:
+        nonlocal running, most
+        started.append(i)
+        running += 1
+        most = max(most, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if i == 3:
+            raise ValueError(i)
+        return i
+
+    results = await asyncio.gather(*(work(i) for i in range(6)))
+    assert results[:3] == [Ok(0), Ok(1), Ok(2)]
+    assert isinstance(results[3], Err)
+    assert most == 2
+    # Waiting calls start in the order in which they were made.
+    assert started == list(range(6))
+
+    stats = limiter.stats()
+    assert (stats.running, stats.queued, stats.max_queued) == (0, 0, 4)
+    assert (stats.started, stats.timeouts) == (6, 0)
+    assert 0 < stats.max_wait <= stats.total_wait
+
+
+@pytest.mark.asyncio
+async def test_limiter_rate() -> None:
+    limiter = Limiter(rate=100, burst=2)
+    loop = asyncio.get_running_loop()
+    starts: List[float] = []
+
+    @as_async_result(ValueError, limiter=limiter)
+    async def work() -> None:
+        starts.append(loop.time())
+
+    await asyncio.gather(*(work() for _ in range(6)))
+    # The burst starts right away, the rest one per 10 ms.
+    assert starts[1] - starts[0] < 0.005
+    assert starts[-1] - starts[0] >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_limiter_timeout() -> None:
+    limiter = Limiter(max_concurrency=1, timeout=0.01)
+    calls: List[str] = []
+
+    @as_async_result(LimiterTimeout, limiter=limiter)
+    async def work(name: str) -> str:
+        calls.append(name)
+        await asyncio.sleep(0.05)
+        return name
+
+    first, second = await asyncio.gather(work("first"), work("second"))
+    assert first == Ok("first")
+    assert isinstance(second, Err) and isinstance(second.err(), LimiterTimeout)
+    assert calls == ["first"]
+    assert limiter.stats().timeouts == 1
+    assert limiter.stats().queued == 0
+
+    with pytest.raises(TypeError, match="LimiterTimeout"):
+        as_async_result(ValueError, limiter=limiter)
+    as_async_result(TimeoutError, limiter=limiter)
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancel_waiting() -> None:
+    limiter = Limiter(max_concurrency=1)
+
+    @as_async_result(ValueError, limiter=limiter)
+    async def work(delay: float) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    running = asyncio.ensure_future(work(0.02))
+    waiting = asyncio.ensure_future(work(0))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    assert await running == Ok(0.02)
+    assert await work(0) == Ok(0)
+    assert limiter.stats().running == 0
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_not_queued() -> None:
+    limiter = Limiter(max_concurrency=1)
+
+    @as_async_result(ValueError, limiter=limiter)
+    async def work(delay: float) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    running = asyncio.ensure_future(work(0.02))
+    first = asyncio.ensure_future(work(0))
+    second = asyncio.ensure_future(work(0))
+    await asyncio.sleep(0)
+    assert limiter.stats().queued == 2
+    first.cancel()
+    await asyncio.sleep(0)
+    assert limiter.stats().queued == 1
+
+    # Cancelled calls don't make the queue look longer than it was.
+    for _ in range(3):
+        cancelled = asyncio.ensure_future(work(0))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+    stats = limiter.stats()
+    assert (stats.queued, stats.max_queued) == (1, 2)
+    assert await running == Ok(0.02)
+    assert await second == Ok(0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_skipped_by_cache_hits() -> None:
+    from result.caching import ResultCache
+
+    limiter = Limiter(max_concurrency=1)
+
+    @as_async_result(ValueError, limiter=limiter, cache=ResultCache())
+    async def work(i: int) -> int:
+        return i
+
+    results: List[Result[int, ValueError]] = [await work(1) for _ in range(3)]
+    assert results == [Ok(1)] * 3
+    assert limiter.stats().started == 1
+
+
+def test_limiter_invalid_arguments() -> None:
+    for kwargs in (
+        {"max_concurrency": 0},
+        {"rate": 0},
+        {"burst": 0},
+        {"timeout": -1},
+    ):
+        with pytest.raises(ValueError, match=next(iter(kwargs))):
+            Limiter(**kwargs)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Any, List
+
+import pytest
+
+from result import Err, Ok, Result
+
+np = pytest.importorskip("numpy")
+
+from result.numeric import NumericResultArray  # noqa: E402
+
+
+def _results() -> List[Result[float, Any]]:
+    return [Ok(4.0), Err("nay"), Ok(0.0), Ok(-1.0), Err(ValueError)]
+
+
+def test_roundtrip() -> None:
+    batch = NumericResultArray.from_results(_results())
+    assert len(batch) == 5
+    assert batch.to_list() == _results()
+    assert list(batch) == _results()
+    assert batch[1] == Err("nay")
+    assert batch[-1] == Err(ValueError)
+    assert batch[0] == Ok(4.0)
+    assert batch.errors.tolist() == [False, True, False, False, True]
+    assert batch.oks().tolist() == [4.0, 0.0, -1.0]
+    assert batch.errs() == ["nay", ValueError]
+
+
+def test_arrays_are_readonly() -> None:
+    batch = NumericResultArray([1.0, 2.0])
+    with pytest.raises(ValueError):
+        batch.values[0] = 3.0
+    with pytest.raises(ValueError):
+        batch.errors[0] = True
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        NumericResultArray([1.0, 2.0], [True])
+    with pytest.raises(ValueError, match="only be given for Err"):
+        NumericResultArray([1.0, 2.0], [True, False], {1: "nay"})
+    with pytest.raises(TypeError, match="requires Ok or Err"):
+        NumericResultArray.from_results([1.0])  # type: ignore[list-item]
+
+
+def test_map_matches_per_object_map() -> None:
+    batch = NumericResultArray.from_results(_results())
+    assert batch.map(lambda x: x * 2 + 1).to_list() == [
+        r.map(lambda x: x * 2 + 1) for r in _results()
+    ]
+
+
+def test_map_turns_non_finite_values_into_err() -> None:
+    batch = NumericResultArray.from_results(_results()).map(np.log)
+    results = batch.to_list()
+    assert results[0] == Ok(np.log(4.0))
+    assert results[1] == Err("nay")
+    assert results[4] == Err(ValueError)
+    for index in (2, 3):
+        error = results[index].err()
+        assert isinstance(error, FloatingPointError)
+        assert "log returned" in str(error)
+
+    unchecked = NumericResultArray.from_results(_results()).map(
+        np.log, check_finite=False
+    )
+    assert unchecked.errors.tolist() == [False, True, False, False, True]
+    assert np.isnan(unchecked.values[3])
+
+
+def test_map_turns_integer_errors_into_err() -> None:
+    batch = NumericResultArray(np.array([4, 0, 2**62, 7]), [False, False, False, True])
+    results = batch.map(lambda v: 8 // v).to_list()
+    assert results[0] == Ok(2)
+    assert isinstance(results[1].err(), FloatingPointError)
+    assert results[3] == Err(None)
+
+    results = batch.map(lambda v: v * 4).to_list()
+    assert results[:2] == [Ok(16), Ok(0)]
+    assert isinstance(results[2].err(), OverflowError)
+    assert batch.map(lambda v: v * 4, check_overflow=False)[2] == Ok(0)
+    assert NumericResultArray(np.array([200], dtype=np.uint8)).map(lambda v: v - 201)[0].is_err()
+
+    # Rounding errors of large values as float64 aren't taken for overflows.
+    assert batch.map(lambda v: v % 7)[2] == Ok(2**62 % 7)
+    assert batch.map(lambda v: v & 1).to_list()[:3] == [Ok(0), Ok(0), Ok(0)]
+
+
+def test_map_requires_elementwise_function() -> None:
+    batch = NumericResultArray([1.0, 2.0])
+    with pytest.raises(ValueError, match="elementwise"):
+        batch.map(np.sum)
+
+
+def test_map_err() -> None:
+    batch = NumericResultArray.from_results(_results()).map_err(repr)
+    assert batch.to_list() == [r.map_err(repr) for r in _results()]
+
+
+def test_unwrap_or() -> None:
+    batch = NumericResultArray.from_results(_results())
+    assert batch.unwrap_or(-5.0).tolist() == [
+        r.unwrap_or(-5.0) for r in _results()
+    ]
+
+
+def test_dtypes_are_kept() -> None:
+    batch = NumericResultArray([1, 2, 3], [False, True, False])
+    ints = batch.values.dtype
+    assert ints.kind == "i"
+    assert batch.map(np.negative).values.dtype == ints
+    assert batch.map(np.sqrt).values.dtype == np.float64
+    floats = NumericResultArray([1.5, 2.5], [True, False])
+    halves = floats.map(lambda v: (v * 2).astype(np.int32))
+    assert halves.values.dtype == np.int32
+    assert halves.to_list()[1] == Ok(5)
+
+    assert batch.unwrap_or(0).dtype == ints
+    assert batch.unwrap_or(0.0).dtype == ints
+    assert batch.unwrap_or(0.0).tolist() == [1, 0, 3]
+    # A default that isn't an integer promotes the array.
+    assert batch.unwrap_or(0.5).dtype == np.float64
+    assert batch.unwrap_or(0.5).tolist() == [1.0, 0.5, 3.0]
+    singles = NumericResultArray(np.array([1.0, 2.0], dtype=np.float32), [True, False])
+    assert singles.unwrap_or(np.nan).dtype == np.float32
+
+
+def test_result_imports_without_numpy() -> None:
+    code = (
+        "import sys; sys.modules['numpy'] = None\n"
+        "import result\n"
+        "try:\n"
+        "    import result.numeric\n"
+        "except ImportError as e:\n"
+        "    print(e)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert "requires NumPy" in out.stdout
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Iterator, List
+
+import pytest
+
+from result import Err, ExceptionRecord, Ok, parallel_map
+from result.parallel import _transferable
+
+
+class _UnpicklableError(Exception):
+    def __init__(self, code: int, reason: str) -> None:
+        super().__init__("{}: {}".format(code, reason))
+
+
+def _parse(text: str) -> int:
+    if text == "custom":
+        raise _UnpicklableError(1, "custom")
+    return int(text)
+
+
+def test_parallel_map_threads() -> None:
+    results = list(parallel_map(_parse, ["1", "x", "3"], ValueError, chunksize=2))
+    assert results[0] == Ok(1)
+    assert isinstance(results[1].err(), ValueError)
+    assert results[2] == Ok(3)
+    assert list(parallel_map(_parse, [], ValueError)) == []
+
+    with pytest.raises(_UnpicklableError):
+        list(parallel_map(_parse, ["custom"], ValueError))
+
+
+def test_parallel_map_order_and_backpressure() -> None:
+    taken = 0
+    lock = threading.Lock()
+
+    def items() -> Iterator[int]:
+        nonlocal taken
+        for i in range(1000):
+            with lock:
+                taken += 1
+            yield i
+
+    def square(x: int) -> int:
+        return x * x
+
+    seen = 0
+    with ThreadPoolExecutor(4) as pool:
+        results = parallel_map(
+            square, items(), ValueError, executor=pool, chunksize=10, max_pending=3
+        )
+        for i, result in enumerate(results):
+            assert result == Ok(i * i)
+            seen += 1
+            # At most `max_pending` chunks are taken ahead of the results.
+            assert taken <= (seen // 10 + 3) * 10 + 10
+    assert seen == 1000
+
+
+def test_parallel_map_stops_early() -> None:
+    calls: List[int] = []
+
+    def record(x: int) -> int:
+        calls.append(x)
+        return x
+
+    with ThreadPoolExecutor(1) as pool:
+        results = parallel_map(record, range(1000), ValueError, executor=pool, max_pending=2)
+        assert next(results) == Ok(0)
+        results.close()
+    assert len(calls) <= 3
+
+
+def test_parallel_map_processes() -> None:
+    with ProcessPoolExecutor(2) as pool:
+        results = list(
+            parallel_map(_parse, ["1", "x", "custom", "4"], Exception, executor=pool, chunksize=3)
+        )
+    assert results[0] == Ok(1)
+    assert isinstance(results[1].err(), ValueError)
+    assert results[2] == Err(ExceptionRecord(_UnpicklableError, ("1: custom",)))
+    assert results[3] == Ok(4)
+
+
+def test_transferable() -> None:
+    class LocalError(ValueError):
+        pass
+
+    error: Any = _transferable(LocalError(threading.Lock()))
+    assert isinstance(error, ExceptionRecord)
+    assert error.exc_type is ValueError
+    assert error.args[0].startswith("<unlocked _thread.lock")
+    exc = ValueError("x")
+    assert _transferable(exc) is exc
+
+
+def test_parallel_map_invalid_arguments() -> None:
+    with pytest.raises(TypeError, match="exception types"):
+        parallel_map(_parse, [])
+    with pytest.raises(ValueError, match="chunksize"):
+        parallel_map(_parse, [], ValueError, chunksize=0)
+    with pytest.raises(ValueError, match="max_pending"):
+        parallel_map(_parse, [], ValueError, max_pending=0)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable, List, Tuple
+
+import pytest
+
+from result import Err, Ok, Pipeline, Result
+
+
+def _double(x: int) -> int:
+    return x * 2
+
+
+def _halve(x: int) -> Result[int, str]:
+    return Ok(x // 2) if x % 2 == 0 else Err("odd")
+
+
+def _describe(e: str) -> str:
+    return "error: " + e
+
+
+def _recover(e: str) -> Result[int, str]:
+    return Ok(len(e)) if e.startswith("error") else Err(e)
+
+
+_STAGES: List[Tuple[str, Callable[[Any], Any]]] = [
+    ("map", _double),
+    ("and_then", _halve),
+    ("map_err", _describe),
+    ("or_else", _recover),
+    ("inspect", lambda x: None),
+    ("inspect_err", lambda e: None),
+]
+_INPUTS: List[Result[int, str]] = [Ok(0), Ok(3), Ok(12), Err("nay"), Err("error")]
+
+
+def _run_methods(stages: Tuple[Tuple[str, Callable[[Any], Any]], ...], result: Any) -> Any:
+    for kind, op in stages:
+        result = getattr(result, kind)(op)
+    return result
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4])
+def test_matches_method_chain(length: int) -> None:
+    for stages in itertools.product(_STAGES, repeat=length):
+        pipeline: Pipeline[Any, Any, Any, Any] = Pipeline()
+        for kind, op in stages:
+            pipeline = getattr(pipeline, kind)(op)
+        compiled = pipeline.compile()
+        for result in _INPUTS:
+            expected = _run_methods(stages, result)
+            assert pipeline(result) == expected
+            assert compiled(result) == expected
+            assert type(compiled(result)) is type(expected)
+
+
+def test_returns_same_instance_when_unchanged() -> None:
+    ok: Result[int, str] = Ok(1)
+    err: Result[int, str] = Err("nay")
+    pipeline: Pipeline[int, str, int, str] = Pipeline()
+    assert pipeline.map_err(_describe)(ok) is ok
+    assert pipeline.map(_double).inspect(print)(err) is err
+
+    returned = Ok(5)
+    assert pipeline.map(_double).and_then(lambda x: returned)(ok) is returned
+
+
+def test_inspect_is_called() -> None:
+    seen: List[Any] = []
+    pipeline: Pipeline[int, str, int, str] = (
+        Pipeline().inspect(seen.append).map(_double).inspect_err(seen.append)
+    )
+    pipeline(Ok(2))
+    pipeline(Err("nay"))
+    assert seen == [2, "nay"]
+
+
+def test_immutable_builder() -> None:
+    base: Pipeline[int, str, int, str] = Pipeline()
+    doubled = base.map(_double)
+    assert len(base) == 0
+    assert len(doubled) == 1
+    assert doubled.stages() == [("map", _double)]
+    assert repr(doubled) == "Pipeline(map(_double))"
+
+
+def test_exceptions_propagate() -> None:
+    pipeline: Pipeline[int, str, int, str] = Pipeline().map(lambda x: 1 // x)
+    with pytest.raises(ZeroDivisionError):
+        pipeline(Ok(0))
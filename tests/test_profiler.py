@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import functools
+
+import pytest
+
+from result import Err, Ok, Result, profiling
+from result.profiler import Profile
+
+
+def _double(x: int) -> int:
+    return x * 2
+
+
+def _check(x: int) -> Result[int, str]:
+    return Ok(x) if x < 10 else Err("too large")
+
+
+async def _check_async(x: int) -> Result[int, str]:
+    return _check(x)
+
+
+def test_profiling_records_ops() -> None:
+    plain_map = Ok.map
+    with profiling() as profile:
+        assert Ok.map is not plain_map
+        assert Ok(3).map(_double).and_then(_check) == Ok(6)
+        assert Ok(6).map(_double).and_then(_check) == Err("too large")
+        assert Err("nay").map(_double).map_err(str.upper) == Err("NAY")
+        assert Err("nay").unwrap_or_else(len) == 3
+        assert Ok(1).map_or(0, functools.partial(_double)) == 2
+    assert Ok.map is plain_map
+
+    stats = profile.stats()
+    double = stats["{}._double".format(__name__)]
+    assert double["calls"] == 3
+    assert double["ok_to_err"] == 0
+    assert sum(double["histogram"].values()) == 3
+    assert 0 < double["mean"] <= double["max"] <= double["total"]
+    assert stats["{}._check".format(__name__)]["ok_to_err"] == 1
+    assert stats["str.upper"]["calls"] == 1
+    assert stats["builtins.len"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_profiling_async() -> None:
+    with profiling() as profile:
+        assert await Ok(20).and_then_async(_check_async) == Err("too large")
+    assert profile.stats()["{}._check_async".format(__name__)]["ok_to_err"] == 1
+
+
+def test_profiling_nested() -> None:
+    with profiling() as outer:
+        Ok(1).map(_double)
+        with profiling() as inner:
+            Ok(1).map(_double)
+        Ok(1).map(_double)
+    name = "{}._double".format(__name__)
+    assert outer.stats()[name]["calls"] == 3
+    assert inner.stats()[name]["calls"] == 1
+
+
+def test_profiling_records_failing_ops() -> None:
+    with profiling() as profile:
+        with pytest.raises(ZeroDivisionError):
+            Ok(1).map(lambda x: x / 0)
+    assert [values["calls"] for values in profile.stats().values()] == [1]
+
+
+def test_profile_top_and_report() -> None:
+    profile = Profile(buckets=(0.001, 0.01))
+    profile._add("fast", 0.0005, False)
+    profile._add("fast", 0.0005, False)
+    profile._add("slow", 0.5, True)
+
+    assert [name for name, _ in profile.top(by="total")] == ["slow", "fast"]
+    assert [name for name, _ in profile.top(1, by="calls")] == ["fast"]
+    assert profile.stats()["slow"]["histogram"] == {0.001: 0, 0.01: 0, float("inf"): 1}
+    with pytest.raises(ValueError, match="cannot sort by"):
+        profile.top(by="name")
+
+    report = profile.report().splitlines()
+    assert report[1].split() == ["slow", "1", "500", "ms", "500", "ms", "500", "ms", "1"]
+    assert report[2].split() == [">10", "ms:", "1"]
+    assert report[4].split() == ["<=1", "ms:", "2"]
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import threading
 from typing import Callable
 
 import pytest
 
-from result import Err, Ok, OkErr, Result, UnwrapError, as_async_result, as_result
+from result import (
+    Err,
+    ExceptionRecord,
+    Ok,
+    OkErr,
+    Result,
+    UnwrapError,
+    as_async_result,
+    as_result,
+    result_repr,
+)
 
 
 def test_ok_factories() -> None:
@@ -36,6 +47,67 @@ def test_hash() -> None:
     assert len({Ok("a"), Err("a")}) == 2
 
 
+def test_of() -> None:
+    """
+    ``Ok.of()`` and ``Err.of()`` reuse instances for equal values of the same type.
+    """
+    assert Ok.of(None) is Ok.of(None)
+    assert Ok.of(True) is Ok.of(True)
+    assert Err.of(256) is Err.of(256)
+    assert Ok.of("a") is Ok.of("a")
+    assert Err.of(b"a") is Err.of(b"a")
+    assert Ok.of(1) is not Ok.of(True)
+    assert Ok.of(1) is not Ok.of(1.0)
+    assert Ok.of([1]) is not Ok.of([1])
+
+    for value in [None, False, 3, "a", (1, 2), [1]]:
+        assert Ok.of(value) == Ok(value)
+        assert Err.of(value) == Err(value)
+        assert type(Ok.of(value).ok_value) is type(value)
+    assert hash(Ok.of("a")) == hash(Ok("a"))
+
+
+def test_of_is_bounded() -> None:
+    first = Ok.of("first")
+    for i in range(2000):
+        Ok.of(str(i))
+    assert Ok.of("first") is not first
+    assert Ok.of(None) is Ok.of(None)
+
+
+def test_of_skips_distinct_values() -> None:
+    """
+    Values that are unlikely to repeat aren't kept in the table.
+    """
+    # Equal values that differ in type or sign must not share an instance.
+    Ok.of((1,))
+    assert type(Ok.of((True,)).ok_value[0]) is bool
+    assert type(Ok.of((1.0,)).ok_value[0]) is float
+    Ok.of(0.0)
+    assert str(Ok.of(-0.0).ok_value) == "-0.0"
+    Err.of(1.0)
+    assert type(Err.of(1).err_value) is int
+
+    message = "x" * 100
+    assert Err.of(message) is not Err.of(message)
+    assert Err.of(message) == Err(message)
+    value = object()
+    assert Ok.of(value) is not Ok.of(value)
+
+
+def test_of_threads() -> None:
+    def create(offset: int) -> None:
+        for i in range(5000):
+            Ok.of(str(offset + i))
+
+    threads = [threading.Thread(target=create, args=(i * 5000,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert Ok.of("0") == Ok("0")
+
+
 def test_repr() -> None:
     """
     ``repr()`` returns valid code if the wrapped value's ``repr()`` does as well.
@@ -50,6 +122,27 @@ def test_repr() -> None:
     assert n == eval(repr(n))
 
 
+def test_repr_limits() -> None:
+    """
+    ``repr()`` cuts off large values, using the limits of ``result_repr``.
+    """
+    payload = {"key": list(range(1000)), "text": "x" * 5000, "nested": Ok(Err(2))}
+    text = repr(Ok(payload))
+    assert len(text) < 2000
+    assert text.startswith("Ok({'key': [0, 1, 2, ")
+    assert "..." in text
+    assert text.endswith(", 'nested': Ok(Err(2))})")
+    assert repr(Err("x" * 2000)) == "Err({})".format(result_repr.repr("x" * 2000))
+
+    maxlevel = result_repr.maxlevel
+    result_repr.maxlevel = 2
+    try:
+        assert repr(Ok([[[1]]])) == "Ok([[[...]]])"
+        assert repr(Ok(Ok(Ok([1])))) == "Ok(Ok(Ok([...])))"
+    finally:
+        result_repr.maxlevel = maxlevel
+
+
 def test_ok_value() -> None:
     res = Ok('haha')
     assert res.ok_value == 'haha'
@@ -111,6 +204,27 @@ def test_expect() -> None:
         n.expect('failure')
 
 
+def test_unwrap_error_message() -> None:
+    """
+    The message of ``UnwrapError`` includes the error value, cut off if large.
+    """
+    with pytest.raises(UnwrapError) as exc_info:
+        Err("nay").unwrap()
+    assert str(exc_info.value) == "Called `Result.unwrap()` on an `Err` value: 'nay'"
+
+    with pytest.raises(UnwrapError) as exc_info:
+        Err(2).expect("failure")
+    assert str(exc_info.value) == "failure: 2"
+
+    with pytest.raises(UnwrapError) as exc_info:
+        Err(list(range(10**5))).unwrap()
+    assert len(str(exc_info.value)) < 1000
+
+    with pytest.raises(UnwrapError) as exc_info:
+        Ok(1).expect_err("failure")
+    assert str(exc_info.value) == "failure"
+
+
 def test_expect_err() -> None:
     o = Ok('yay')
     n = Err('nay')
@@ -363,7 +477,7 @@ def test_as_result_invalid_usage() -> None:
 
     with pytest.raises(TypeError, match=message):
 
-        @as_result("not an exception type")  # type: ignore[arg-type]
+        @as_result("not an exception type")  # type: ignore[call-overload, untyped-decorator]
         def g() -> int:
             return 1
 
@@ -382,6 +496,81 @@ def test_as_result_type_checking() -> None:
     assert res.ok() == 123
 
 
+def test_as_result_capture_strip() -> None:
+    """
+    ``as_result(capture="strip")`` stores exceptions without tracebacks.
+    """
+
+    @as_result(ValueError, capture="strip")
+    def f() -> int:
+        try:
+            raise KeyError("key")
+        except KeyError as exc:
+            raise ValueError("value") from exc
+
+    exc = f().unwrap_err()
+    assert isinstance(exc, ValueError)
+    assert exc.__traceback__ is None
+    assert isinstance(exc.__cause__, KeyError)
+    assert exc.__cause__.__traceback__ is None
+
+
+def test_as_result_capture_record() -> None:
+    """
+    ``as_result(capture="record")`` stores an ``ExceptionRecord``.
+    """
+
+    @as_result(ValueError, capture="record")
+    def f() -> int:
+        raise ValueError("value", 1)
+
+    @as_result(ValueError, capture="record", frames=1)
+    def g() -> int:
+        raise ValueError("value", 1)
+
+    record = f().unwrap_err()
+    assert record == ExceptionRecord(ValueError, ("value", 1))
+    assert record.exc_type is ValueError
+    assert record.args == ("value", 1)
+    assert record.frames == ()
+    assert repr(record) == "ExceptionRecord(ValueError, ('value', 1))"
+
+    exc = record.to_exception()
+    assert isinstance(exc, ValueError)
+    assert exc.args == ("value", 1)
+
+    record = g().unwrap_err()
+    assert len(record.frames) == 1
+    filename, lineno, name = record.frames[0]
+    assert filename == __file__
+    assert name == "g"
+    assert hash(record) == hash(g().unwrap_err())
+
+
+def test_exception_record_to_exception_fallback() -> None:
+    """
+    ``ExceptionRecord.to_exception()`` works for exceptions whose constructor
+    doesn't accept their ``args``.
+    """
+
+    class CustomError(Exception):
+        def __init__(self, a: int, b: int) -> None:
+            super().__init__(a + b)
+
+    exc = ExceptionRecord.from_exception(CustomError(1, 2)).to_exception()
+    assert isinstance(exc, CustomError)
+    assert exc.args == (3,)
+
+
+def test_as_result_capture_invalid_usage() -> None:
+    with pytest.raises(ValueError, match="capture must be"):
+        as_result(ValueError, capture="nope")  # type: ignore[call-overload]
+    with pytest.raises(ValueError, match="frames can only be used"):
+        as_result(ValueError, capture="strip", frames=1)  # type: ignore[call-overload]
+    with pytest.raises(ValueError, match="must not be negative"):
+        as_result(ValueError, capture="record", frames=-1)
+
+
 @pytest.mark.asyncio
 async def test_as_async_result() -> None:
     """
@@ -405,6 +594,27 @@ async def test_as_async_result() -> None:
     assert isinstance(bad_result.unwrap_err(), ValueError)
 
 
+@pytest.mark.asyncio
+async def test_as_async_result_capture() -> None:
+    """
+    ``as_async_result()`` supports the same capture modes as ``as_result()``.
+    """
+
+    @as_async_result(ValueError, capture="strip")
+    async def stripped() -> int:
+        raise ValueError("value")
+
+    @as_async_result(ValueError, capture="record", frames=2)
+    async def recorded() -> int:
+        raise ValueError("value")
+
+    exc = (await stripped()).unwrap_err()
+    assert exc.__traceback__ is None
+    record = (await recorded()).unwrap_err()
+    assert record.exc_type is ValueError
+    assert [name for _, _, name in record.frames] == ["async_wrapper", "recorded"]
+
+
 def sq(i: int) -> Result[int, int]:
     return Ok(i * i)
 
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from typing import List
 
 import pytest
 
 from result import Err, Ok, Result, do, do_async
+from result.result import DoException
 
 
 def test_result_do_general() -> None:
@@ -225,3 +227,60 @@ async def test_result_do_async_swap_order() -> None:
     )
 
     assert result1 == result2 == Ok(3)
+
+
+def test_result_do_nested() -> None:
+    """
+    A ``do()`` that runs while another one is evaluating its expression
+    doesn't interfere with the `Err` returned by either of them.
+    """
+
+    def inner(is_suc: bool) -> Result[int, str]:
+        return do(Ok(x) for x in (Ok(1) if is_suc else Err("inner")))
+
+    assert do(Ok(x + y) for x in inner(True) for y in Ok(2)) == Ok(3)
+    assert do(Ok(x + y) for x in inner(False) for y in Ok(2)) == Err("inner")
+    assert do(inner(False) for x in Ok(1)) == Err("inner")
+    outer: Result[int, str] = Err("outer")
+    assert do(inner(True) for x in outer) == Err("outer")
+
+
+def test_result_do_err_stops_outer_loops() -> None:
+    """
+    An `Err` stops the whole generator, not only the loop over it, even if
+    an outer loop is over a plain iterable.
+    """
+    calls: List[int] = []
+
+    def check(x: int) -> Result[int, int]:
+        calls.append(x)
+        return Err(x) if x == 1 else Ok(x)
+
+    result: Result[int, int] = do(Ok(y) for x in [1, 2] for y in check(x))
+    assert result == Err(1)
+    assert calls == [1]
+    assert do(Ok(y) for x in [1, 2] for y in (Err(1) if x == 1 else Ok(2))) == Err(1)
+
+
+@pytest.mark.asyncio
+async def test_result_do_async_err_stops_outer_loops() -> None:
+    async def check(x: int) -> Result[int, int]:
+        return Err(x) if x == 1 else Ok(x)
+
+    result: Result[int, int] = await do_async(
+        Ok(y) for x in [1, 2] for y in await check(x)
+    )
+    assert result == Err(1)
+
+
+def test_result_do_ignores_err_iterated_outside() -> None:
+    """
+    Iterating over an `Err` outside of ``do()`` raises, and doesn't affect a
+    later ``do()`` whose generator ends without a value.
+    """
+    with pytest.raises(DoException):
+        list(Err("stale"))
+    assert list(Ok(1)) == [1]
+    empty: List[int] = []
+    with pytest.raises(StopIteration):
+        do(Ok(x) for x in empty)
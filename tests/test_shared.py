@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, List
+
+import pytest
+
+from result import Err, Ok, Result
+from result.shared import SharedResultBatch
+
+RESULTS: List[Result[Any, Any]] = [
+    Ok(1.5),
+    Err(ValueError("bad")),
+    Ok(2.0),
+    *[Ok(float(i)) for i in range(10)],
+    Err("last"),
+]
+
+
+def _total(name: str) -> float:
+    with SharedResultBatch.attach(name) as batch:
+        return sum(result.unwrap_or(0) for result in batch)
+
+
+def test_create_and_read() -> None:
+    with SharedResultBatch.create(RESULTS, "d") as batch:
+        assert len(batch) == len(RESULTS)
+        assert batch[0] == Ok(1.5)
+        assert batch[-1] == Err("last")
+        error = batch[1].err()
+        assert isinstance(error, ValueError) and error.args == ("bad",)
+        assert [result.is_ok() for result in batch] == [result.is_ok() for result in RESULTS]
+        assert list(batch)[2:] == RESULTS[2:]
+        values = batch.values
+        assert values.readonly
+        assert values.tolist()[:3] == [1.5, 0.0, 2.0]
+        values.release()
+        with pytest.raises(IndexError):
+            batch[len(RESULTS)]
+
+
+def test_attach_from_other_process() -> None:
+    with SharedResultBatch.create(RESULTS, "d") as batch:
+        with ProcessPoolExecutor(2) as pool:
+            totals = list(pool.map(_total, [batch.name] * 3))
+        assert totals == [3.5 + sum(range(10))] * 3
+        # The segment still exists after the consumers exited.
+        with SharedResultBatch.attach(batch.name) as attached:
+            assert attached[0] == Ok(1.5)
+    with pytest.raises(FileNotFoundError):
+        SharedResultBatch.attach(batch.name)
+
+
+def test_pickle_attaches() -> None:
+    with SharedResultBatch.create([Ok(1), Err(2)], "q") as batch:
+        copy = pickle.loads(pickle.dumps(batch))
+        assert list(copy) == [Ok(1), Err(2)]
+        with pytest.raises(RuntimeError, match="created"):
+            copy.unlink()
+        copy.close()
+
+
+def test_empty_and_invalid() -> None:
+    with SharedResultBatch.create([], "q") as batch:
+        assert list(batch) == []
+    with SharedResultBatch.create([Ok(1)], "q") as batch:
+        shm = SharedMemory(batch.name)
+        assert shm.buf is not None
+        shm.buf[:8] = b"garbage!"
+        shm.close()
+        with pytest.raises(ValueError, match="not a shared result batch"):
+            SharedResultBatch.attach(batch.name)
+    with pytest.raises(TypeError):
+        SharedResultBatch.create([Ok("text")], "d")
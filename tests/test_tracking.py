@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from result import Err, Ok, as_result
+from result.tracking import ErrSiteSampler
+
+
+@as_result(ValueError)
+def _parse(text: str) -> int:
+    return int(text)
+
+
+def _fail() -> Err[str]:
+    return Err("failed")
+
+
+def test_sampler_records_sites() -> None:
+    plain_init = Err.__init__
+    with ErrSiteSampler(every=1) as sampler:
+        assert Err.__init__ is not plain_init
+        for _ in range(3):
+            _fail()
+        Ok(1).and_then(lambda x: Err(x))
+        Err("nay").map_err(str.upper)
+        _parse("x")
+    assert Err.__init__ is plain_init
+    _fail()
+
+    assert sampler.sampled == 7
+    top = sampler.top()
+    sites = {(name, count) for (_, _, name), count in top}
+    assert top[0][1] == 3
+    assert top[0][0][0] == __file__
+    assert sites == {
+        ("_fail", 3),
+        ("<lambda>", 1),
+        ("test_sampler_records_sites", 2),  # Err("nay") and map_err()
+        ("_parse", 1),  # where the ValueError was raised
+    }
+    sampler.reset()
+    assert sampler.top() == []
+    assert sampler.sampled == 0
+
+
+def test_sampler_samples() -> None:
+    with ErrSiteSampler(every=10) as sampler:
+        for _ in range(10_000):
+            _fail()
+    assert 500 < sampler.sampled < 2000
+
+
+def test_sampler_bounded() -> None:
+    with ErrSiteSampler(every=1, max_sites=2) as sampler:
+        for _ in range(3):
+            _fail()
+        for _ in range(2):
+            Err(1)
+        Err(2)  # Replaces the site of `Err(1)` and takes over its count.
+    counts = [count for _, count in sampler.top()]
+    assert counts == [3, 3]
+
+
+def test_sampler_only_one() -> None:
+    with ErrSiteSampler():
+        with pytest.raises(RuntimeError, match="already started"):
+            ErrSiteSampler().start()
+
+
+def test_sampler_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="every"):
+        ErrSiteSampler(every=0)
+    with pytest.raises(ValueError, match="max_sites"):
+        ErrSiteSampler(max_sites=0)